@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+GGUF fetcher download and build support
+
+This package holds the pieces of scripts/simplified_gguf_fetcher.py that do
+not depend on the fetcher itself.
+"""
+
+from .backends import HfApiBackend, HubBackend, RecordingBackend, ReplayBackend, ReplayError
+from .caches import BuildCache, ModelInfoCache, PartitionResultCache
+from .journal import DownloadJournal
+from .rate_limiter import AdaptiveRateLimiter
+
+# Export main classes
+__all__ = [
+    'AdaptiveRateLimiter',
+    'BuildCache',
+    'DownloadJournal',
+    'HfApiBackend',
+    'HubBackend',
+    'ModelInfoCache',
+    'PartitionResultCache',
+    'RecordingBackend',
+    'ReplayBackend',
+    'ReplayError'
+]
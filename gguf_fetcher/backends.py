@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Sources of Hub listing and model detail data: the live Hub, a recorder
+writing responses to disk and an offline replay of those recordings
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import timezone
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from huggingface_hub import HfApi
+from huggingface_hub.hf_api import ModelInfo
+from huggingface_hub.utils import build_hf_headers, get_session, hf_raise_for_status
+
+from spam_filter import json_codec
+
+
+class HubBackend:
+    """
+    Source of Hub listing and model detail data used by the download phase.
+    
+    Subclasses implement list_models and model_info with HfApi semantics:
+    both return huggingface_hub ModelInfo objects and raise exceptions with a
+    `response` carrying the HTTP status and headers on failure.
+    """
+    
+    # True if model_info maps onto a plain Hub HTTP endpoint that the async
+    # transport may request directly
+    uses_hub_http = False
+    
+    def list_models(self, fetch_page: Optional[Callable] = None, **kwargs) -> Iterator[ModelInfo]:
+        """
+        Stream models matching HfApi.list_models arguments
+        
+        Args:
+            fetch_page: Optional wrapper called as fetch_page(request) around
+                each page request; it returns request()'s result and may retry it
+            **kwargs: HfApi.list_models arguments
+        """
+        raise NotImplementedError
+    
+    def model_info(self, repo_id: str, **kwargs) -> ModelInfo:
+        """Fetch detailed info for one repository"""
+        raise NotImplementedError
+    
+    async def model_info_async(self, repo_id: str, **kwargs) -> ModelInfo:
+        """Fetch detailed info without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.model_info(repo_id, **kwargs))
+    
+    def stats(self) -> Dict:
+        """Return backend-specific counters"""
+        return {}
+
+
+class HfApiBackend(HubBackend):
+    """Live Hugging Face Hub backend"""
+    
+    uses_hub_http = True
+    
+    def __init__(self, endpoint: str, token: Optional[str] = None):
+        """
+        Initialize the backend.
+        
+        Args:
+            endpoint: Hub base URL
+            token: Optional Hugging Face API token
+        """
+        self.endpoint = endpoint
+        self.api = HfApi(endpoint=endpoint, token=token)
+    
+    def list_models(self, fetch_page: Optional[Callable] = None, filter=None, sort: Optional[str] = None,
+                    direction: Optional[int] = None, limit: Optional[int] = None,
+                    expand: Optional[List[str]] = None, **kwargs) -> Iterator[ModelInfo]:
+        """
+        Stream models, sending each listing page through fetch_page.
+        
+        HfApi.list_models follows the Link headers itself, so a wrapper could
+        only see the first request. The pages are requested here instead,
+        with the query parameters HfApi would send; other arguments are
+        delegated to HfApi when no fetch_page is given.
+        """
+        if fetch_page is None or kwargs:
+            if fetch_page is not None:
+                raise TypeError(f"fetch_page does not support list_models arguments {sorted(kwargs)}")
+            return self.api.list_models(filter=filter, sort=sort, direction=direction, limit=limit,
+                                        expand=expand, **kwargs)
+        
+        params = {}
+        if filter:
+            params['filter'] = [filter] if isinstance(filter, str) else list(filter)
+        if sort is not None:
+            params['sort'] = {'created_at': 'createdAt', 'last_modified': 'lastModified'}.get(sort, sort)
+        if direction is not None:
+            params['direction'] = direction
+        if limit is not None:
+            params['limit'] = limit
+        if expand:
+            params['expand'] = expand
+        return self._paginate(fetch_page, params, limit)
+    
+    def _paginate(self, fetch_page: Callable, params: Dict, limit: Optional[int]) -> Iterator[ModelInfo]:
+        """Request listing pages one at a time, following the Link headers"""
+        session = get_session()
+        headers = build_hf_headers(token=self.api.token)
+        url = f"{self.endpoint}/api/models"
+        yielded = 0
+        
+        while url is not None:
+            def request(url=url, params=params):
+                response = session.get(url, params=params, headers=headers)
+                hf_raise_for_status(response)
+                return response
+            
+            response = fetch_page(request)
+            for item in response.json():
+                if limit is not None and yielded >= limit:
+                    return
+                item.setdefault('siblings', None)
+                yielded += 1
+                yield ModelInfo(**item)
+            
+            # The next link already carries the query parameters
+            url = response.links.get('next', {}).get('url')
+            params = None
+    
+    def model_info(self, repo_id: str, **kwargs) -> ModelInfo:
+        return self.api.model_info(repo_id, **kwargs)
+
+
+def _format_hub_datetime(value) -> Optional[str]:
+    """Format a datetime the way the Hub API returns it"""
+    if value is None or isinstance(value, str):
+        return value
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _model_info_to_payload(model: ModelInfo) -> Dict:
+    """
+    Convert a ModelInfo into the Hub JSON payload it was parsed from.
+    
+    Only the fields read by the download phase are kept.
+    
+    Returns:
+        Payload dictionary accepted by ModelInfo(**payload)
+    """
+    payload = {
+        'id': model.id,
+        'likes': getattr(model, 'likes', None),
+        'downloads': getattr(model, 'downloads', None),
+        'tags': getattr(model, 'tags', None),
+        'createdAt': _format_hub_datetime(getattr(model, 'created_at', None)),
+        'lastModified': _format_hub_datetime(getattr(model, 'last_modified', None)),
+        'sha': getattr(model, 'sha', None)
+    }
+    siblings = getattr(model, 'siblings', None)
+    if siblings is not None:
+        payload['siblings'] = []
+        for sibling in siblings:
+            sibling_payload = {'rfilename': sibling.rfilename, 'size': getattr(sibling, 'size', None)}
+            lfs = getattr(sibling, 'lfs', None)
+            if lfs is not None:
+                sibling_payload['lfs'] = {'size': lfs.size, 'sha256': lfs.sha256, 'pointerSize': lfs.pointer_size}
+            payload['siblings'].append(sibling_payload)
+    return payload
+
+
+class RecordingBackend(HubBackend):
+    """
+    Backend that forwards to another backend and records every response to disk.
+    
+    Layout of the recording directory:
+        listings/<key>.jsonl      one model payload per line for each list_models call
+        model_info/<key>.json     one payload per model_info call
+    
+    Listing keys hash the call arguments and model_info keys hash the repo id,
+    so a ReplayBackend pointed at the directory serves the same calls offline.
+    A listing the consumer stopped reading early (such as the recent listing
+    at its date cutoff) keeps the prefix that was read, followed by a
+    TRUNCATED_MARKER line.
+    """
+    
+    TRUNCATED_MARKER = {'_truncated': True}  # Last line of a listing recorded only in part
+    
+    def __init__(self, inner: HubBackend, record_dir: str):
+        """
+        Initialize the recorder.
+        
+        Args:
+            inner: Backend serving the real requests
+            record_dir: Directory receiving the recorded responses
+        """
+        self.inner = inner
+        self.record_dir = record_dir
+        self.logger = logging.getLogger(__name__)
+        self.recorded_listings = 0
+        self.recorded_details = 0
+        os.makedirs(os.path.join(record_dir, 'listings'), exist_ok=True)
+        os.makedirs(os.path.join(record_dir, 'model_info'), exist_ok=True)
+    
+    def list_models(self, fetch_page: Optional[Callable] = None, **kwargs) -> Iterator[ModelInfo]:
+        path = _listing_record_path(self.record_dir, kwargs)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            try:
+                for model in self.inner.list_models(fetch_page=fetch_page, **kwargs):
+                    f.write(json_codec.dumps(_model_info_to_payload(model)) + '\n')
+                    yield model
+            except GeneratorExit:
+                # The consumer stopped early (listing cutoff): keep the prefix it saw, marked so
+                # that a replay reading past it fails instead of ending the listing there
+                f.write(json_codec.dumps(self.TRUNCATED_MARKER) + '\n')
+                f.close()
+                os.replace(tmp_path, path)
+                self.recorded_listings += 1
+                raise
+            except BaseException:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        # Listings read to the end are kept without a marker
+        os.replace(tmp_path, path)
+        self.recorded_listings += 1
+    
+    def model_info(self, repo_id: str, **kwargs) -> ModelInfo:
+        model = self.inner.model_info(repo_id, **kwargs)
+        path = _model_info_record_path(self.record_dir, repo_id)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json_codec.dump(_model_info_to_payload(model), f)
+        os.replace(tmp_path, path)
+        self.recorded_details += 1
+        return model
+    
+    def stats(self) -> Dict:
+        return {'recorded_listings': self.recorded_listings, 'recorded_details': self.recorded_details}
+
+
+def _listing_record_path(record_dir: str, kwargs: Dict) -> str:
+    """Path of the recorded listing for a list_models call"""
+    key = json.dumps(kwargs, sort_keys=True, default=str)
+    return os.path.join(record_dir, 'listings', f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.jsonl")
+
+
+def _model_info_record_path(record_dir: str, repo_id: str) -> str:
+    """Path of the recorded model_info response for a repository"""
+    return os.path.join(record_dir, 'model_info', f"{hashlib.sha256(repo_id.encode('utf-8')).hexdigest()}.json")
+
+
+class ReplayError(Exception):
+    """Error raised by ReplayBackend, shaped like an HTTP error from HfApi"""
+    
+    def __init__(self, status: int, message: str, retry_after: Optional[str] = None):
+        super().__init__(f"{status} {message}")
+        headers = {'Retry-After': retry_after} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=status, headers=headers)
+
+
+class ReplayBackend(HubBackend):
+    """
+    Offline backend serving responses captured by RecordingBackend.
+    
+    Each call sleeps for a simulated latency and may fail with an injected
+    error, so the download phase can be benchmarked deterministically
+    without network access. Listings pay the latency once per page.
+    """
+    
+    LISTING_PAGE_SIZE = 1000  # Models per simulated listing page
+    
+    def __init__(self, record_dir: str, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: Optional[float] = None, seed: int = 0):
+        """
+        Initialize the replay backend.
+        
+        Args:
+            record_dir: Directory written by RecordingBackend
+            latency_ms: Mean simulated latency per request in milliseconds
+            jitter_ms: Maximum deviation from the mean latency in milliseconds
+            error_rate: Fraction of model_info calls failing with HTTP 500
+            throttle_rate: Fraction of model_info calls failing with HTTP 429
+            retry_after: Retry-After seconds sent with injected 429s (None to omit)
+            seed: Random seed making latencies and injected errors reproducible
+        """
+        if not os.path.isdir(record_dir):
+            raise ValueError(f"Replay directory not found: {record_dir}")
+        self.record_dir = record_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        
+        self.calls = 0
+        self.misses = 0
+        self.injected_errors = 0
+        self.injected_throttles = 0
+    
+    def _next_outcome(self) -> Tuple[float, Optional[ReplayError]]:
+        """Draw the simulated delay and injected error of the next request"""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+            roll = self._random.random()
+            error = None
+            if roll < self.throttle_rate:
+                self.injected_throttles += 1
+                retry_after = str(self.retry_after) if self.retry_after is not None else None
+                error = ReplayError(429, "Too Many Requests (injected)", retry_after)
+            elif roll < self.throttle_rate + self.error_rate:
+                self.injected_errors += 1
+                error = ReplayError(500, "Internal Server Error (injected)")
+        return max(0.0, delay) / 1000.0, error
+    
+    def _load_model_info(self, repo_id: str) -> ModelInfo:
+        """Read a recorded model_info response"""
+        path = _model_info_record_path(self.record_dir, repo_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return ModelInfo(**json_codec.load(f))
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            raise ReplayError(404, f"No recorded model_info for {repo_id}")
+    
+    def _simulated_request(self) -> None:
+        """Pay the latency of one simulated request and raise its injected error"""
+        delay, error = self._next_outcome()
+        time.sleep(delay)
+        if error is not None:
+            raise error
+    
+    def list_models(self, fetch_page: Optional[Callable] = None, **kwargs) -> Iterator[ModelInfo]:
+        path = _listing_record_path(self.record_dir, kwargs)
+        if not os.path.exists(path):
+            with self._lock:
+                self.misses += 1
+            raise ReplayError(404, f"No recorded listing for {json.dumps(kwargs, sort_keys=True, default=str)}")
+        
+        fetch_page = fetch_page or (lambda request: request())
+        with open(path, 'r', encoding='utf-8') as f:
+            for position, line in enumerate(f):
+                payload = json_codec.loads(line)
+                if payload == RecordingBackend.TRUNCATED_MARKER:
+                    with self._lock:
+                        self.misses += 1
+                    raise ReplayError(404, f"Recorded listing ends after {position} models, the recording "
+                                           f"run stopped reading it there")
+                if position % self.LISTING_PAGE_SIZE == 0:
+                    fetch_page(self._simulated_request)
+                yield ModelInfo(**payload)
+    
+    def model_info(self, repo_id: str, **kwargs) -> ModelInfo:
+        delay, error = self._next_outcome()
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return self._load_model_info(repo_id)
+    
+    async def model_info_async(self, repo_id: str, **kwargs) -> ModelInfo:
+        delay, error = self._next_outcome()
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return self._load_model_info(repo_id)
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'misses': self.misses,
+                'injected_errors': self.injected_errors,
+                'injected_throttles': self.injected_throttles
+            }
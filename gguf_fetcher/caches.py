@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+On-disk caches of the fetcher: per-partition extraction results,
+model_info responses and whole process phase builds
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from spam_filter import json_codec
+from spam_filter.engine import ProcessingReport
+
+
+class PartitionResultCache:
+    """
+    On-disk cache of per-partition extraction results.
+    
+    Entries are keyed on a raw partition's sha256 plus the processing
+    fingerprint, so a partition is re-extracted only when its content, the
+    filter configuration or the processing code changed. Entries for
+    partitions no longer in the snapshot are dropped after each run.
+    """
+    
+    def __init__(self, cache_dir: str = "data/partition_cache"):
+        self.cache_dir = cache_dir
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Load a cached extraction result, None on a miss"""
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return json_codec.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, key: str, result: Dict) -> None:
+        """Store an extraction result"""
+        path = self._entry_path(key)
+        try:
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+                json_codec.dump(result, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            self.logger.debug(f"Could not cache partition result {key[:12]}: {e}")
+    
+    def retain(self, keys: Iterable[str]) -> None:
+        """Remove every entry whose key is not in keys"""
+        keep = {f"{key}.json" for key in keys}
+        for filename in os.listdir(self.cache_dir):
+            if filename not in keep:
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except OSError:
+                    pass
+
+
+class ModelInfoCache:
+    """
+    Content-addressed on-disk cache for model_info responses.
+    
+    Entries are keyed by repo id plus revision (commit sha or lastModified),
+    expire after a TTL and are evicted least-recently-used first once the
+    cache grows past its size budget. Recency is persisted through file
+    modification times so LRU order survives between runs.
+    """
+    
+    def __init__(self, cache_dir: str = "data/model_info_cache", ttl_seconds: float = 24 * 3600,
+                 max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the cache and index existing entries.
+        
+        Args:
+            cache_dir: Directory holding cache entries
+            ttl_seconds: Maximum age of an entry before it is treated as a miss
+            max_bytes: Size budget for all entries, oldest are evicted beyond it
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+        
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # path -> size in bytes, least recently used first
+        self._total_bytes = 0
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+    
+    def _load_index(self) -> None:
+        """Index existing cache files in LRU order using their modification times"""
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for filename in files:
+                if not filename.endswith('.json'):
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                    found.append((stat.st_mtime, path, stat.st_size))
+                except OSError:
+                    continue
+        
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+            self._total_bytes += size
+        
+        self.logger.debug(f"Model info cache: {len(self._entries)} entries, {self._total_bytes:,} bytes")
+    
+    def _entry_path(self, repo_id: str, revision: Optional[str]) -> str:
+        """Build the content-addressed path for a repo id and revision"""
+        digest = hashlib.sha256(f"{repo_id}\0{revision or ''}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+    
+    def get(self, repo_id: str, revision: Optional[str]) -> Optional[Dict]:
+        """
+        Look up a cached model_info payload.
+        
+        Args:
+            repo_id: Model repository id
+            revision: Commit sha or lastModified timestamp, None if unknown
+        
+        Returns:
+            Cached payload dictionary, None on miss or expiry
+        """
+        path = self._entry_path(repo_id, revision)
+        
+        with self._lock:
+            if path not in self._entries:
+                self.misses += 1
+                return None
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json_codec.load(f)
+        except (OSError, ValueError):
+            self._discard(path)
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        if time.time() - entry.get('cached_at', 0) > self.ttl_seconds:
+            self._discard(path)
+            with self._lock:
+                self.expired += 1
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        
+        try:
+            os.utime(path)  # Persist recency for the next run
+        except OSError:
+            pass
+        
+        return entry.get('payload')
+    
+    def put(self, repo_id: str, revision: Optional[str], payload: Dict) -> None:
+        """
+        Store a model_info payload and evict old entries beyond the size budget.
+        
+        Args:
+            repo_id: Model repository id
+            revision: Commit sha or lastModified timestamp, None if unknown
+            payload: JSON-serializable model_info payload
+        """
+        path = self._entry_path(repo_id, revision)
+        entry = {
+            'repo_id': repo_id,
+            'revision': revision,
+            'cached_at': time.time(),
+            'payload': payload
+        }
+        
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json_codec.dump(entry, f)
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            self.logger.debug(f"Could not cache model info for {repo_id}: {e}")
+            return
+        
+        with self._lock:
+            self._total_bytes -= self._entries.pop(path, 0)
+            self._entries[path] = size
+            self._total_bytes += size
+            self.stores += 1
+            self._evict()
+    
+    def _discard(self, path: str) -> None:
+        """Remove a single entry from the index and disk"""
+        with self._lock:
+            self._total_bytes -= self._entries.pop(path, 0)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits its budget (lock held)"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current cache size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size_bytes': self._total_bytes,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class BuildCache:
+    """
+    Input-addressed cache of process phase results.
+    
+    An entry is keyed on a hash of the raw snapshot bytes, the processing
+    configuration and the version of the processing code, and holds the final
+    output file, the processing report and the filter metrics. When none of
+    those inputs changed the process phase restores the entry instead of
+    recomputing it. Only the most recently used entries are kept.
+    """
+    
+    OUTPUT_FILE = "output.json"
+    REPORT_FILE = "report.json"
+    METRICS_FILE = "metrics.json"
+    
+    def __init__(self, cache_dir: str = "data/build_cache", max_entries: int = 5):
+        """
+        Initialize the cache directory.
+        
+        Args:
+            cache_dir: Directory holding one subdirectory per entry
+            max_entries: Number of entries kept, least recently used are evicted
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def source_digest(paths: Iterable[str]) -> str:
+        """Hash the contents of source files, so code edits invalidate entries"""
+        digest = hashlib.sha256()
+        for path in sorted(paths):
+            digest.update(os.path.basename(path).encode('utf-8') + b'\0')
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+    
+    @staticmethod
+    def key(raw_data_file: str, fingerprint: Dict) -> str:
+        """
+        Compute the cache key of a process phase run.
+        
+        Args:
+            raw_data_file: Raw snapshot file, hashed in chunks
+            fingerprint: JSON-serializable configuration and version values
+        
+        Returns:
+            Hex sha256 digest
+        """
+        digest = hashlib.sha256()
+        with open(raw_data_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        digest.update(b'\0')
+        digest.update(json.dumps(fingerprint, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+    
+    def restore(self, key: str, output_file: str, metrics_file: Optional[str] = None) -> Optional[Dict]:
+        """
+        Copy a cached output, and the metrics stored with it, into place.
+        
+        Args:
+            key: Cache key from key()
+            output_file: Destination of the cached output
+            metrics_file: Destination of the cached filter metrics, if the entry has them
+        
+        Returns:
+            Cached report entry ({'report': ..., 'report_text': ...}), None on miss
+        """
+        entry_dir = self._entry_dir(key)
+        try:
+            with open(os.path.join(entry_dir, self.REPORT_FILE), 'r', encoding='utf-8') as f:
+                report_entry = json_codec.load(f)
+            shutil.copyfile(os.path.join(entry_dir, self.OUTPUT_FILE), output_file)
+        except (OSError, ValueError):
+            return None
+        
+        cached_metrics = os.path.join(entry_dir, self.METRICS_FILE)
+        if metrics_file and os.path.exists(cached_metrics):
+            try:
+                os.makedirs(os.path.dirname(metrics_file) or '.', exist_ok=True)
+                shutil.copyfile(cached_metrics, f"{metrics_file}.tmp")
+                os.replace(f"{metrics_file}.tmp", metrics_file)
+            except OSError as e:
+                self.logger.warning(f"Could not restore filter metrics to {metrics_file}: {e}")
+        
+        try:
+            os.utime(entry_dir)  # Persist recency for eviction
+        except OSError:
+            pass
+        return report_entry
+    
+    def store(self, key: str, output_file: str, report: Optional[ProcessingReport] = None,
+              report_text: Optional[str] = None, metrics_file: Optional[str] = None) -> None:
+        """
+        Store an output file, its report and metrics, then evict old entries.
+        
+        Args:
+            key: Cache key from key()
+            output_file: Output file written by the process phase
+            report: Processing report, None when spam filtering is disabled
+            report_text: Human-readable report logged by the process phase
+            metrics_file: Filter metrics written by the process phase, None if not written
+        """
+        entry_dir = self._entry_dir(key)
+        temp_dir = f"{entry_dir}.{os.getpid()}.tmp"
+        try:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            os.makedirs(temp_dir)
+            shutil.copyfile(output_file, os.path.join(temp_dir, self.OUTPUT_FILE))
+            if metrics_file:
+                shutil.copyfile(metrics_file, os.path.join(temp_dir, self.METRICS_FILE))
+            with open(os.path.join(temp_dir, self.REPORT_FILE), 'w', encoding='utf-8') as f:
+                json_codec.dump({
+                    'report': asdict(report) if report is not None else None,
+                    'report_text': report_text,
+                    'cached_at': datetime.now().isoformat()
+                }, f, pretty=True)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(temp_dir, entry_dir)
+        except OSError as e:
+            self.logger.warning(f"Could not store build cache entry: {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+        self._evict()
+    
+    def _evict(self) -> None:
+        """Remove least recently used entries beyond max_entries"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isdir(path) and not name.endswith('.tmp'):
+                entries.append((os.path.getmtime(path), path))
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            shutil.rmtree(path, ignore_errors=True)
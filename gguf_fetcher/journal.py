@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Append-only journal of raw model records completed by the download phase
+"""
+
+import json
+import logging
+import os
+from typing import Dict
+
+from spam_filter import json_codec
+
+
+class DownloadJournal:
+    """
+    Append-only JSON Lines journal of completed raw model records.
+    
+    The download phase appends each record as soon as its details arrive, so
+    an interrupted run can resume with only the unfinished repos left to
+    fetch. A torn last line from a crash is ignored on load.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the journal.
+        
+        Args:
+            path: Journal file path
+        """
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._file = None
+    
+    def load(self) -> Dict[str, Dict]:
+        """
+        Read completed records from an existing journal.
+        
+        Returns:
+            Dictionary mapping model id to its journaled record, empty if no journal exists
+        """
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json_codec.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.warning(f"Ignoring unreadable journal line {line_number} in {self.path}")
+                    continue
+                if record.get('id'):
+                    records[record['id']] = record
+        
+        return records
+    
+    def open(self, append: bool) -> None:
+        """
+        Open the journal for writing.
+        
+        Args:
+            append: Keep existing entries (resume) instead of starting a new journal
+        """
+        torn_tail = False
+        if append and os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                torn_tail = f.read(1) != b'\n'
+        
+        self._file = open(self.path, 'a' if append else 'w', encoding='utf-8')
+        if torn_tail:
+            # Terminate a partially written line so new entries start cleanly
+            self._file.write('\n')
+    
+    def append(self, record: Dict) -> None:
+        """Write one completed record and flush it to disk"""
+        if self._file is None:
+            return
+        self._file.write(json_codec.dumps(record) + '\n')
+        self._file.flush()
+    
+    def close(self) -> None:
+        """Close the journal file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def remove(self) -> None:
+        """Delete the journal once its records are compacted into the raw snapshot"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Adaptive rate limiting of Hugging Face Hub API calls
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket rate limiter with AIMD concurrency control for Hub API calls.
+    
+    Every request takes a token (refilled at a fixed rate, unless the rate is
+    0) and, for detail requests, an in-flight slot. On HTTP 429/503 the concurrency limit is cut
+    multiplicatively and all requests pause for Retry-After (or an exponential
+    delay); each full window of successful responses raises the limit by one.
+    Usable from threads (acquire/call) and from asyncio (acquire_async).
+    """
+    
+    THROTTLE_STATUSES = (429, 503)
+    SLOT_POLL_INTERVAL = 0.02  # Seconds between checks for a free in-flight slot
+    
+    def __init__(self, rate: float = 0.0, burst: int = 50, initial_concurrency: int = 32,
+                 min_concurrency: int = 1, max_concurrency: int = 256, backoff_factor: float = 0.5,
+                 base_delay: float = 1.0, max_delay: float = 300.0, max_retries: int = 5):
+        """
+        Initialize the limiter.
+        
+        Args:
+            rate: Sustained requests per second, 0 for no fixed cap (throttling still adapts)
+            burst: Token bucket capacity
+            initial_concurrency: Starting in-flight request limit
+            min_concurrency: Lower bound for multiplicative decrease
+            max_concurrency: Upper bound for additive increase
+            backoff_factor: Multiplier applied to the concurrency limit on throttling
+            base_delay: First pause in seconds when no Retry-After is given
+            max_delay: Cap for pauses in seconds
+            max_retries: Retries of a throttled request before giving up
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff_factor = backoff_factor
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._concurrency = float(max(min_concurrency, min(initial_concurrency, max_concurrency)))
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+        self._window_successes = 0
+        
+        # Metrics
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.decreases = 0
+        self.increases = 0
+        self.pause_seconds = 0.0
+        self.min_concurrency_seen = int(self._concurrency)
+    
+    @staticmethod
+    def parse_retry_after(value) -> Optional[float]:
+        """
+        Parse a Retry-After header given in seconds or as an HTTP date.
+        
+        Returns:
+            Delay in seconds, None if missing or unparseable
+        """
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def throttle_info(error: Exception) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Extract the HTTP status and Retry-After header from a request exception.
+        
+        Returns:
+            (status, retry_after) tuple, None for values that are unavailable
+        """
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None) or getattr(response, 'status', None)
+        headers = getattr(response, 'headers', None) or {}
+        return status, headers.get('Retry-After')
+    
+    def _try_acquire(self, concurrent: bool) -> float:
+        """Take a token (and slot) if available, else return seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+            
+            if concurrent and self._in_flight >= int(self._concurrency):
+                return self.SLOT_POLL_INTERVAL
+            if self.rate > 0:
+                if self._tokens < 1:
+                    return (1 - self._tokens) / self.rate
+                self._tokens -= 1
+            
+            if concurrent:
+                self._in_flight += 1
+            self.requests += 1
+            return 0.0
+    
+    def acquire(self, concurrent: bool = True) -> None:
+        """Block the calling thread until a request may be sent"""
+        while True:
+            wait = self._try_acquire(concurrent)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    async def acquire_async(self, concurrent: bool = True) -> None:
+        """Wait on the event loop until a request may be sent"""
+        while True:
+            wait = self._try_acquire(concurrent)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+    
+    def release(self, status: Optional[int] = None, retry_after=None, concurrent: bool = True) -> None:
+        """
+        Report the outcome of a request and adapt the concurrency limit.
+        
+        Args:
+            status: HTTP status of the response, None if no response was received
+            retry_after: Raw Retry-After header value, if any
+            concurrent: Whether the request held an in-flight slot
+        """
+        with self._lock:
+            if concurrent:
+                self._in_flight = max(0, self._in_flight - 1)
+            
+            if status in self.THROTTLE_STATUSES:
+                self.throttled += 1
+                now = time.monotonic()
+                if now < self._paused_until:
+                    return  # Already backing off for this burst of throttled responses
+                
+                self._consecutive_throttles += 1
+                delay = self.parse_retry_after(retry_after)
+                if delay is None:
+                    delay = self.base_delay * 2 ** (self._consecutive_throttles - 1)
+                delay = min(delay, self.max_delay)
+                
+                previous = self._concurrency
+                self._concurrency = max(self.min_concurrency, previous * self.backoff_factor)
+                self._paused_until = now + delay
+                self._window_successes = 0
+                self.decreases += 1
+                self.pause_seconds += delay
+                self.min_concurrency_seen = min(self.min_concurrency_seen, int(self._concurrency))
+                self.logger.warning(f"Rate limiter: HTTP {status}, concurrency {int(previous)} -> "
+                                    f"{int(self._concurrency)}, pausing {delay:.1f}s")
+            
+            elif status is not None:
+                self._consecutive_throttles = 0
+                self._window_successes += 1
+                if self._window_successes >= self._concurrency and self._concurrency < self.max_concurrency:
+                    previous = self._concurrency
+                    self._concurrency = min(self.max_concurrency, previous + 1)
+                    self._window_successes = 0
+                    self.increases += 1
+                    self.logger.debug(f"Rate limiter: concurrency {int(previous)} -> {int(self._concurrency)}")
+    
+    def record_retry(self) -> None:
+        """Count one retry of a throttled request"""
+        with self._lock:
+            self.retries += 1
+    
+    def call(self, func, *args, concurrent: bool = True, **kwargs):
+        """
+        Call a blocking Hub API function through the limiter, retrying throttled calls.
+        
+        Args:
+            func: Function sending one request
+            concurrent: Whether the request takes an in-flight slot (listing pages do not)
+        
+        Returns:
+            The function's result
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(concurrent)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                status, retry_after = self.throttle_info(e)
+                self.release(status, retry_after, concurrent)
+                if status in self.THROTTLE_STATUSES and attempt < self.max_retries:
+                    self.record_retry()
+                    continue
+                raise
+            self.release(200, concurrent=concurrent)
+            return result
+    
+    def metrics(self) -> Dict:
+        """Return the controller's counters and current state"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'retries': self.retries,
+                'concurrency_decreases': self.decreases,
+                'concurrency_increases': self.increases,
+                'concurrency_limit': int(self._concurrency),
+                'min_concurrency_seen': self.min_concurrency_seen,
+                'pause_seconds': round(self.pause_seconds, 2)
+            }
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON codec backends on the real data files
+
+Compares the standard library json module against the accelerated backend
+used by spam_filter.json_codec (orjson when installed) for loading and for
+writing pretty and compact output.
+
+Usage:
+    python scripts/benchmark_json_codec.py [--repeat N] [FILE ...]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from spam_filter import json_codec
+
+DEFAULT_FILES = ["gguf_models.json", "data/raw_models_data.json"]
+
+
+def best_time(func, repeat: int) -> float:
+    """Return the fastest of `repeat` runs of func in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_file(path: str, repeat: int) -> None:
+    """Time load and dump operations on one file with both backends"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    data = json.loads(text)
+    
+    cases = [
+        ("load", lambda: json.loads(text), lambda: json_codec.loads(text)),
+        ("dump pretty", lambda: json.dumps(data, indent=2, ensure_ascii=False),
+         lambda: json_codec.dumps(data, pretty=True)),
+        ("dump compact", lambda: json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+         lambda: json_codec.dumps(data)),
+    ]
+    
+    print(f"\n{path} ({len(text.encode('utf-8')) / (1024 * 1024):.1f} MB, {len(data):,} entries)")
+    print(f"  {'operation':<14} {'json':>10} {json_codec.BACKEND:>10} {'speedup':>9}")
+    for name, stdlib_func, codec_func in cases:
+        stdlib_time = best_time(stdlib_func, repeat)
+        codec_time = best_time(codec_func, repeat)
+        print(f"  {name:<14} {stdlib_time * 1000:>8.1f}ms {codec_time * 1000:>8.1f}ms "
+              f"{stdlib_time / codec_time:>8.1f}x")
+    
+    same_output = json.dumps(data, indent=2, ensure_ascii=False) == json_codec.dumps(data, pretty=True)
+    print(f"  pretty output identical to stdlib: {same_output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON codec backends on data files")
+    parser.add_argument('files', nargs='*', default=DEFAULT_FILES, help='JSON files to benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement, fastest is kept (default: 5)')
+    args = parser.parse_args()
+    
+    print(f"JSON codec backend: {json_codec.BACKEND}")
+    if json_codec.BACKEND == 'json':
+        print("orjson is not installed, both columns measure the stdlib")
+    
+    for path in args.files:
+        if not os.path.exists(path):
+            print(f"\nSkipping {path}: file not found")
+            continue
+        benchmark_file(path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
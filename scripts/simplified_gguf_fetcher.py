@@ -8,26 +8,67 @@ integrated spam filtering.
 
 Phase 1 (Download): Fetch recent models + top liked models, save raw data
 Phase 2 (Process): Extract required fields from saved data, apply spam filtering, generate output
+
+Pipeline mode overlaps both phases: per-repo processing runs as soon as each
+repo's details arrive, and only group-level selection waits for the full set.
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
 import logging
 import os
+import queue
+import shutil
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import threading
+import time
+from dataclasses import asdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from itertools import chain
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from huggingface_hub.hf_api import ModelInfo
+
+try:
+    import aiohttp
+except ImportError:  # Optional: fall back to the threaded detail fetcher
+    aiohttp = None
 
-from huggingface_hub import HfApi
+try:
+    import zstandard
+except ImportError:  # Optional: zstd-compressed raw snapshots fall back to gzip
+    zstandard = None
 
 # Import spam filter components
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from spam_filter import __version__ as SPAM_FILTER_VERSION
 from spam_filter.config import FilterConfig
-from spam_filter.engine import SpamFilterEngine
+from spam_filter.engine import ProcessingReport, SpamFilterEngine
+from spam_filter import json_codec
 from spam_filter.hardware_calculator import HardwareRequirementsCalculator
+from spam_filter.raw_store import PartitionedRawStore, RawModelStore, iter_raw_file, write_raw_file
+from spam_filter.siblings import SiblingTable
+from gguf_fetcher import (AdaptiveRateLimiter, BuildCache, DownloadJournal, HfApiBackend, HubBackend,
+                          ModelInfoCache, PartitionResultCache, RecordingBackend, ReplayBackend)
+
+
+# Raw snapshot formats and their file paths
+RAW_DATA_FILES = {
+    'json': "data/raw_models_data.json",  # Indented JSON array
+    'jsonl': "data/raw_models_data.jsonl",  # One compact JSON object per line
+    'jsonl.gz': "data/raw_models_data.jsonl.gz",
+    'jsonl.zst': "data/raw_models_data.jsonl.zst",
+    'sqlite': "data/raw_models_data.sqlite",  # RawModelStore with indexed repos and siblings tables
+    'partitioned': "data/raw_models_data.partitions"  # PartitionedRawStore: one JSON Lines file per created_at month
+}
+
+# Per-stage timings of the last spam filter run, committed daily to track performance
+FILTER_METRICS_FILE = "data/filter_metrics.json"
 
 
 class SimplifiedGGUFetcher:
@@ -44,7 +85,34 @@ class SimplifiedGGUFetcher:
     TOP_MODELS_LIMIT = 1000  # Number of top liked models to fetch
     RECENT_MODELS_API_LIMIT = 1000  # API limit for recent models query
     
-    def __init__(self, token: Optional[str] = None, filter_config: Optional[FilterConfig] = None, disable_spam_filter: bool = False):
+    # Listing fields requested from list_models (lastModified drives incremental mode)
+    LISTING_EXPAND = ['createdAt', 'downloads', 'likes', 'tags', 'lastModified', 'sha']
+    BULK_LISTING_EXPAND = ['siblings']  # Sibling filenames (no sizes) for bulk metadata mode
+    
+    # Detail fetching limits
+    THREAD_MAX_WORKERS = 10  # Worker cap for the threaded transport
+    THREAD_IN_FLIGHT_PER_WORKER = 2  # Submitted-but-unfinished fetches per thread, bounds listing read-ahead
+    ASYNC_MAX_IN_FLIGHT = 256  # Concurrent model_info requests for the async transport
+    ASYNC_POOL_SIZE = 32  # Keep-alive connections shared by in-flight requests
+    ASYNC_REQUEST_TIMEOUT = 30  # Seconds per model_info request
+    
+    # Rate limiting shared by all list_models/model_info calls
+    RATE_LIMIT_BURST = 50  # Token bucket capacity
+    RATE_LIMIT_INITIAL_CONCURRENCY = 32  # Starting in-flight limit, adapted by AIMD
+    
+    # Files written next to the output for clients that already hold an older version
+    OUTPUT_DELTA_SUFFIX = '.delta.json'  # Added/removed/changed entries since the previous output
+    OUTPUT_MANIFEST_SUFFIX = '.manifest.json'  # Current version plus the delta it can be patched from
+    OUTPUT_SHARDS_SUFFIX = '_shards'  # Directory of per-modelType and per-RAM-tier slices of the output
+    SHARD_RAM_TIERS = (8, 16, 32, 64, 128)  # minRamGB tiers, a model goes to the smallest that fits
+    SHARD_MAX_WORKERS = 8  # Threads writing shard files
+    
+    def __init__(self, token: Optional[str] = None, filter_config: Optional[FilterConfig] = None,
+                 disable_spam_filter: bool = False, transport: str = 'auto', incremental: bool = False,
+                 use_cache: bool = True, cache_ttl_hours: float = 24.0, cache_max_mb: int = 512,
+                 max_requests_per_second: float = 0.0, resume: bool = False,
+                 backend: Optional[HubBackend] = None, bulk_metadata: bool = False,
+                 raw_format: str = 'json', use_build_cache: bool = True, output_shards: bool = False):
         """
         Initialize the fetcher with optional HF token and spam filtering configuration.
         
@@ -52,13 +120,64 @@ class SimplifiedGGUFetcher:
             token: Optional Hugging Face API token for authenticated requests
             filter_config: Configuration for spam filtering (None to use defaults)
             disable_spam_filter: If True, skip spam filtering entirely
+            transport: Detail fetch transport: 'async', 'threads' or 'auto'
+                (async when aiohttp is installed, threads otherwise)
+            incremental: If True, only re-fetch details for repos whose lastModified
+                changed since the previous raw snapshot
+            use_cache: If True, serve model_info from the on-disk response cache
+            cache_ttl_hours: Maximum age of cached model_info responses
+            cache_max_mb: Size budget of the response cache in megabytes
+            max_requests_per_second: Sustained Hub API request rate of the rate limiter,
+                0 to rely on adaptive concurrency and Retry-After alone
+            resume: If True, reuse records from the download journal of an interrupted run
+            backend: Source of listing and model_info data (None for the live Hub)
+            bulk_metadata: If True, list sibling filenames with each model and skip
+                model_info for repos whose GGUF sizes are not needed or already known
+            raw_format: Raw snapshot format: 'json', 'jsonl', 'jsonl.gz', 'jsonl.zst', 'sqlite'
+                or 'partitioned' (per-month partitions with per-partition processing cache)
+            use_build_cache: If True, skip the process phase when its inputs are unchanged
+            output_shards: If True, also write the output split by modelType and RAM tier
         """
-        self.api = HfApi(token=token)
+        # HF_ENDPOINT lets the download phase run against a local stub server
+        self.endpoint = os.environ.get('HF_ENDPOINT', 'https://huggingface.co').rstrip('/')
+        self.token = token
+        self.backend = backend or HfApiBackend(self.endpoint, token)
         self.logger = logging.getLogger(__name__)
         
+        if transport == 'auto':
+            transport = 'async' if aiohttp is not None else 'threads'
+        elif transport == 'async' and aiohttp is None:
+            self.logger.warning("aiohttp is not installed, falling back to threaded transport")
+            transport = 'threads'
+        self.transport = transport
+        
+        if raw_format == 'jsonl.zst' and zstandard is None:
+            self.logger.warning("zstandard is not installed, writing gzip-compressed raw data instead")
+            raw_format = 'jsonl.gz'
+        self.raw_format = raw_format
+        self.incremental = incremental
+        self.last_batch_stats = {'processed': 0, 'successful': 0, 'failed': 0}
+        self.listing_sources = {}  # Model id -> listings that returned it, in the order the listings are given
+        self.detail_latencies = []  # Seconds per successful model_info request, limiter waits and retries included
+        self.resume = resume
+        self.bulk_metadata = bulk_metadata
+        
+        # All Hub API calls go through the adaptive rate limiter
+        max_concurrency = self.ASYNC_MAX_IN_FLIGHT if transport == 'async' else self.THREAD_MAX_WORKERS
+        self.rate_limiter = AdaptiveRateLimiter(
+            rate=max_requests_per_second,
+            burst=self.RATE_LIMIT_BURST,
+            initial_concurrency=self.RATE_LIMIT_INITIAL_CONCURRENCY,
+            max_concurrency=max_concurrency
+        )
+        
         # File paths
-        self.raw_data_file = "data/raw_models_data.json"
+        self.raw_data_file = RAW_DATA_FILES[raw_format]
+        self.raw_models_loaded = 0  # Records yielded by the last _load_raw_data pass
+        self.journal_file = "data/raw_models_data.journal.jsonl"
+        self.journal = DownloadJournal(self.journal_file)
         self.output_file = "gguf_models.json"  # Save directly to root directory
+        self.output_shards = output_shards
         
         # Spam filtering configuration
         self.filter_config = filter_config or FilterConfig()
@@ -70,64 +189,229 @@ class SimplifiedGGUFetcher:
         
         # Ensure data directory exists
         os.makedirs("data", exist_ok=True)
+        
+        # On-disk model_info response cache, opened by the phases that fetch details
+        self.model_info_cache = None
+        self.model_info_cache_settings = None
+        if use_cache:
+            self.model_info_cache_settings = {
+                'cache_dir': "data/model_info_cache",
+                'ttl_seconds': cache_ttl_hours * 3600,
+                'max_bytes': cache_max_mb * 1024 * 1024
+            }
+        
+        # Process phase results keyed on raw data, configuration and code version
+        self.build_cache = BuildCache("data/build_cache") if use_build_cache else None
+        self.partition_cache = PartitionResultCache("data/partition_cache") if raw_format == 'partitioned' else None
     
     def download_data(self) -> None:
         """
         Phase 1: Download model data from Hugging Face API and save locally.
         
-        Fetches recent models (last 90 days) and top liked models,
-        deduplicates them, and saves raw data for processing.
+        Streams recent models (last 90 days) and top liked models
+        concurrently, deduplicates them on first sight, and hands each unique
+        model to the detail fetcher while the listings are still paging.
         """
         self.logger.info("=" * 50)
         self.logger.info("STARTING DOWNLOAD PHASE")
         self.logger.info("=" * 50)
         
         try:
-            # Fetch both datasets with progress logging
-            self.logger.info("Step 1/3: Fetching recent models...")
-            recent_models = self._fetch_recent_models()
+            self._open_model_info_cache()
+            listing_counts = {'recent': 0, 'top': 0, 'total': 0, 'unique': 0}
+            
+            # Listings are consumed lazily by the detail fetcher
+            self.logger.info("Step 1/2: Streaming recent and top liked model listings...")
+            unique_models = self._iter_listed_models(listing_counts)
             
-            self.logger.info("Step 2/3: Fetching top liked models...")
-            top_models = self._fetch_top_models()
+            self.logger.info("Step 2/2: Fetching model details as models are listed...")
+            self._save_raw_data(unique_models)
             
-            self.logger.info("Step 3/3: Combining and deduplicating models...")
+            self._log_download_summary(listing_counts)
             
-            # Combine both model lists
-            all_models = recent_models + top_models
+            self.logger.info("=" * 50)
+            self.logger.info("DOWNLOAD PHASE COMPLETED SUCCESSFULLY")
+            self.logger.info("=" * 50)
             
-            # Deduplicate models by model ID
-            seen_ids = set()
-            deduplicated_models = []
+        except Exception as e:
+            self.logger.error(f"Download phase failed: {e}")
+            raise
+    
+    def _open_model_info_cache(self) -> None:
+        """Open the model_info response cache, if enabled, before the first detail fetch"""
+        if self.model_info_cache is None and self.model_info_cache_settings is not None:
+            self.model_info_cache = ModelInfoCache(**self.model_info_cache_settings)
+    
+    def run_pipeline(self) -> None:
+        """
+        Run download and process phases as one producer/consumer pipeline.
+        
+        The detail fetcher produces raw records while this thread consumes
+        them: GGUF extraction, size filtering and finetune classification run
+        on each repo as soon as its model_info completes. Grouping, variant
+        selection and hardware calculation wait for the full set, then the
+        raw snapshot and final output are written as in the two-phase run.
+        """
+        self.logger.info("=" * 50)
+        self.logger.info("STARTING PIPELINE (DOWNLOAD + PROCESS)")
+        self.logger.info("=" * 50)
+        
+        try:
+            start_time = time.time()
+            self._open_model_info_cache()
+            listing_counts = {'recent': 0, 'top': 0, 'total': 0, 'unique': 0}
+            report = ProcessingReport()
+            errors = []
+            prefiltered_models = []
             
-            for model in all_models:
+            def on_record(raw_model):
+                """Consume one raw record as soon as its details arrive"""
                 try:
-                    model_id = model.id
-                    if model_id not in seen_ids:
-                        seen_ids.add(model_id)
-                        deduplicated_models.append(model)
+                    if self.disable_spam_filter:
+                        prefiltered_models.extend(self._extract_model_info(raw_model))
+                    else:
+                        prefiltered_models.extend(self.spam_engine.prefilter_raw_model(raw_model, report, errors))
                 except Exception as e:
-                    self.logger.warning(f"Error processing model during deduplication: {e}")
-                    continue
+                    errors.append(f"Error processing raw model {raw_model.get('id', 'unknown')}: {str(e)}")
+            
+            self.logger.info("Step 1/3: Streaming listings, fetching details and prefiltering repos...")
+            unique_models = self._iter_listed_models(listing_counts)
+            raw_models = self._save_raw_data(unique_models, on_record=on_record)
+            self._log_download_summary(listing_counts)
+            
+            if not raw_models:
+                self.logger.warning("No raw data fetched, nothing to process")
+                return
+            self.logger.info(f"Prefiltered {len(raw_models)} repos into {len(prefiltered_models)} candidate entries")
             
-            # Log summary statistics
-            self.logger.info(f"Download Summary:")
-            self.logger.info(f"  - Recent models (90 days): {len(recent_models)}")
-            self.logger.info(f"  - Top liked models: {len(top_models)}")
-            self.logger.info(f"  - Total before deduplication: {len(all_models)}")
-            self.logger.info(f"  - Unique models after deduplication: {len(deduplicated_models)}")
-            self.logger.info(f"  - Duplicates removed: {len(all_models) - len(deduplicated_models)}")
+            if self.disable_spam_filter:
+                self.logger.info("Step 2/3: Skipping spam filtering (disabled)")
+                final_models = prefiltered_models
+            else:
+                if self.filter_config.backup_enabled:
+                    self.logger.info("Creating backup of raw data...")
+                    backup_path = self.spam_engine.create_backup(raw_models)
+                    if backup_path:
+                        self.logger.info(f"Backup created: {backup_path}")
+                    else:
+                        self.logger.warning("Failed to create backup")
+                
+                self.logger.info("Step 2/3: Selecting variants within model groups...")
+                filter_result = self.spam_engine.finalize_models(prefiltered_models, report, errors, start_time)
+                
+                if not filter_result.success:
+                    self.logger.error("Spam filtering failed:")
+                    for error in filter_result.errors:
+                        self.logger.error(f"  - {error}")
+                    raise Exception("Spam filtering failed")
+                
+                self.logger.info("\n" + self.spam_engine.generate_report(filter_result))
+                self.spam_engine.write_metrics(filter_result, FILTER_METRICS_FILE)
+                final_models = filter_result.filtered_models
             
-            # Save raw model data to JSON file
-            self._save_raw_data(deduplicated_models)
+            self.logger.info("Step 3/3: Generating final output...")
+            self._generate_output(final_models)
             
             self.logger.info("=" * 50)
-            self.logger.info("DOWNLOAD PHASE COMPLETED SUCCESSFULLY")
+            self.logger.info(f"PIPELINE COMPLETED SUCCESSFULLY in {time.time() - start_time:.1f}s")
             self.logger.info("=" * 50)
             
         except Exception as e:
-            self.logger.error(f"Download phase failed: {e}")
+            self.logger.error(f"Pipeline failed: {e}")
             raise
     
+    def _iter_listed_models(self, listing_counts: Dict) -> Iterator:
+        """
+        Stream unique models from the recent and top liked listings, run concurrently.
+        
+        Args:
+            listing_counts: Dictionary updated with per-source, total and unique counts
+            
+        Yields:
+            Unique model objects
+        """
+        return self._iter_unique_models(
+            [('recent', self._iter_recent_models()), ('top', self._iter_top_models())],
+            listing_counts
+        )
+    
+    def _log_download_summary(self, listing_counts: Dict) -> None:
+        """Log listing and deduplication statistics"""
+        self.logger.info(f"Download Summary:")
+        self.logger.info(f"  - Recent models (90 days): {listing_counts['recent']}")
+        self.logger.info(f"  - Top liked models: {listing_counts['top']}")
+        self.logger.info(f"  - Total before deduplication: {listing_counts['total']}")
+        self.logger.info(f"  - Unique models after deduplication: {listing_counts['unique']}")
+        self.logger.info(f"  - Duplicates removed: {listing_counts['total'] - listing_counts['unique']}")
+    
+    def _iter_unique_models(self, sources: List[Tuple[str, Iterable]], listing_counts: Dict) -> Iterator:
+        """
+        Merge listing streams and yield each model id once, on first sight.
+        
+        Each source is paged on its own thread into a shared queue, so a repo
+        listed by both is dispatched as soon as the faster listing reaches it.
+        Every sighting is recorded in self.listing_sources for provenance,
+        ordered as the sources are rather than by which thread got there
+        first, so the raw snapshot does not depend on thread timing.
+        
+        Args:
+            sources: (source name, model stream) pairs
+            listing_counts: Dictionary updated with per-source, total and unique counts
+            
+        Yields:
+            Unique model objects
+        """
+        self.listing_sources = {}
+        source_order = {name: position for position, (name, _) in enumerate(sources)}
+        listed = queue.Queue()
+        stop = threading.Event()
+        finished = object()
+        
+        def drain(source_name, models):
+            """Page one listing into the shared queue"""
+            try:
+                for model in models:
+                    if stop.is_set():
+                        break
+                    listed.put((source_name, model))
+            except Exception as e:
+                listed.put((source_name, e))
+            finally:
+                listed.put((source_name, finished))
+        
+        workers = [
+            threading.Thread(target=drain, args=source, name=f"hf-list-{source[0]}", daemon=True)
+            for source in sources
+        ]
+        for worker in workers:
+            worker.start()
+        
+        try:
+            active = len(workers)
+            while active:
+                source_name, model = listed.get()
+                if model is finished:
+                    active -= 1
+                    continue
+                if isinstance(model, Exception):
+                    raise model
+                
+                listing_counts[source_name] += 1
+                listing_counts['total'] += 1
+                try:
+                    model_id = model.id
+                    sightings = self.listing_sources.setdefault(model_id, [])
+                    sightings.append(source_name)
+                    sightings.sort(key=source_order.get)
+                    if len(sightings) == 1:
+                        listing_counts['unique'] += 1
+                        yield model
+                except Exception as e:
+                    self.logger.warning(f"Error processing model during deduplication: {e}")
+                    continue
+        finally:
+            stop.set()
+    
     def _fetch_recent_models(self) -> List[Dict]:
         """
         Fetch models uploaded in the last 90 days with GGUF filter.
@@ -135,69 +419,103 @@ class SimplifiedGGUFetcher:
         Returns:
             List of model dictionaries from the last 90 days
         """
+        return list(self._iter_recent_models())
+    
+    def _iter_recent_models(self) -> Iterator:
+        """
+        Stream models uploaded in the last 90 days with GGUF filter.
+        
+        list_models pages lazily, so paging stops as soon as the first model
+        older than the cutoff is seen, and each qualifying model is yielded
+        while later pages are still to be requested.
+        
+        Yields:
+            Model objects from the last 90 days, newest first
+        """
         # Calculate date using RECENT_DAYS_LIMIT
         cutoff_date = datetime.now() - timedelta(days=self.RECENT_DAYS_LIMIT)
         self.logger.info(f"Fetching GGUF models created since {cutoff_date.strftime('%Y-%m-%d')}")
         
+        recent_count = 0
+        skipped_no_date = 0
+        skipped_too_old = 0
+        
         try:
             # Get models with GGUF filter, sorted by creation date
-            # Using a larger limit to ensure we get enough recent models
             self.logger.debug("Querying Hugging Face API for recent models...")
-            models = list(self.api.list_models(
+            models = self._list_models(
                 filter="gguf",
                 sort="createdAt",
                 direction=-1,  # Newest first
-                limit=self.RECENT_MODELS_API_LIMIT  # Get more models to filter by date
-            ))
-            
-            self.logger.debug(f"Retrieved {len(models)} models from API, filtering by date...")
-            
-            # Filter models by created_at field to get last 90 days only
-            recent_models = []
-            skipped_no_date = 0
-            skipped_too_old = 0
+                limit=self.RECENT_MODELS_API_LIMIT,  # Upper bound, paging stops at the cutoff
+                expand=self._listing_expand()
+            )
             
             for model in models:
-                try:
-                    if hasattr(model, 'created_at') and model.created_at:
-                        # Parse the created_at datetime
-                        created_date = model.created_at
-                        if isinstance(created_date, str):
-                            # If it's a string, parse it
-                            try:
-                                created_date = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
-                            except ValueError:
-                                # Skip if we can't parse the date
-                                skipped_no_date += 1
-                                continue
-                        
-                        # Check if model was created in the last 90 days
-                        if created_date.replace(tzinfo=None) >= cutoff_date:
-                            recent_models.append(model)
-                        else:
-                            # Since models are sorted by creation date (newest first),
-                            # we can break once we hit models older than 90 days
-                            skipped_too_old += 1
-                            break
-                    else:
-                        skipped_no_date += 1
-                except Exception as e:
-                    self.logger.debug(f"Error processing model {getattr(model, 'id', 'unknown')}: {e}")
+                created_date = self._parse_created_at(model)
+                if created_date is None:
                     skipped_no_date += 1
                     continue
+                
+                # Check if model was created in the last 90 days
+                if created_date.replace(tzinfo=None) >= cutoff_date:
+                    recent_count += 1
+                    yield model
+                else:
+                    # Since models are sorted by creation date (newest first),
+                    # we can stop paging once we hit models older than 90 days
+                    skipped_too_old += 1
+                    break
+                    
+        except Exception as e:
+            self.logger.error(f"Failed to fetch recent models: {e}")
+            self.logger.warning(f"Continuing with the {recent_count} recent models listed so far")
+        
+        # Log summary statistics
+        self.logger.info(f"Recent models summary:")
+        self.logger.info(f"  - Models found in last 90 days: {recent_count}")
+        self.logger.info(f"  - Models skipped (no date): {skipped_no_date}")
+        self.logger.info(f"  - Models skipped (too old): {skipped_too_old}")
+    
+    def _list_models(self, **kwargs) -> Iterator:
+        """
+        Stream list_models results through the rate limiter.
+        
+        Every listing page request takes a limiter token; a throttled page
+        waits as instructed by the limiter and is requested again.
+        
+        Args:
+            **kwargs: Arguments passed to HfApi.list_models
             
-            # Log summary statistics
-            self.logger.info(f"Recent models summary:")
-            self.logger.info(f"  - Models found in last 90 days: {len(recent_models)}")
-            self.logger.info(f"  - Models skipped (no date): {skipped_no_date}")
-            self.logger.info(f"  - Models skipped (too old): {skipped_too_old}")
-            
-            return recent_models
+        Yields:
+            Model objects from the listing
+        """
+        def fetch_page(request):
+            return self.rate_limiter.call(request, concurrent=False)
+        
+        yield from self.backend.list_models(fetch_page=fetch_page, **kwargs)
+    
+    def _parse_created_at(self, model) -> Optional[datetime]:
+        """
+        Get the creation date of a listed model.
+        
+        Args:
+            model: Model object from list_models
             
+        Returns:
+            Creation datetime, None if missing or unparseable
+        """
+        try:
+            created_date = getattr(model, 'created_at', None)
+            if not created_date:
+                return None
+            if isinstance(created_date, str):
+                # If it's a string, parse it
+                created_date = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
+            return created_date
         except Exception as e:
-            self.logger.error(f"Failed to fetch recent models: {e}")
-            self.logger.warning("Continuing with empty recent models list")
-            return []
+            self.logger.debug(f"Error processing model {getattr(model, 'id', 'unknown')}: {e}")
+            return None
     
     def _fetch_top_models(self) -> List[Dict]:
         """
@@ -206,46 +524,62 @@ class SimplifiedGGUFetcher:
         Returns:
             List of top 1000 most liked model dictionaries
         """
+        return list(self._iter_top_models())
+    
+    def _iter_top_models(self) -> Iterator:
+        """
+        Stream the top 1000 most liked GGUF models of all time.
+        
+        Yields:
+            Model objects, highest like count first
+        """
         self.logger.info("Fetching top 1000 most liked GGUF models of all time...")
         
+        top_count = 0
+        top_likes = 0
+        
         try:
             # Get models with GGUF filter, sorted by likes in descending order
             self.logger.debug("Querying Hugging Face API for top liked models...")
-            models = list(self.api.list_models(
+            models = self._list_models(
                 filter="gguf",
                 sort="likes",
                 direction=-1,  # Highest likes first
-                limit=self.TOP_MODELS_LIMIT  # Top 1000 models
-            ))
-            
-            # Log some statistics about the top models
-            if models:
-                top_likes = getattr(models[0], 'likes', 0) if models else 0
-                self.logger.info(f"Top liked models summary:")
-                self.logger.info(f"  - Models retrieved: {len(models)}")
-                self.logger.info(f"  - Highest like count: {top_likes:,}")
-            else:
-                self.logger.warning("No top liked models found")
-            
-            return models
+                limit=self.TOP_MODELS_LIMIT,  # Top 1000 models
+                expand=self._listing_expand()
+            )
             
+            for model in models:
+                if top_count == 0:
+                    top_likes = getattr(model, 'likes', 0) or 0
+                top_count += 1
+                yield model
+                
         except Exception as e:
             self.logger.error(f"Failed to fetch top liked models: {e}")
-            self.logger.warning("Continuing with empty top models list")
-            return []
+            self.logger.warning(f"Continuing with the {top_count} top models listed so far")
+        
+        # Log some statistics about the top models
+        if top_count:
+            self.logger.info(f"Top liked models summary:")
+            self.logger.info(f"  - Models retrieved: {top_count}")
+            self.logger.info(f"  - Highest like count: {top_likes:,}")
+        else:
+            self.logger.warning("No top liked models found")
     
-    def _save_raw_data(self, models: List[Dict]) -> None:
+    def _save_raw_data(self, models: Iterable, on_record=None) -> List[Dict]:
         """
         Save raw model data to JSON file.
         
         Args:
-            models: List of model dictionaries to save
-        """
-        if not models:
-            self.logger.warning("No models to save")
-            return
+            models: List or stream of listed model objects to save
+            on_record: Optional callback receiving each raw record as soon as it is ready
             
-        self.logger.info(f"Saving {len(models)} models to {self.raw_data_file}...")
+        Returns:
+            List of saved raw model dictionaries
+        """
+        model_count = f"{len(models)} " if hasattr(models, '__len__') else ""
+        self.logger.info(f"Saving {model_count}models to {self.raw_data_file}...")
         
         try:
             # Convert model objects to dictionaries for JSON serialization
@@ -259,14 +593,72 @@ class SimplifiedGGUFetcher:
                 'min_likes': float('inf')
             }
             
-            # Use batch processing with threading for efficiency
-            self.logger.info(f"Fetching detailed info for {len(models)} models using batch processing...")
-            models_data = self._batch_fetch_model_details(models, engagement_stats)
-            failed_models = len(models) - len(models_data)
+            # Completed records are journaled as they arrive; resume skips them
+            journaled_records = self.journal.load() if self.resume else {}
+            if self.resume:
+                self.logger.info(f"Resuming download: {len(journaled_records)} models already in {self.journal_file}")
+            resumed_records = []
+            models = self._skip_journaled_models(models, journaled_records, resumed_records)
+            
+            # Incremental and bulk modes share one load of the previous snapshot
+            previous_records = self._load_previous_snapshot() if self.incremental or self.bulk_metadata else {}
+            try:
+                # Bulk mode resolves repos from the listing alone where sizes are not needed
+                bulk_records = []
+                if self.bulk_metadata:
+                    bulk_counts = {'no_gguf': 0, 'known_sizes': 0, 'detail': 0}
+                    models = self._resolve_from_listing(models, previous_records, bulk_records, bulk_counts)
+            
+                self.journal.open(append=self.resume)
+                try:
+                    if self.incremental:
+                        models_data = self._incremental_fetch_model_details(models, previous_records, engagement_stats,
+                                                                            on_record=on_record)
+                    else:
+                        # Use batch processing with threading for efficiency
+                        self.logger.info(f"Fetching detailed info for {model_count}models using batch processing...")
+                        models_data = self._batch_fetch_model_details(models, engagement_stats, on_record=on_record)
+                finally:
+                    self.journal.close()
+            finally:
+                # An SQLite snapshot is read through an open store, released before the new snapshot replaces it
+                if isinstance(previous_records, RawModelStore):
+                    previous_records.close()
+            failed_models = self.last_batch_stats['failed']
+            
+            for record in resumed_records:
+                models_data.append(record)
+                self._update_engagement_stats(engagement_stats, record.get('likes', 0))
+                if on_record:
+                    on_record(record)
+            if self.resume:
+                self.logger.info(f"  - Models reused from journal: {len(resumed_records)}")
+            
+            for record, likes in bulk_records:
+                models_data.append(record)
+                self._update_engagement_stats(engagement_stats, likes)
+                if on_record:
+                    on_record(record)
+            if self.bulk_metadata:
+                avoided = bulk_counts['no_gguf'] + bulk_counts['known_sizes']
+                self.logger.info(f"Bulk metadata summary:")
+                self.logger.info(f"  - Resolved from listing (no GGUF files): {bulk_counts['no_gguf']}")
+                self.logger.info(f"  - Resolved from listing (GGUF sizes known): {bulk_counts['known_sizes']}")
+                self.logger.info(f"  - Sent to model_info: {bulk_counts['detail']}")
+                self.logger.info(f"  - Detail calls avoided: {avoided}/{avoided + bulk_counts['detail']}")
+            
+            if not models_data:
+                self.logger.warning("No models to save")
+                return []
+            
+            # Keep per-listing provenance on each record
+            if self.listing_sources:
+                for record in models_data:
+                    record['sources'] = self.listing_sources.get(record.get('id'), [])
             
-            # Save to JSON file
-            with open(self.raw_data_file, 'w', encoding='utf-8') as f:
-                json.dump(models_data, f, indent=2, ensure_ascii=False)
+            # Save the raw snapshot, compacting the journal into it
+            write_raw_file(self.raw_data_file, models_data)
+            self.journal.remove()
             
             # Calculate engagement statistics
             avg_likes = engagement_stats['total_likes'] / max(engagement_stats['models_with_likes'], 1)
@@ -288,115 +680,715 @@ class SimplifiedGGUFetcher:
                 self.logger.info(f"  - Average likes per model: {avg_likes:.1f}")
                 self.logger.info(f"  - Like count range: {engagement_stats['min_likes']} to {engagement_stats['max_likes']:,}")
             
+            return models_data
+            
         except Exception as e:
             self.logger.error(f"Critical error saving raw data: {e}")
             raise
     
-    def _batch_fetch_model_details(self, models: List[Dict], engagement_stats: Dict) -> List[Dict]:
+    def _skip_journaled_models(self, models: Iterable, journaled_records: Dict[str, Dict],
+                               resumed_records: List[Dict]) -> Iterator:
+        """
+        Drop models whose records are already in the journal.
+        
+        Args:
+            models: List or stream of basic model objects from list_models
+            journaled_records: Records from the journal keyed by model id
+            resumed_records: List collecting the journaled records of skipped models
+            
+        Yields:
+            Models that still need their details fetched
+        """
+        for model in models:
+            record = journaled_records.get(getattr(model, 'id', None))
+            if record is not None:
+                resumed_records.append(record)
+                continue
+            yield model
+    
+    def _listing_expand(self) -> List[str]:
+        """Get the list_models expand fields for the configured mode"""
+        if self.bulk_metadata:
+            return self.LISTING_EXPAND + self.BULK_LISTING_EXPAND
+        return self.LISTING_EXPAND
+    
+    def _resolve_from_listing(self, models: Iterable, previous_records: Dict[str, Dict],
+                              bulk_records: List[Tuple[Dict, int]], bulk_counts: Dict) -> Iterator:
+        """
+        Build records from listed siblings where a model_info call adds nothing.
+        
+        The Hub listing returns sibling filenames but not their sizes, and only
+        GGUF file sizes are used downstream. A repo is resolved without a detail
+        call if it has no GGUF files, or if it is unchanged since the previous
+        raw snapshot (same listed lastModified) and every GGUF file's size is
+        known from it. Any change to the repo, such as a GGUF re-uploaded
+        under the same name, triggers a detail call for fresh sizes and hashes.
+        
+        Args:
+            models: List or stream of model objects listed with siblings
+            previous_records: Previous raw snapshot keyed by model id
+            bulk_records: List collecting (model_dict, likes) for resolved repos
+            bulk_counts: Dictionary counting 'no_gguf', 'known_sizes' and 'detail' repos
+            
+        Yields:
+            Models that still need model_info for their GGUF sizes
+        """
+        for model in models:
+            listed_siblings = getattr(model, 'siblings', None)
+            if listed_siblings is None:
+                bulk_counts['detail'] += 1
+                yield model
+                continue
+            
+            previous = previous_records.get(getattr(model, 'id', None)) or {}
+            last_modified = self._get_last_modified(model)
+            if not last_modified or previous.get('lastModified') != last_modified:
+                previous = {}  # Sizes and hashes of a changed repo may be stale
+            known_sizes = {
+                sibling.get('rfilename'): sibling.get('size')
+                for sibling in previous.get('siblings', [])
+                if sibling.get('size') is not None
+            }
+            known_hashes = {
+                sibling.get('rfilename'): sibling['sha256']
+                for sibling in previous.get('siblings', [])
+                if sibling.get('sha256')
+            }
+            gguf_files = [s.rfilename for s in listed_siblings if s.rfilename.lower().endswith('.gguf')]
+            
+            if gguf_files and not all(filename in known_sizes for filename in gguf_files):
+                bulk_counts['detail'] += 1
+                yield model
+                continue
+            
+            bulk_counts['known_sizes' if gguf_files else 'no_gguf'] += 1
+            detailed_model = ModelInfo(
+                id=model.id,
+                likes=getattr(model, 'likes', 0),
+                siblings=[
+                    {'rfilename': sibling.rfilename, 'size': known_sizes.get(sibling.rfilename)}
+                    for sibling in listed_siblings
+                ]
+            )
+            model_dict, likes = self._build_model_record(model, detailed_model)
+            if model_dict:
+                for sibling in model_dict['siblings']:
+                    if sibling['rfilename'] in known_hashes:
+                        sibling['sha256'] = known_hashes[sibling['rfilename']]
+                bulk_records.append((model_dict, likes))
+    
+    def _batch_fetch_model_details(self, models: Iterable, engagement_stats: Dict, on_record=None) -> List[Dict]:
+        """
+        Efficiently fetch detailed model information using the configured transport.
+        
+        Models may be a stream: requests start as soon as each model is listed.
+        
+        Args:
+            models: List or stream of basic model objects from list_models
+            engagement_stats: Dictionary to track engagement statistics
+            on_record: Optional callback receiving each record in completion order
+            
+        Returns:
+            List of processed model dictionaries with detailed info
+        """
+        models_data = []
+        failed_models = 0
+        processed = 0
+        total = len(models) if hasattr(models, '__len__') else None
+        
+        self.detail_latencies = []
+        started = time.monotonic()
+        if self.transport == 'async':
+            self.logger.info(f"Using async transport: {self.ASYNC_MAX_IN_FLIGHT} requests in flight "
+                             f"over {self.ASYNC_POOL_SIZE} keep-alive connections")
+            results = self._iter_async_model_details(models)
+        else:
+            results = self._iter_threaded_model_details(models)
+        
+        # Process results in completion order
+        for i, (model_dict, likes) in enumerate(results, 1):
+            processed = i
+            try:
+                if model_dict:
+                    models_data.append(model_dict)
+                    # A resumed run trusts journaled records, so records missing details are left out
+                    if self._has_complete_details(model_dict):
+                        self.journal.append(model_dict)
+                    self._update_engagement_stats(engagement_stats, likes)
+                    if on_record:
+                        on_record(model_dict)
+                else:
+                    failed_models += 1
+                    
+                # Log progress every 10 models
+                if total and (i % 10 == 0 or i == total):
+                    self.logger.info(f"Batch progress: {i}/{total} models processed ({(i/total*100):.1f}%)")
+                elif not total and i % 10 == 0:
+                    self.logger.info(f"Batch progress: {i} models processed")
+                    
+            except Exception as e:
+                failed_models += 1
+                self.logger.warning(f"Error processing batch result: {e}")
+        
+        self.logger.info(f"Batch processing completed: {len(models_data)} successful, {failed_models} failed")
+        self.last_batch_stats = {'processed': processed, 'successful': len(models_data), 'failed': failed_models}
+        
+        self._log_detail_throughput(processed, time.monotonic() - started)
+        self.logger.info(f"Rate limiter metrics: {json.dumps(self.rate_limiter.metrics(), sort_keys=True)}")
+        backend_stats = self.backend.stats()
+        if backend_stats:
+            self.logger.info(f"{type(self.backend).__name__} stats: {json.dumps(backend_stats, sort_keys=True)}")
+        
+        if self.model_info_cache:
+            cache_stats = self.model_info_cache.stats()
+            self.logger.info(f"Model info cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                             f"({cache_stats['hit_rate']*100:.1f}% hit rate), {cache_stats['expired']} expired, "
+                             f"{cache_stats['evictions']} evicted, {cache_stats['size_bytes']:,} bytes on disk")
+        return models_data
+    
+    def _log_detail_throughput(self, processed: int, elapsed: float) -> None:
+        """
+        Log detail phase throughput and model_info latency percentiles.
+        
+        Args:
+            processed: Number of models whose detail fetch completed
+            elapsed: Wall time of the detail phase in seconds
+        """
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        self.logger.info(f"Detail throughput: {processed} models in {elapsed:.2f}s ({rate:.1f} models/s)")
+        
+        latencies = sorted(self.detail_latencies)
+        if not latencies:
+            return
+        def percentile(fraction):
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+        self.logger.info(f"model_info latency over {len(latencies)} requests: p50 {percentile(0.50):.0f}ms, "
+                         f"p95 {percentile(0.95):.0f}ms, p99 {percentile(0.99):.0f}ms, max {latencies[-1]*1000:.0f}ms")
+    
+    def _update_engagement_stats(self, engagement_stats: Dict, likes: int) -> None:
+        """
+        Add one model's like count to the running engagement statistics.
+        
+        Args:
+            engagement_stats: Dictionary to track engagement statistics
+            likes: Validated like count of the model
+        """
+        if likes > 0:
+            engagement_stats['models_with_likes'] += 1
+            engagement_stats['total_likes'] += likes
+            engagement_stats['max_likes'] = max(engagement_stats['max_likes'], likes)
+            engagement_stats['min_likes'] = min(engagement_stats['min_likes'], likes)
+        else:
+            engagement_stats['models_missing_likes'] += 1
+    
+    def _incremental_fetch_model_details(self, models: Iterable, previous_records: Dict[str, Dict],
+                                         engagement_stats: Dict, on_record=None) -> List[Dict]:
+        """
+        Fetch details only for repos that are new or whose lastModified changed.
+        
+        Unchanged repos reuse siblings and cardData from the previous raw snapshot,
+        with listing fields (downloads, likes, tags) refreshed from list_models.
+        Repos whose previous record lacks its details are fetched again.
+        
+        Args:
+            models: List or stream of basic model objects from list_models
+            previous_records: Previous raw snapshot from _load_previous_snapshot()
+            engagement_stats: Dictionary to track engagement statistics
+            on_record: Optional callback receiving each record as soon as it is ready
+            
+        Returns:
+            List of processed model dictionaries with detailed info
+        """
+        carried_records = []
+        counts = {'changed': 0, 'new': 0, 'incomplete': 0}
+        
+        if on_record:
+            # Carried records are delivered from the listing stream, which may run
+            # on another thread than fetched records, so serialize the callback
+            record_lock = threading.Lock()
+            user_callback = on_record
+            
+            def on_record(record):
+                with record_lock:
+                    user_callback(record)
+        
+        def changed_models():
+            """Yield new or changed models, set aside unchanged ones"""
+            for model in models:
+                model_id = getattr(model, 'id', None)
+                previous = previous_records.get(model_id)
+                last_modified = self._get_last_modified(model)
+                
+                if previous is None:
+                    counts['new'] += 1
+                    yield model
+                elif not self._has_complete_details(previous):
+                    counts['incomplete'] += 1
+                    yield model
+                elif last_modified and previous.get('lastModified') == last_modified:
+                    carried = self._carry_forward_record(model, previous)
+                    carried_records.append(carried)
+                    if on_record:
+                        on_record(carried[0])
+                else:
+                    counts['changed'] += 1
+                    yield model
+        
+        self.logger.info("Fetching detailed info for new and changed models using batch processing...")
+        models_data = self._batch_fetch_model_details(changed_models(), engagement_stats, on_record=on_record)
+        
+        self.logger.info(f"Incremental download summary:")
+        self.logger.info(f"  - Previous snapshot entries: {len(previous_records)}")
+        self.logger.info(f"  - Unchanged (copied forward): {len(carried_records)}")
+        self.logger.info(f"  - Changed (re-fetched): {counts['changed']}")
+        self.logger.info(f"  - New (fetched): {counts['new']}")
+        self.logger.info(f"  - Missing details (re-fetched): {counts['incomplete']}")
+        
+        for model_dict, likes in carried_records:
+            models_data.append(model_dict)
+            self._update_engagement_stats(engagement_stats, likes)
+        
+        return models_data
+    
+    def _load_previous_snapshot(self):
+        """
+        Load the previous raw snapshot indexed by model id.
+        
+        An SQLite snapshot is not loaded: the store itself answers the
+        per-id lookups from its index, and the caller closes it.
+        
+        Returns:
+            Mapping from model id to its raw record, empty if unavailable
+        """
+        if not os.path.exists(self.raw_data_file):
+            self.logger.info("No previous raw snapshot found, fetching all models")
+            return {}
+        
+        try:
+            if self.raw_format == 'sqlite':
+                return RawModelStore(self.raw_data_file)
+            return {record['id']: record for record in iter_raw_file(self.raw_data_file) if record.get('id')}
+        except Exception as e:
+            self.logger.warning(f"Could not read previous raw snapshot, fetching all models: {e}")
+            return {}
+    
+    @staticmethod
+    def _has_complete_details(record: Dict) -> bool:
+        """
+        Check whether a raw record holds the model_info details it was fetched for.
+        
+        Records built from listing data after a failed detail fetch are flagged
+        with detailsMissing; a GGUF sibling without a size marks older ones.
+        
+        Args:
+            record: Raw model record
+            
+        Returns:
+            True if the record can be reused without fetching its details again
+        """
+        if record.get('detailsMissing'):
+            return False
+        return all(
+            sibling.get('size') is not None
+            for sibling in record.get('siblings', [])
+            if sibling.get('rfilename', '').lower().endswith('.gguf')
+        )
+    
+    def _carry_forward_record(self, model, previous: Dict) -> Tuple[Dict, int]:
+        """
+        Reuse a previous raw record for an unchanged repo, refreshing listing fields.
+        
+        Args:
+            model: Basic model object from list_models
+            previous: Raw record for the same repo from the previous snapshot
+            
+        Returns:
+            (model_dict, likes) tuple
+        """
+        model_id = getattr(model, 'id', 'unknown')
+        likes = self._validate_engagement_metric(getattr(model, 'likes', 0), model_id, 'likes')
+        
+        model_dict = dict(previous)
+        model_dict['downloads'] = getattr(model, 'downloads', previous.get('downloads', 0))
+        model_dict['likes'] = likes
+        model_dict['tags'] = getattr(model, 'tags', None) or previous.get('tags', [])
+        
+        return model_dict, likes
+    
+    def _get_last_modified(self, model) -> Optional[str]:
+        """
+        Get the lastModified timestamp of a listed model as an ISO string.
+        
+        Args:
+            model: Model object from list_models or model_info
+            
+        Returns:
+            ISO formatted timestamp, None if the model carries no lastModified
+        """
+        last_modified = getattr(model, 'last_modified', None) or getattr(model, 'lastModified', None)
+        if last_modified and hasattr(last_modified, 'isoformat'):
+            return last_modified.isoformat()
+        return last_modified
+    
+    def _iter_threaded_model_details(self, models: Iterable) -> Iterator[Tuple[Optional[Dict], int]]:
+        """
+        Fetch model details with blocking HfApi calls on a thread pool.
+        
+        Only a bounded window of models is submitted at a time: the next
+        models are pulled from the listing as earlier fetches finish, so
+        results stream out while the listing is still being read.
+        
+        Args:
+            models: List or stream of basic model objects from list_models
+            
+        Yields:
+            (model_dict, likes) tuples in completion order, model_dict is None on failure
+        """
+        def fetch_single_model(model):
+            """Fetch detailed info for a single model"""
+            model_id = getattr(model, 'id', 'unknown')
+            detailed_model = self._get_cached_model_info(model)
+            if detailed_model is not None:
+                return self._build_model_record(model, detailed_model)
+            try:
+                started = time.monotonic()
+                detailed_model = self.rate_limiter.call(self.backend.model_info, model_id, files_metadata=True)
+                self.detail_latencies.append(time.monotonic() - started)
+                self._store_cached_model_info(model, self._model_info_payload(detailed_model))
+            except Exception as e:
+                # Fallback to basic model data if detailed fetch fails
+                self.logger.debug(f"Detailed fetch failed for {model_id}, using basic data: {e}")
+                detailed_model = None
+            return self._build_model_record(model, detailed_model)
+        
+        # Use ThreadPoolExecutor for parallel processing
+        max_workers = self.THREAD_MAX_WORKERS  # Limit concurrent requests to avoid rate limiting
+        if hasattr(models, '__len__'):
+            max_workers = max(1, min(max_workers, len(models)))
+        self.logger.info(f"Using {max_workers} parallel workers for batch processing")
+        
+        window = max_workers * self.THREAD_IN_FLIGHT_PER_WORKER
+        model_iter = iter(models)
+        pending = set()
+        listing_done = False
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                while True:
+                    # Refill the window from the listing, then hand back whatever has finished
+                    while not listing_done and len(pending) < window:
+                        model = next(model_iter, None)
+                        if model is None:
+                            listing_done = True
+                        else:
+                            pending.add(executor.submit(fetch_single_model, model))
+                    if not pending:
+                        break
+                    
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        try:
+                            yield future.result()
+                        except Exception as e:
+                            self.logger.warning(f"Error processing batch result: {e}")
+                            yield None, 0
+            finally:
+                # On early cutoff, drop queued fetches instead of waiting for them
+                for future in pending:
+                    future.cancel()
+    
+    def _iter_async_model_details(self, models: Iterable) -> Iterator[Tuple[Optional[Dict], int]]:
+        """
+        Fetch model details with asyncio over a pooled aiohttp session.
+        
+        The event loop runs on a background thread and hands finished records
+        back through a queue, so callers consume results as they complete.
+        
+        Args:
+            models: List or stream of basic model objects from list_models
+            
+        Yields:
+            (model_dict, likes) tuples in completion order, model_dict is None on failure
+        """
+        results = queue.Queue()
+        done = object()
+        errors = []
+        
+        def run_loop():
+            try:
+                asyncio.run(self._async_fetch_model_details(models, results.put))
+            except Exception as e:
+                self.logger.error(f"Async detail fetch aborted: {e}")
+                errors.append(e)
+            finally:
+                results.put(done)
+        
+        worker = threading.Thread(target=run_loop, name="hf-async-fetch", daemon=True)
+        worker.start()
+        
+        while True:
+            item = results.get()
+            if item is done:
+                break
+            yield item
+        
+        worker.join()
+        # An aborted fetch must fail the download like the threaded transport does, not end it early
+        if errors:
+            raise errors[0]
+    
+    async def _async_fetch_model_details(self, models: Iterable, emit) -> None:
+        """
+        Run model_info requests for all models on a bounded keep-alive connection pool.
+        
+        The model source is advanced on an executor thread, so a blocking listing
+        stream keeps paging while earlier models are already being fetched. The
+        next model is only pulled once an in-flight slot is free, which bounds
+        both the pending tasks and the listing read-ahead.
+        
+        Args:
+            models: List or stream of basic model objects from list_models
+            emit: Callback receiving each (model_dict, likes) tuple as it completes
+        """
+        connector = aiohttp.TCPConnector(limit=self.ASYNC_POOL_SIZE, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=self.ASYNC_REQUEST_TIMEOUT)
+        headers = {'Authorization': f'Bearer {self.token}'} if self.token else {}
+        in_flight = asyncio.Semaphore(self.ASYNC_MAX_IN_FLIGHT)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            async def fetch(model):
+                try:
+                    emit(await self._async_fetch_single_model(session, model))
+                finally:
+                    in_flight.release()
+            
+            loop = asyncio.get_running_loop()
+            source = iter(models)
+            pending = set()
+            while True:
+                await in_flight.acquire()
+                model = await loop.run_in_executor(None, next, source, None)
+                if model is None:
+                    in_flight.release()
+                    break
+                pending.add(asyncio.ensure_future(fetch(model)))
+            
+                # Reap finished tasks, surfacing their failures
+                finished = {task for task in pending if task.done()}
+                pending -= finished
+                for task in finished:
+                    task.result()
+            
+            await asyncio.gather(*pending)
+    
+    async def _async_fetch_single_model(self, session, model) -> Tuple[Optional[Dict], int]:
+        """
+        Fetch detailed info for a single model through the shared aiohttp session.
+        
+        Mirrors HfApi.model_info(files_metadata=True): GET /api/models/{id}?blobs=true.
+        
+        Args:
+            session: Shared aiohttp.ClientSession
+            model: Basic model object from list_models
+            
+        Returns:
+            (model_dict, likes) tuple, model_dict is None on failure
+        """
+        model_id = getattr(model, 'id', 'unknown')
+        detailed_model = self._get_cached_model_info(model)
+        if detailed_model is not None:
+            return self._build_model_record(model, detailed_model)
+        try:
+            started = time.monotonic()
+            if not self.backend.uses_hub_http:
+                detailed_model = await self._async_backend_model_info(model_id)
+                self.detail_latencies.append(time.monotonic() - started)
+                self._store_cached_model_info(model, self._model_info_payload(detailed_model))
+                return self._build_model_record(model, detailed_model)
+            
+            url = f"{self.endpoint}/api/models/{model_id}"
+            payload = None
+            for attempt in range(self.rate_limiter.max_retries + 1):
+                await self.rate_limiter.acquire_async()
+                status = None
+                retry_after = None
+                try:
+                    async with session.get(url, params={'blobs': 'true'}) as response:
+                        status = response.status
+                        retry_after = response.headers.get('Retry-After')
+                        if status not in self.rate_limiter.THROTTLE_STATUSES:
+                            response.raise_for_status()
+                            payload = await response.json()
+                finally:
+                    self.rate_limiter.release(status, retry_after)
+                if payload is not None:
+                    break
+                self.rate_limiter.record_retry()
+            if payload is None:
+                raise RuntimeError(f"still throttled after {self.rate_limiter.max_retries + 1} attempts")
+            detailed_model = ModelInfo(**payload)
+            self.detail_latencies.append(time.monotonic() - started)
+            self._store_cached_model_info(model, self._model_info_payload(detailed_model))
+        except Exception as e:
+            # Fallback to basic model data if detailed fetch fails
+            self.logger.debug(f"Detailed fetch failed for {model_id}, using basic data: {e}")
+            detailed_model = None
+        return self._build_model_record(model, detailed_model)
+    
+    async def _async_backend_model_info(self, model_id: str):
+        """
+        Call the backend's async model_info through the rate limiter, retrying throttled calls.
+        
+        Used when the backend is not the live Hub HTTP API (e.g. replay).
+        
+        Args:
+            model_id: Repository id
+            
+        Returns:
+            ModelInfo returned by the backend
+        """
+        for attempt in range(self.rate_limiter.max_retries + 1):
+            await self.rate_limiter.acquire_async()
+            try:
+                detailed_model = await self.backend.model_info_async(model_id, files_metadata=True)
+            except Exception as e:
+                status, retry_after = self.rate_limiter.throttle_info(e)
+                self.rate_limiter.release(status, retry_after)
+                if status in self.rate_limiter.THROTTLE_STATUSES and attempt < self.rate_limiter.max_retries:
+                    self.rate_limiter.record_retry()
+                    continue
+                raise
+            self.rate_limiter.release(200)
+            return detailed_model
+    
+    def _get_revision(self, model) -> Optional[str]:
+        """
+        Get the revision identifier used to key cached model_info responses.
+        
+        Args:
+            model: Basic model object from list_models
+            
+        Returns:
+            Commit sha, else lastModified timestamp, None if neither is listed
+        """
+        return getattr(model, 'sha', None) or self._get_last_modified(model)
+    
+    def _model_info_payload(self, detailed_model) -> Dict:
         """
-        Efficiently fetch detailed model information using batch processing with threading.
+        Reduce a model_info result to the JSON payload stored in the response cache.
         
         Args:
-            models: List of basic model objects from list_models
-            engagement_stats: Dictionary to track engagement statistics
+            detailed_model: ModelInfo returned by model_info(files_metadata=True)
             
         Returns:
-            List of processed model dictionaries with detailed info
+            Payload dictionary accepted by ModelInfo(**payload)
         """
-        models_data = []
-        failed_models = 0
+        siblings = []
+        for sibling in (getattr(detailed_model, 'siblings', None) or []):
+            sibling_payload = {'rfilename': sibling.rfilename, 'size': getattr(sibling, 'size', None)}
+            lfs = getattr(sibling, 'lfs', None)
+            if lfs is not None and sibling.rfilename.lower().endswith('.gguf'):
+                sibling_payload['lfs'] = {'size': lfs.size, 'sha256': lfs.sha256, 'pointerSize': lfs.pointer_size}
+            siblings.append(sibling_payload)
+        
+        return {
+            'id': detailed_model.id,
+            'likes': getattr(detailed_model, 'likes', 0),
+            'siblings': siblings
+        }
+    
+    def _get_cached_model_info(self, model):
+        """
+        Look up a model_info response in the on-disk cache.
         
-        def fetch_single_model(model):
-            """Fetch detailed info for a single model"""
-            try:
-                model_id = getattr(model, 'id', 'unknown')
-                
-                # Try to get detailed model info with files and engagement metrics
-                try:
-                    detailed_model = self.api.model_info(model_id, files_metadata=True)
-                    raw_siblings = getattr(detailed_model, 'siblings', [])
-                    likes = getattr(detailed_model, 'likes', 0)
-                except Exception as e:
-                    # Fallback to basic model data if detailed fetch fails
-                    self.logger.debug(f"Detailed fetch failed for {model_id}, using basic data: {e}")
-                    detailed_model = model
-                    raw_siblings = getattr(model, 'siblings', [])
-                    likes = getattr(model, 'likes', 0)
-                
-                # Convert RepoSibling objects to dictionaries
-                siblings = []
-                for sibling in raw_siblings:
-                    if hasattr(sibling, 'rfilename'):
-                        sibling_dict = {
-                            'rfilename': getattr(sibling, 'rfilename', ''),
-                            'size': getattr(sibling, 'size', 0)
-                        }
-                        siblings.append(sibling_dict)
-                
-                # Validate and sanitize engagement metrics
-                likes = self._validate_engagement_metric(likes, model_id, 'likes')
-                
-                # Convert the model object to a dictionary with the fields we need
-                model_dict = {
-                    'id': model_id,
-                    'downloads': getattr(model, 'downloads', 0),
-                    'likes': likes,
-                    'tags': getattr(model, 'tags', []),
-                    'siblings': siblings,
-                    'cardData': getattr(model, 'cardData', {}),
-                    'lastModified': getattr(model, 'lastModified', None),
-                    'created_at': getattr(model, 'created_at', None)
-                }
-                
-                # Convert datetime objects to ISO strings for JSON serialization
-                if model_dict['lastModified'] and hasattr(model_dict['lastModified'], 'isoformat'):
-                    model_dict['lastModified'] = model_dict['lastModified'].isoformat()
-                if model_dict['created_at'] and hasattr(model_dict['created_at'], 'isoformat'):
-                    model_dict['created_at'] = model_dict['created_at'].isoformat()
-                
-                return model_dict, likes
-                
-            except Exception as e:
-                model_id = getattr(model, 'id', 'unknown')
-                self.logger.error(f"Critical error processing model {model_id}: {e}")
-                return None, 0
+        Args:
+            model: Basic model object from list_models
+            
+        Returns:
+            ModelInfo rebuilt from the cache, None on miss or when caching is disabled
+        """
+        if not self.model_info_cache:
+            return None
+        payload = self.model_info_cache.get(getattr(model, 'id', 'unknown'), self._get_revision(model))
+        if payload is None:
+            return None
+        try:
+            return ModelInfo(**payload)
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable cache entry for {getattr(model, 'id', 'unknown')}: {e}")
+            return None
+    
+    def _store_cached_model_info(self, model, payload: Dict) -> None:
+        """
+        Store a model_info payload in the on-disk cache.
         
-        # Use ThreadPoolExecutor for parallel processing
-        max_workers = min(10, len(models))  # Limit concurrent requests to avoid rate limiting
-        self.logger.info(f"Using {max_workers} parallel workers for batch processing")
+        Args:
+            model: Basic model object from list_models
+            payload: Payload built by _model_info_payload
+        """
+        if self.model_info_cache:
+            self.model_info_cache.put(getattr(model, 'id', 'unknown'), self._get_revision(model), payload)
+    
+    def _build_model_record(self, model, detailed_model) -> Tuple[Optional[Dict], int]:
+        """
+        Convert a listed model and its detailed info into a raw data record.
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_model = {executor.submit(fetch_single_model, model): model for model in models}
+        Args:
+            model: Basic model object from list_models
+            detailed_model: Result of model_info, or None to use the basic data only
             
-            # Process completed tasks
-            for i, future in enumerate(as_completed(future_to_model), 1):
-                try:
-                    model_dict, likes = future.result()
-                    if model_dict:
-                        models_data.append(model_dict)
-                        
-                        # Update engagement statistics
-                        if likes > 0:
-                            engagement_stats['models_with_likes'] += 1
-                            engagement_stats['total_likes'] += likes
-                            engagement_stats['max_likes'] = max(engagement_stats['max_likes'], likes)
-                            engagement_stats['min_likes'] = min(engagement_stats['min_likes'], likes)
-                        else:
-                            engagement_stats['models_missing_likes'] += 1
-                    else:
-                        failed_models += 1
-                        
-                    # Log progress every 10 models
-                    if i % 10 == 0 or i == len(models):
-                        self.logger.info(f"Batch progress: {i}/{len(models)} models processed ({(i/len(models)*100):.1f}%)")
-                        
-                except Exception as e:
-                    failed_models += 1
-                    self.logger.warning(f"Error processing batch result: {e}")
-        
-        self.logger.info(f"Batch processing completed: {len(models_data)} successful, {failed_models} failed")
-        return models_data
+        Returns:
+            (model_dict, likes) tuple, (None, 0) if the record cannot be built
+        """
+        try:
+            model_id = getattr(model, 'id', 'unknown')
+            source = detailed_model if detailed_model is not None else model
+            raw_siblings = getattr(source, 'siblings', [])
+            likes = getattr(source, 'likes', 0)
+            
+            # Convert RepoSibling objects to dictionaries
+            siblings = []
+            for sibling in raw_siblings:
+                if hasattr(sibling, 'rfilename'):
+                    sibling_dict = {
+                        'rfilename': getattr(sibling, 'rfilename', ''),
+                        'size': getattr(sibling, 'size', 0)
+                    }
+                    # LFS content hash of GGUF files, used to collapse mirrored copies
+                    lfs = getattr(sibling, 'lfs', None)
+                    if lfs is not None and sibling_dict['rfilename'].lower().endswith('.gguf'):
+                        sibling_dict['sha256'] = lfs.sha256
+                    siblings.append(sibling_dict)
+            
+            # Validate and sanitize engagement metrics
+            likes = self._validate_engagement_metric(likes, model_id, 'likes')
+            
+            # Convert the model object to a dictionary with the fields we need
+            model_dict = {
+                'id': model_id,
+                'downloads': getattr(model, 'downloads', 0),
+                'likes': likes,
+                'tags': getattr(model, 'tags', []),
+                'siblings': siblings,
+                'cardData': getattr(model, 'cardData', {}),
+                'lastModified': self._get_last_modified(model) or self._get_last_modified(detailed_model),
+                'created_at': getattr(model, 'created_at', None)
+            }
+            
+            # Convert datetime objects to ISO strings for JSON serialization
+            if model_dict['created_at'] and hasattr(model_dict['created_at'], 'isoformat'):
+                model_dict['created_at'] = model_dict['created_at'].isoformat()
+            
+            # Listing data alone lacks file sizes and hashes: flag the record so it is fetched again
+            if detailed_model is None:
+                model_dict['detailsMissing'] = True
+            
+            return model_dict, likes
+            
+        except Exception as e:
+            model_id = getattr(model, 'id', 'unknown')
+            self.logger.error(f"Critical error processing model {model_id}: {e}")
+            return None, 0
     
     def _validate_engagement_metric(self, value: any, model_id: str, metric_name: str) -> int:
         """
@@ -474,21 +1466,34 @@ class SimplifiedGGUFetcher:
         self.logger.info("=" * 50)
         
         try:
-            # Step 1: Load raw data
-            self.logger.info("Step 1/5: Loading raw model data...")
-            raw_models = self._load_raw_data()
-            if not raw_models:
-                self.logger.warning("No raw data found, nothing to process")
+            build_key = self._build_cache_key()
+            if build_key and self._restore_build_cache(build_key):
                 return
             
+            # Step 1: Load raw data (streamed, one repo at a time)
+            self.logger.info("Step 1/5: Loading raw model data...")
+            if self.raw_format == 'partitioned' and not self.disable_spam_filter:
+                # Partitions are read, or reused from the partition cache, by _filter_partitioned_raw_data
+                raw_models = None
+                if not PartitionedRawStore(self.raw_data_file).load_manifest():
+                    self.logger.warning("No raw data found, nothing to process")
+                    return
+            else:
+                raw_models = self._load_raw_data(compact_siblings=not self.disable_spam_filter)
+                first_model = next(raw_models, None)
+                if first_model is None:
+                    self.logger.warning("No raw data found, nothing to process")
+                    return
+                raw_models = chain([first_model], raw_models)
+            
             # Step 2: Apply spam filtering or basic GGUF filtering
             if self.disable_spam_filter:
                 self.logger.info("Step 2/5: Basic GGUF filtering (spam filtering disabled)...")
                 models_with_gguf = self._filter_gguf_models(raw_models)
                 
-                models_without_gguf = len(raw_models) - len(models_with_gguf)
+                models_without_gguf = self.raw_models_loaded - len(models_with_gguf)
                 self.logger.info(f"Basic filtering summary:")
-                self.logger.info(f"  - Total models loaded: {len(raw_models)}")
+                self.logger.info(f"  - Total models loaded: {self.raw_models_loaded}")
                 self.logger.info(f"  - Models with GGUF files: {len(models_with_gguf)}")
                 self.logger.info(f"  - Models without GGUF files: {models_without_gguf}")
                 
@@ -503,22 +1508,27 @@ class SimplifiedGGUFetcher:
                 # Step 4: Skip spam filtering
                 self.logger.info("Step 4/5: Skipping spam filtering (disabled)")
                 final_models = processed_models
+                processing_report, report = None, None
+                metrics_written = False
                 
             else:
                 self.logger.info("Step 2/5: Applying integrated spam filtering...")
                 
-                # Create backup if enabled
+                # Create backup if enabled (a copy of the raw snapshot file)
                 backup_path = None
                 if self.filter_config.backup_enabled:
                     self.logger.info("Creating backup of raw data...")
-                    backup_path = self.spam_engine.create_backup(raw_models)
+                    backup_path = self.spam_engine.create_file_backup(self.raw_data_file)
                     if backup_path:
                         self.logger.info(f"Backup created: {backup_path}")
                     else:
                         self.logger.warning("Failed to create backup")
                 
-                # Apply spam filtering
-                filter_result = self.spam_engine.filter_models(raw_models)
+                # Apply spam filtering, reusing per-partition results where the raw data is partitioned
+                if self.raw_format == 'partitioned':
+                    filter_result = self._filter_partitioned_raw_data()
+                else:
+                    filter_result = self.spam_engine.filter_models(raw_models)
                 
                 if not filter_result.success:
                     self.logger.error("Spam filtering failed:")
@@ -530,15 +1540,22 @@ class SimplifiedGGUFetcher:
                 self.logger.info("Step 3/5: Spam filtering completed")
                 report = self.spam_engine.generate_report(filter_result)
                 self.logger.info("\n" + report)
+                metrics_written = self.spam_engine.write_metrics(filter_result, FILTER_METRICS_FILE)
                 
                 # Step 4: Skip individual model processing (already done by spam filter)
                 self.logger.info("Step 4/5: Using spam-filtered models (processing integrated)")
                 final_models = filter_result.filtered_models
+                processing_report = filter_result.processing_report
             
             # Step 5: Generate final output with proper sorting and formatting
             self.logger.info("Step 5/5: Generating final output...")
             self._generate_output(final_models)
             
+            if build_key:
+                self.build_cache.store(build_key, self.output_file, processing_report, report,
+                                       FILTER_METRICS_FILE if metrics_written else None)
+                self.logger.info(f"Build cache: stored entry {build_key[:12]}")
+            
             self.logger.info("=" * 50)
             self.logger.info("PROCESS PHASE COMPLETED SUCCESSFULLY")
             self.logger.info("=" * 50)
@@ -547,38 +1564,213 @@ class SimplifiedGGUFetcher:
             self.logger.error(f"Process phase failed: {e}")
             raise
     
-    def _load_raw_data(self) -> List[Dict]:
+    def _build_cache_key(self) -> Optional[str]:
+        """
+        Compute the build cache key of the current process phase inputs.
+        
+        The key covers the raw snapshot bytes, every FilterConfig field that
+        affects output (backup, logging and execution-mode switches do not),
+        the spam filter switch, and the spam_filter version plus a digest of
+        the processing sources.
+        
+        Returns:
+            Hex key, None if the build cache is disabled or there is no raw data
+        """
+        if self.build_cache is None or not os.path.exists(self.raw_data_file):
+            return None
+        
+        # A partitioned snapshot is identified by its manifest of partition hashes
+        raw_data_file = self.raw_data_file
+        if self.raw_format == 'partitioned':
+            raw_data_file = PartitionedRawStore(self.raw_data_file).manifest_path
+        
+        try:
+            return self.build_cache.key(raw_data_file, self._processing_fingerprint())
+        except OSError as e:
+            self.logger.warning(f"Build cache disabled for this run: {e}")
+            return None
+    
+    def _processing_fingerprint(self) -> Dict:
+        """
+        Describe everything besides raw data that determines processing results.
+        
+        Returns:
+            JSON-serializable dictionary of the output-affecting FilterConfig
+            fields, the spam filter switch, the spam_filter version, the JSON
+            backend (float formatting differs) and a digest of the processing sources
+        """
+        config = asdict(self.filter_config)
+        config.pop('backup_enabled', None)
+        config.pop('detailed_logging', None)
+        config.pop('fused_pipeline', None)  # Same output either way
+        config.pop('parallel_workers', None)
+        config.pop('incremental_groups', None)
+        config.pop('selection_cache_size', None)
+        config.pop('selection_cache_file', None)
+        config.pop('trace_memory', None)
+        
+        package_dir = os.path.dirname(os.path.abspath(sys.modules[SpamFilterEngine.__module__].__file__))
+        sources = [os.path.abspath(__file__)] + [
+            os.path.join(package_dir, name) for name in os.listdir(package_dir) if name.endswith('.py')
+        ]
+        
+        return {
+            'filter_config': config,
+            'disable_spam_filter': self.disable_spam_filter,
+            'spam_filter_version': SPAM_FILTER_VERSION,
+            'json_backend': json_codec.BACKEND,
+            'source_digest': BuildCache.source_digest(sources)
+        }
+    
+    def _filter_partitioned_raw_data(self):
+        """
+        Spam-filter a partitioned snapshot, re-extracting only dirty partitions.
+        
+        The per-repo steps (GGUF extraction, size and finetune filtering) are
+        cached per partition; a partition whose hash and processing
+        fingerprint match a cached result is not parsed again. The surviving
+        entries of all partitions are merged in month order and the
+        group-level steps run on the full set, as in filter_models.
+        
+        Returns:
+            FilterResult of the spam filter engine
+        """
+        start_time = time.time()
+        store = PartitionedRawStore(self.raw_data_file)
+        manifest = store.load_manifest()
+        fingerprint = json.dumps(self._processing_fingerprint(), sort_keys=True)
+        
+        report = ProcessingReport()
+        errors = []
+        base_models = []
+        used_keys = []
+        dirty = 0
+        
+        for name in sorted(manifest):
+            partition = manifest[name]
+            key = hashlib.sha256(f"{partition['sha256']}\0{fingerprint}".encode('utf-8')).hexdigest()
+            used_keys.append(key)
+            
+            result = self.partition_cache.get(key)
+            if result is None:
+                dirty += 1
+                result = self._extract_partition(store, name, manifest)
+                self.partition_cache.put(key, result)
+            
+            base_models.extend(result['models'])
+            errors.extend(result['errors'])
+            report.total_processed += result['total_processed']
+            report.small_models_removed += result['small_models_removed']
+            report.finetuned_removed += result['finetuned_removed']
+        
+        self.partition_cache.retain(used_keys)
+        self.raw_models_loaded = sum(partition['count'] for partition in manifest.values())
+        self.logger.info(f"Raw partitions: {dirty} of {len(manifest)} re-extracted, "
+                         f"{len(manifest) - dirty} reused from {self.partition_cache.cache_dir}")
+        self.logger.info(f"Merged {len(base_models)} prefiltered entries from {self.raw_models_loaded} raw models")
+        
+        return self.spam_engine.finalize_models(base_models, report, errors, start_time)
+    
+    def _extract_partition(self, store: PartitionedRawStore, name: str, manifest: Dict[str, Dict]) -> Dict:
+        """
+        Run the per-repo spam filter steps on every record of one partition.
+        
+        Args:
+            store: Partitioned raw snapshot
+            name: Partition name
+            manifest: Loaded partition manifest
+        
+        Returns:
+            JSON-serializable result: surviving entries, errors and report counters
+        """
+        report = ProcessingReport()
+        errors = []
+        models = []
+        for raw_model in store.iter_partition(name, manifest):
+            raw_model['siblings'] = SiblingTable.from_siblings(raw_model.get('siblings'))
+            models.extend(self.spam_engine.prefilter_raw_model(raw_model, report, errors))
+        
+        return {
+            'models': models,
+            'errors': errors,
+            'total_processed': report.total_processed,
+            'small_models_removed': report.small_models_removed,
+            'finetuned_removed': report.finetuned_removed
+        }
+    
+    def _restore_build_cache(self, build_key: str) -> bool:
         """
-        Load raw model data from JSON file.
+        Restore the output and report of an earlier run with identical inputs.
+        
+        Args:
+            build_key: Key from _build_cache_key()
         
         Returns:
-            List of raw model dictionaries, empty list if file not found or error
+            True on a cache hit (output restored), False on a miss
+        """
+        previous_version, previous_entries = self._read_output_snapshot()
+        entry = self.build_cache.restore(build_key, self.output_file, FILTER_METRICS_FILE)
+        if entry is None:
+            self.logger.info(f"Build cache miss ({build_key[:12]}), processing raw data")
+            return False
+        
+        self.logger.info(f"Build cache hit ({build_key[:12]}), inputs unchanged since {entry.get('cached_at', 'unknown')}")
+        if entry.get('report_text'):
+            self.logger.info("\n" + entry['report_text'])
+        self.logger.info(f"Restored {self.output_file} from the build cache")
+        
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            output_text = f.read()
+        self._write_output_sidecars(previous_version, previous_entries, output_text, json_codec.loads(output_text))
+        
+        self.logger.info("=" * 50)
+        self.logger.info("PROCESS PHASE COMPLETED SUCCESSFULLY (BUILD CACHE HIT)")
+        self.logger.info("=" * 50)
+        return True
+    
+    def _load_raw_data(self, compact_siblings: bool = False) -> Iterator[Dict]:
+        """
+        Stream raw model data from the raw snapshot file.
+        
+        Repos are yielded one at a time; self.raw_models_loaded counts them.
+        
+        Args:
+            compact_siblings: If True, replace each sibling list with a SiblingTable
+                (interned filenames, packed sizes, precomputed GGUF positions)
+        
+        Yields:
+            Raw model dictionaries, nothing if the file is missing or unreadable
         """
+        self.raw_models_loaded = 0
         try:
             if not os.path.exists(self.raw_data_file):
                 self.logger.error(f"Raw data file not found: {self.raw_data_file}")
                 self.logger.info("Run the download phase first to generate raw data")
-                return []
+                return
             
-            with open(self.raw_data_file, 'r', encoding='utf-8') as f:
-                raw_models = json.load(f)
+            for raw_model in iter_raw_file(self.raw_data_file):
+                self.raw_models_loaded += 1
+                if compact_siblings:
+                    raw_model['siblings'] = SiblingTable.from_siblings(raw_model.get('siblings'))
+                yield raw_model
             
-            self.logger.info(f"Loaded {len(raw_models)} models from {self.raw_data_file}")
-            return raw_models
+            self.logger.info(f"Loaded {self.raw_models_loaded} models from {self.raw_data_file}")
             
         except json.JSONDecodeError as e:
             self.logger.error(f"Invalid JSON in raw data file: {e}")
-            return []
+            if self.raw_models_loaded:
+                raise  # Never process a truncated snapshot
         except Exception as e:
             self.logger.error(f"Error loading raw data: {e}")
-            return []
+            if self.raw_models_loaded:
+                raise
     
-    def _filter_gguf_models(self, raw_models: List[Dict]) -> List[Dict]:
+    def _filter_gguf_models(self, raw_models: Iterable[Dict]) -> List[Dict]:
         """
         Filter models to only process those with .gguf files in siblings.
         
         Args:
-            raw_models: List of raw model dictionaries
+            raw_models: List or stream of raw model dictionaries
             
         Returns:
             List of models that have GGUF files
@@ -756,6 +1948,263 @@ class SimplifiedGGUFetcher:
         
         return processed_entries
     
+    def _output_sidecar(self, suffix: str) -> str:
+        """Path of a file stored next to the output, e.g. gguf_models.delta.json"""
+        return os.path.splitext(self.output_file)[0] + suffix
+    
+    @staticmethod
+    def _output_version(output_text: str) -> str:
+        """Content version of an output file: a truncated sha256 of its text"""
+        return hashlib.sha256(output_text.encode('utf-8')).hexdigest()[:16]
+    
+    @staticmethod
+    def _index_output_entries(entries: List[Dict]) -> Optional[Dict[str, Dict]]:
+        """Key output entries by directDownloadLink, None if a link is not unique"""
+        by_link = {entry.get('directDownloadLink'): entry for entry in entries}
+        return by_link if len(by_link) == len(entries) else None
+    
+    def _read_output_snapshot(self) -> Tuple[Optional[str], Optional[Dict[str, Dict]]]:
+        """
+        Read the output file about to be replaced, as the base of the next delta.
+        
+        Returns:
+            (version, entries keyed by directDownloadLink); the entries are None
+            if links are not unique, both are None if there is no readable output
+        """
+        try:
+            with open(self.output_file, 'r', encoding='utf-8') as f:
+                output_text = f.read()
+            entries = json_codec.loads(output_text)
+        except (OSError, ValueError):
+            return None, None
+        if not isinstance(entries, list):
+            return None, None
+        return self._output_version(output_text), self._index_output_entries(entries)
+    
+    def _write_output_delta(self, previous_version: Optional[str], previous_entries: Optional[Dict[str, Dict]],
+                            output_text: str, output_models: List[Dict]) -> None:
+        """
+        Write the delta against the previous output and the version manifest.
+        
+        The delta lists entries added and removed since the previous output
+        and, for entries present in both, only the fields whose values
+        changed plus, under removedFields, the fields the new entry no longer
+        has, all keyed by directDownloadLink. Applying it to the previous
+        version yields the entries of the new output, which clients order by
+        downloads and likes as the full file is. The
+        manifest names the current version and the version the delta applies
+        to, so a client can patch when it holds that version and fetch the
+        full file otherwise. The manifest is written last, so it never points
+        at a delta that is not on disk yet.
+        
+        Args:
+            previous_version: Version of the replaced output, None if there was none
+            previous_entries: Replaced output keyed by link, None if unavailable
+            output_text: Text of the new output file
+            output_models: Entries of the new output file
+        """
+        version = self._output_version(output_text)
+        delta_file = self._output_sidecar(self.OUTPUT_DELTA_SUFFIX)
+        manifest_file = self._output_sidecar(self.OUTPUT_MANIFEST_SUFFIX)
+        
+        if version == previous_version and os.path.exists(manifest_file):
+            self.logger.info(f"Output unchanged (version {version}), keeping existing delta and manifest")
+            return
+        
+        try:
+            delta_info = None
+            current_entries = self._index_output_entries(output_models)
+            if previous_entries is not None and current_entries is not None:
+                added = [entry for link, entry in current_entries.items() if link not in previous_entries]
+                removed = [link for link in previous_entries if link not in current_entries]
+                changed = []
+                for link, entry in current_entries.items():
+                    previous = previous_entries.get(link)
+                    if previous is None:
+                        continue
+                    fields = {key: value for key, value in entry.items()
+                              if key not in previous or previous[key] != value}
+                    removed_fields = [key for key in previous if key not in entry]
+                    if fields or removed_fields:
+                        change = {'directDownloadLink': link, 'fields': fields}
+                        if removed_fields:
+                            change['removedFields'] = removed_fields
+                        changed.append(change)
+                
+                delta_text = json_codec.dumps({
+                    'fromVersion': previous_version,
+                    'toVersion': version,
+                    'added': added,
+                    'removed': removed,
+                    'changed': changed
+                })
+                with open(delta_file, 'w', encoding='utf-8') as f:
+                    f.write(delta_text)
+                
+                delta_info = {
+                    'file': os.path.basename(delta_file),
+                    'fromVersion': previous_version,
+                    'size': len(delta_text.encode('utf-8')),
+                    'added': len(added),
+                    'removed': len(removed),
+                    'changed': len(changed)
+                }
+                self.logger.info(f"Output delta {previous_version} -> {version}: {len(added)} added, "
+                                 f"{len(removed)} removed, {len(changed)} changed "
+                                 f"({delta_info['size']:,} bytes, {delta_file})")
+            else:
+                if os.path.exists(delta_file):
+                    os.remove(delta_file)  # A stale delta must not be applied to an unknown base
+                reason = "no previous output" if previous_version is None else "directDownloadLink is not unique"
+                self.logger.info(f"No output delta written ({reason}), clients fetch the full file")
+            
+            manifest = {
+                'version': version,
+                'generatedAt': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'modelCount': len(output_models),
+                'file': os.path.basename(self.output_file),
+                'size': len(output_text.encode('utf-8')),
+                'delta': delta_info
+            }
+            with open(manifest_file, 'w', encoding='utf-8') as f:
+                json_codec.dump(manifest, f, pretty=True)
+            self.logger.info(f"Output manifest: version {version} ({manifest_file})")
+        
+        except OSError as e:
+            self.logger.warning(f"Could not write output delta or manifest: {e}")
+    
+    def _write_output_sidecars(self, previous_version: Optional[str], previous_entries: Optional[Dict[str, Dict]],
+                               output_text: str, output_models: List[Dict]) -> None:
+        """Write the files derived from a new output: delta, manifest and, if enabled, shards"""
+        self._write_output_delta(previous_version, previous_entries, output_text, output_models)
+        if self.output_shards:
+            self._write_output_shards(output_models, self._output_version(output_text))
+    
+    def _ram_tier(self, min_ram_gb) -> str:
+        """Name of the smallest RAM tier that covers a model's minRamGB"""
+        for tier in self.SHARD_RAM_TIERS:
+            if not isinstance(min_ram_gb, (int, float)) or min_ram_gb <= tier:
+                return str(tier)
+        return f"over-{self.SHARD_RAM_TIERS[-1]}"
+    
+    @staticmethod
+    def _shard_slug(name: str) -> str:
+        """File name stem for a shard key, e.g. 'DeepSeek' -> 'deepseek'"""
+        slug = ''.join(c if c.isalnum() else '-' for c in name.lower()).strip('-')
+        return slug or 'unknown'
+    
+    @classmethod
+    def _shard_slugs(cls, names: Iterable[str]) -> Dict[str, str]:
+        """
+        Map shard keys to unique file name stems.
+        
+        Keys that slugify to the same stem, e.g. 'Foo/Bar' and 'foo-bar', all
+        get a short hash of the key appended, so neither shard overwrites the
+        other and each key keeps the same file whatever other keys exist.
+        
+        Args:
+            names: Shard keys
+        
+        Returns:
+            Mapping from key to stem
+        """
+        by_slug = {}
+        for name in names:
+            by_slug.setdefault(cls._shard_slug(name), []).append(name)
+        
+        slugs = {}
+        for slug, shared in by_slug.items():
+            for name in shared:
+                slugs[name] = slug if len(shared) == 1 else f"{slug}-{hashlib.sha256(name.encode('utf-8')).hexdigest()[:8]}"
+        return slugs
+    
+    def _write_output_shards(self, output_models: List[Dict], version: str) -> None:
+        """
+        Write the output split into shards, plus a manifest describing them.
+        
+        Each model appears in one modelType shard (type/<slug>.json) and one
+        RAM tier shard (ram/<tier>.json), in the same download order as the
+        full file. Tiers partition the models, so a page for an N GB machine
+        loads the tiers up to N. Shards are serialized and written on a
+        thread pool into a fresh directory that replaces the previous one
+        once complete, so no stale shard survives a type disappearing. The
+        manifest records each shard's file, entry count, byte size and
+        sha256.
+        
+        Args:
+            output_models: Entries of the new output file, in output order
+            version: Version of the full output file the shards were cut from
+        """
+        shard_dir = self._output_sidecar(self.OUTPUT_SHARDS_SUFFIX)
+        temp_dir = f"{shard_dir}.tmp"
+        
+        groups = {'modelType': {}, 'minRamGB': {}}
+        for entry in output_models:
+            groups['modelType'].setdefault(entry.get('modelType') or 'Unknown', []).append(entry)
+            groups['minRamGB'].setdefault(self._ram_tier(entry.get('minRamGB')), []).append(entry)
+        
+        jobs = []
+        slugs = self._shard_slugs(groups['modelType'])
+        for name, entries in groups['modelType'].items():
+            jobs.append(('modelType', name, f"type/{slugs[name]}.json", entries))
+        for tier, entries in groups['minRamGB'].items():
+            jobs.append(('minRamGB', tier, f"ram/{tier}.json", entries))
+        
+        def write_shard(relative_path: str, entries: List[Dict]) -> Tuple[int, str]:
+            """Serialize and write one shard, returning its size and sha256"""
+            data = json_codec.dumps(entries).encode('utf-8')
+            with open(os.path.join(temp_dir, relative_path), 'wb') as f:
+                f.write(data)
+            return len(data), hashlib.sha256(data).hexdigest()
+        
+        try:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            os.makedirs(os.path.join(temp_dir, 'type'))
+            os.makedirs(os.path.join(temp_dir, 'ram'))
+            
+            manifest_shards = {'modelType': {}, 'minRamGB': {}}
+            with ThreadPoolExecutor(max_workers=max(1, min(self.SHARD_MAX_WORKERS, len(jobs)))) as executor:
+                futures = {
+                    executor.submit(write_shard, relative_path, entries): (dimension, key, relative_path, len(entries))
+                    for dimension, key, relative_path, entries in jobs
+                }
+                for future in as_completed(futures):
+                    dimension, key, relative_path, count = futures[future]
+                    size, digest = future.result()
+                    manifest_shards[dimension][key] = {
+                        'file': relative_path,
+                        'count': count,
+                        'size': size,
+                        'sha256': digest
+                    }
+            
+            manifest = {
+                'version': version,
+                'generatedAt': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'modelCount': len(output_models),
+                'ramTiers': list(self.SHARD_RAM_TIERS),
+                'shards': {
+                    dimension: dict(sorted(shards.items(), key=lambda item: -item[1]['count']))
+                    for dimension, shards in manifest_shards.items()
+                }
+            }
+            with open(os.path.join(temp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json_codec.dump(manifest, f, pretty=True)
+            
+            shutil.rmtree(shard_dir, ignore_errors=True)
+            os.replace(temp_dir, shard_dir)
+        
+        except OSError as e:
+            self.logger.warning(f"Could not write output shards: {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+        
+        total_bytes = sum(shard['size'] for shards in manifest_shards.values() for shard in shards.values())
+        self.logger.info(f"Output shards: {len(manifest_shards['modelType'])} model types, "
+                         f"{len(manifest_shards['minRamGB'])} RAM tiers, {total_bytes:,} bytes in {shard_dir}/")
+        for tier, shard in sorted(manifest_shards['minRamGB'].items(), key=lambda item: item[1]['file']):
+            self.logger.debug(f"  - {tier} GB tier: {shard['count']} models, {shard['size']:,} bytes")
+    
     def _generate_output(self, processed_models: List[Dict]) -> None:
         """
         Generate JSON array with exactly 15 fields per model (10 original + 4 hardware requirements + 1 upload date).
@@ -765,12 +2214,16 @@ class SimplifiedGGUFetcher:
         Args:
             processed_models: List of processed model dictionaries
         """
+        previous_version, previous_entries = self._read_output_snapshot()
+        
         if not processed_models:
             self.logger.warning("No processed models to output, creating empty output file")
             # Create empty output file
+            output_text = json_codec.dumps([], pretty=True)
             with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=2, ensure_ascii=False)
+                f.write(output_text)
             self.logger.info(f"Created empty output file: {self.output_file}")
+            self._write_output_sidecars(previous_version, previous_entries, output_text, [])
             return
         
         self.logger.info(f"Generating output from {len(processed_models)} processed entries...")
@@ -795,10 +2248,11 @@ class SimplifiedGGUFetcher:
             self.logger.warning(f"Fixed engagement metric validation errors in {validation_errors} models")
         
         # Sort models by download count (highest first), with engagement metrics as secondary sort
+        # and the download link breaking ties, so the order does not depend on the raw record order
         self.logger.debug("Sorting models by download count (primary) and like count (secondary)...")
         sorted_models = sorted(processed_models, 
-                             key=lambda x: (x.get('downloadCount', 0), x.get('likeCount', 0)), 
-                             reverse=True)
+                             key=lambda x: (-x.get('downloadCount', 0), -x.get('likeCount', 0),
+                                            x.get('directDownloadLink', '')))
         
         # Create output with exactly 15 fields per model (10 original + 4 hardware requirements + 1 upload date)
         output_models = []
@@ -841,11 +2295,13 @@ class SimplifiedGGUFetcher:
         
         try:
             # Generate final JSON output
+            output_text = json_codec.dumps(output_models, pretty=True)
             with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(output_models, f, indent=2, ensure_ascii=False)
+                f.write(output_text)
             
             # File saved directly to root directory for website access
             self.logger.info(f"Saved directly to root directory: {self.output_file}")
+            self._write_output_sidecars(previous_version, previous_entries, output_text, output_models)
             
             # Log comprehensive output statistics
             self.logger.info(f"Output generation summary:")
@@ -1135,15 +2591,33 @@ Examples:
   %(prog)s                    # Run both download and process phases with spam filtering
   %(prog)s download           # Run only download phase
   %(prog)s process            # Run only process phase with spam filtering
+  %(prog)s pipeline           # Overlap download and processing, repo by repo
   %(prog)s --disable-spam-filter  # Run without spam filtering (basic GGUF filtering only)
+  %(prog)s download --transport threads  # Fetch model details with the threaded transport
+  %(prog)s download --incremental  # Only re-fetch repos changed since the last snapshot
+  %(prog)s download --no-cache     # Bypass the on-disk model_info response cache
+  %(prog)s download --resume       # Continue an interrupted download from its journal
+  %(prog)s download --bulk-metadata  # Skip model_info for repos whose GGUF sizes are known
+  %(prog)s --raw-format jsonl.gz   # Store raw data as compressed JSON Lines
+  %(prog)s --raw-format partitioned  # Partition raw data by month, reprocess only changed months
+  %(prog)s process --no-build-cache  # Reprocess even if raw data and config are unchanged
+  %(prog)s process --output-shards   # Also write gguf_models_shards/ split by type and RAM tier
+  %(prog)s process --fused-filter    # Stream spam filter steps 1-4 in one pass
+  %(prog)s process --filter-workers 4  # Select variants across model groups on 4 processes
+  %(prog)s process --incremental-groups  # Re-select variants only for groups changed since the last run
+  %(prog)s process --selection-cache data/selection_cache.json  # Memoize variant selection across runs
+  %(prog)s process --trace-memory    # Record peak traced memory per filter stage
+  %(prog)s download --record data/hub_recording  # Capture Hub responses for offline replay
+  %(prog)s download --no-cache --replay data/hub_recording --replay-latency-ms 120 --replay-jitter-ms 80
+                                   # Benchmark the download phase offline
         """
     )
     
     parser.add_argument(
         'command',
         nargs='?',
-        choices=['download', 'process'],
-        help='Specific phase to run (default: run both phases)'
+        choices=['download', 'process', 'pipeline'],
+        help='Specific phase to run, or pipeline to overlap both (default: run both phases)'
     )
     
     parser.add_argument(
@@ -1157,6 +2631,127 @@ Examples:
         help='Enable verbose logging'
     )
     
+    parser.add_argument(
+        '--transport',
+        choices=['auto', 'async', 'threads'],
+        default='auto',
+        help='Transport for model detail requests (default: auto = async when aiohttp is installed)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only re-fetch details for repos whose lastModified changed since the previous raw snapshot'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the on-disk model_info response cache (data/model_info_cache)'
+    )
+    
+    parser.add_argument(
+        '--no-build-cache',
+        action='store_true',
+        help='Always rerun the process phase instead of restoring unchanged results (data/build_cache)'
+    )
+    
+    parser.add_argument(
+        '--output-shards',
+        action='store_true',
+        help='Also write the output split by modelType and minRamGB tier, with a manifest (gguf_models_shards/)'
+    )
+    
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=24.0,
+        help='Maximum age of cached model_info responses in hours (default: 24)'
+    )
+    
+    parser.add_argument(
+        '--cache-max-mb',
+        type=int,
+        default=512,
+        help='Size budget of the model_info response cache in MB (default: 512)'
+    )
+    
+    parser.add_argument(
+        '--max-rps',
+        type=float,
+        default=0.0,
+        help='Cap on Hub API requests per second (default: 0 = no fixed cap; HTTP 429/503 still '
+             'cut concurrency and honour Retry-After)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip models already recorded in the download journal of an interrupted run'
+    )
+    
+    parser.add_argument(
+        '--bulk-metadata',
+        action='store_true',
+        help='List sibling filenames with each model and only call model_info for repos with unknown GGUF sizes'
+    )
+    
+    parser.add_argument(
+        '--raw-format',
+        choices=list(RAW_DATA_FILES),
+        default='json',
+        help='Raw snapshot format (default: json = indented array in data/raw_models_data.json)'
+    )
+    
+    # Record/replay arguments for offline benchmarking
+    backend_group = parser.add_mutually_exclusive_group()
+    backend_group.add_argument(
+        '--record',
+        metavar='DIR',
+        help='Record list_models and model_info responses from the Hub into DIR'
+    )
+    
+    backend_group.add_argument(
+        '--replay',
+        metavar='DIR',
+        help='Serve list_models and model_info from a recording in DIR instead of the Hub'
+    )
+    
+    parser.add_argument(
+        '--replay-latency-ms',
+        type=float,
+        default=0.0,
+        help='Simulated mean latency per replayed request in milliseconds (default: 0)'
+    )
+    
+    parser.add_argument(
+        '--replay-jitter-ms',
+        type=float,
+        default=0.0,
+        help='Maximum deviation from the replay latency in milliseconds (default: 0)'
+    )
+    
+    parser.add_argument(
+        '--replay-error-rate',
+        type=float,
+        default=0.0,
+        help='Fraction of replayed model_info requests failing with HTTP 500 (default: 0)'
+    )
+    
+    parser.add_argument(
+        '--replay-throttle-rate',
+        type=float,
+        default=0.0,
+        help='Fraction of replayed model_info requests failing with HTTP 429 (default: 0)'
+    )
+    
+    parser.add_argument(
+        '--replay-seed',
+        type=int,
+        default=0,
+        help='Random seed for replay latencies and injected errors (default: 0)'
+    )
+    
     # Spam filtering arguments
     parser.add_argument(
         '--disable-spam-filter',
@@ -1191,6 +2786,38 @@ Examples:
         help='Disable backup creation'
     )
     
+    parser.add_argument(
+        '--fused-filter',
+        action='store_true',
+        help='Run extraction, size/finetune filtering and grouping as one streaming pass (same output, less memory)'
+    )
+    
+    parser.add_argument(
+        '--filter-workers',
+        type=int,
+        default=0,
+        help='Processes for per-group variant selection and hardware calculation (default: 0 = serial)'
+    )
+    
+    parser.add_argument(
+        '--incremental-groups',
+        action='store_true',
+        help='Reuse variant selection of model groups unchanged since the last run (state in data/group_state.json)'
+    )
+    
+    parser.add_argument(
+        '--selection-cache',
+        metavar='FILE',
+        default='',
+        help='Persist memoized variant selections to FILE between runs (default: in-memory only)'
+    )
+    
+    parser.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='Record the peak traced memory of each spam filter stage with tracemalloc (slower)'
+    )
+    
     args = parser.parse_args()
     
     # Setup logging
@@ -1208,7 +2835,12 @@ Examples:
             size_drop_threshold=args.size_threshold,
             min_downloads=args.min_downloads,
             backup_enabled=not args.no_backup,
-            detailed_logging=args.verbose
+            detailed_logging=args.verbose,
+            fused_pipeline=args.fused_filter,
+            parallel_workers=args.filter_workers,
+            incremental_groups=args.incremental_groups,
+            selection_cache_file=args.selection_cache,
+            trace_memory=args.trace_memory
         )
         
         # Validate configuration
@@ -1228,6 +2860,20 @@ Examples:
     logger.info(f"Command: {args.command or 'both phases'}")
     logger.info(f"Verbose logging: {args.verbose}")
     logger.info(f"HF Token provided: {'Yes' if args.token else 'No'}")
+    logger.info(f"Detail transport: {args.transport}")
+    logger.info(f"Incremental download: {args.incremental}")
+    logger.info(f"Rate limit: {args.max_rps or 'no fixed cap'} requests/s (adaptive concurrency)")
+    logger.info(f"Resume from journal: {args.resume}")
+    logger.info(f"Bulk metadata: {args.bulk_metadata}")
+    logger.info(f"Raw data format: {args.raw_format}")
+    logger.info(f"Build cache: {'Disabled' if args.no_build_cache else 'Enabled'}")
+    logger.info(f"Sharded output: {args.output_shards}")
+    if args.record:
+        logger.info(f"Hub backend: live, recording to {args.record}")
+    elif args.replay:
+        logger.info(f"Hub backend: replay from {args.replay} ({args.replay_latency_ms}ms ± {args.replay_jitter_ms}ms, "
+                    f"{args.replay_error_rate:.1%} errors, {args.replay_throttle_rate:.1%} throttled, seed {args.replay_seed})")
+    logger.info(f"Model info cache: {'Disabled' if args.no_cache else f'{args.cache_ttl}h TTL, {args.cache_max_mb} MB'}")
     logger.info(f"Spam filtering: {'Disabled' if args.disable_spam_filter else 'Enabled'}")
     
     if not args.disable_spam_filter:
@@ -1236,14 +2882,44 @@ Examples:
         logger.info(f"  - Size threshold: {args.size_threshold}")
         logger.info(f"  - Min downloads: {args.min_downloads}")
         logger.info(f"  - Backup enabled: {not args.no_backup}")
+        logger.info(f"  - Fused pipeline: {args.fused_filter}")
+        logger.info(f"  - Group workers: {args.filter_workers or 'serial'}")
+        logger.info(f"  - Incremental groups: {args.incremental_groups}")
+        logger.info(f"  - Selection cache: {args.selection_cache or 'in-memory'}")
     
     try:
         # Initialize fetcher
         logger.info("Initializing GGUF fetcher...")
+        backend = None
+        if args.record:
+            endpoint = os.environ.get('HF_ENDPOINT', 'https://huggingface.co').rstrip('/')
+            backend = RecordingBackend(HfApiBackend(endpoint, args.token), args.record)
+        elif args.replay:
+            backend = ReplayBackend(
+                args.replay,
+                latency_ms=args.replay_latency_ms,
+                jitter_ms=args.replay_jitter_ms,
+                error_rate=args.replay_error_rate,
+                throttle_rate=args.replay_throttle_rate,
+                seed=args.replay_seed
+            )
+        
         fetcher = SimplifiedGGUFetcher(
             token=args.token,
             filter_config=filter_config,
-            disable_spam_filter=args.disable_spam_filter
+            disable_spam_filter=args.disable_spam_filter,
+            transport=args.transport,
+            incremental=args.incremental,
+            use_cache=not args.no_cache,
+            cache_ttl_hours=args.cache_ttl,
+            cache_max_mb=args.cache_max_mb,
+            max_requests_per_second=args.max_rps,
+            resume=args.resume,
+            backend=backend,
+            bulk_metadata=args.bulk_metadata,
+            raw_format=args.raw_format,
+            use_build_cache=not args.no_build_cache,
+            output_shards=args.output_shards
         )
         
         # Execute requested phase(s)
@@ -1253,6 +2929,9 @@ Examples:
         elif args.command == 'process':
             logger.info("Executing process phase only")
             fetcher.process_data()
+        elif args.command == 'pipeline':
+            logger.info("Executing pipelined download and process phases")
+            fetcher.run_pipeline()
         else:
             logger.info("Executing both download and process phases")
             fetcher.download_data()
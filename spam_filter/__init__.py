@@ -16,6 +16,8 @@ from .classifier import ModelClassifier
 from .quantization_selector import QuantizationSelector
 from .backup_manager import BackupManager
 from .engine import SpamFilterEngine
+from .selection_cache import SelectionCache
+from .siblings import SiblingTable
 
 # Package version
 __version__ = "1.0.0"
@@ -27,6 +29,8 @@ __all__ = [
     'QuantizationSelector',
     'BackupManager',
     'SpamFilterEngine',
+    'SelectionCache',
+    'SiblingTable',
     'setup_logging'
 ]
 
@@ -3,17 +3,23 @@
 Backup management utilities for model data
 """
 
-import json
+import glob
 import os
 import shutil
 from datetime import datetime
 from typing import Dict, List, Optional
 import logging
 
+from . import json_codec
+from .raw_store import iter_raw_file
+
 
 class BackupManager:
     """Manages backup creation and restoration for model data"""
     
+    # Extensions of the snapshot formats a backup can hold, see raw_store
+    BACKUP_FORMATS = ('json', 'jsonl', 'jsonl.gz', 'jsonl.zst', 'sqlite', 'partitions')
+    
     def __init__(self, backup_dir: str = "data/backups"):
         self.backup_dir = backup_dir
         self.logger = logging.getLogger(__name__)
@@ -43,7 +49,7 @@ class BackupManager:
         
         try:
             with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                json_codec.dump(data, f, pretty=True)
             
             self.logger.info(f"Created backup: {backup_path} ({len(data):,} entries)")
             return backup_path
@@ -54,10 +60,10 @@ class BackupManager:
     
     def create_file_backup(self, file_path: str) -> str:
         """
-        Create a backup by copying an existing file
+        Create a backup by copying an existing file or directory
         
         Args:
-            file_path: Path to file to backup
+            file_path: Path to file (or partitioned snapshot directory) to backup
             
         Returns:
             Path to created backup file
@@ -66,12 +72,16 @@ class BackupManager:
             raise FileNotFoundError(f"Source file not found: {file_path}")
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_name = os.path.splitext(os.path.basename(file_path))[0]
-        backup_filename = f"{base_name}_backup_{timestamp}.json"
+        # Keep compound extensions such as .jsonl.gz so the copy stays readable
+        base_name, dot, extension = os.path.basename(file_path).partition('.')
+        backup_filename = f"{base_name}_backup_{timestamp}.{extension if dot else 'json'}"
         backup_path = os.path.join(self.backup_dir, backup_filename)
         
         try:
-            shutil.copy2(file_path, backup_path)
+            if os.path.isdir(file_path):
+                shutil.copytree(file_path, backup_path)
+            else:
+                shutil.copy2(file_path, backup_path)
             self.logger.info(f"Created file backup: {backup_path}")
             return backup_path
             
@@ -94,13 +104,18 @@ class BackupManager:
             self.logger.error(f"Backup file not found: {backup_path}")
             return False
         
+        backup_format = self._backup_format(backup_path)
+        if backup_format != self._backup_format(target_file):
+            self.logger.error(f"Backup {backup_path} is in {backup_format or 'an unknown'} format, "
+                              f"cannot restore it to {target_file}")
+            return False
+        
         try:
-            # Validate backup file first
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not isinstance(data, list):
-                self.logger.error(f"Invalid backup format in {backup_path}")
+            # Validate backup file first, streaming so large backups are not loaded whole
+            try:
+                entry_count = self._count_entries(backup_path)
+            except Exception as e:
+                self.logger.error(f"Invalid backup format in {backup_path}: {e}")
                 return False
             
             # Create backup of current target file if it exists
@@ -108,18 +123,25 @@ class BackupManager:
                 current_backup = self.create_file_backup(target_file)
                 self.logger.info(f"Created backup of current file: {current_backup}")
             
-            # Restore from backup
-            shutil.copy2(backup_path, target_file)
-            self.logger.info(f"Restored {target_file} from {backup_path} ({len(data):,} entries)")
+            # Restore from backup through a temporary copy so the target is replaced in one step
+            temp_path = f"{target_file}.restore.tmp"
+            self._remove(temp_path)
+            if os.path.isdir(backup_path):
+                shutil.copytree(backup_path, temp_path)
+                self._remove(target_file)
+            else:
+                shutil.copy2(backup_path, temp_path)
+            os.replace(temp_path, target_file)
+            self.logger.info(f"Restored {target_file} from {backup_path} ({entry_count:,} entries)")
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to restore from backup {backup_path}: {e}")
             return False
     
-    def list_backups(self, pattern: str = "*backup*.json") -> List[Dict]:
+    def list_backups(self, pattern: str = "*backup*") -> List[Dict]:
         """
-        List available backup files
+        List available backups in any snapshot format
         
         Args:
             pattern: File pattern to match
@@ -127,26 +149,24 @@ class BackupManager:
         Returns:
             List of backup file information
         """
-        import glob
-        
         backup_pattern = os.path.join(self.backup_dir, pattern)
-        backup_files = glob.glob(backup_pattern)
+        backup_files = [path for path in glob.glob(backup_pattern) if self._backup_format(path)]
         
         backups = []
         for backup_file in sorted(backup_files, reverse=True):  # Newest first
             try:
                 stat = os.stat(backup_file)
-                with open(backup_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                size_bytes = self._backup_size(backup_file)
+                entry_count = self._count_entries(backup_file)
                 
                 backups.append({
                     'path': backup_file,
                     'filename': os.path.basename(backup_file),
-                    'size_bytes': stat.st_size,
-                    'size_formatted': self._format_file_size(stat.st_size),
+                    'size_bytes': size_bytes,
+                    'size_formatted': self._format_file_size(size_bytes),
                     'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
                     'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    'entry_count': len(data) if isinstance(data, list) else 0
+                    'entry_count': entry_count
                 })
                 
             except Exception as e:
@@ -172,7 +192,7 @@ class BackupManager:
         deleted_count = 0
         for backup in backups[keep_count:]:  # Skip the most recent ones
             try:
-                os.remove(backup['path'])
+                self._remove(backup['path'])
                 self.logger.info(f"Deleted old backup: {backup['filename']}")
                 deleted_count += 1
             except Exception as e:
@@ -195,24 +215,56 @@ class BackupManager:
         
         try:
             stat = os.stat(backup_path)
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            size_bytes = self._backup_size(backup_path)
+            try:
+                entry_count = self._count_entries(backup_path)
+                valid = True
+            except Exception:
+                entry_count = 0
+                valid = False
             
             return {
                 'path': backup_path,
                 'filename': os.path.basename(backup_path),
-                'size_bytes': stat.st_size,
-                'size_formatted': self._format_file_size(stat.st_size),
+                'size_bytes': size_bytes,
+                'size_formatted': self._format_file_size(size_bytes),
                 'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
                 'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                'entry_count': len(data) if isinstance(data, list) else 0,
-                'valid': isinstance(data, list)
+                'entry_count': entry_count,
+                'valid': valid
             }
             
         except Exception as e:
             self.logger.error(f"Could not get info for backup {backup_path}: {e}")
             return None
     
+    def _backup_format(self, path: str) -> Optional[str]:
+        """Snapshot format of a backup path from its extension, None if not a snapshot"""
+        extension = os.path.basename(path.rstrip(os.sep)).partition('.')[2]
+        return extension if extension in self.BACKUP_FORMATS else None
+    
+    def _count_entries(self, path: str) -> int:
+        """Count the records of a backup, reading every one so corrupt backups raise"""
+        records = iter_raw_file(path)
+        try:
+            return sum(1 for _ in records)
+        finally:
+            records.close()
+    
+    def _backup_size(self, path: str) -> int:
+        """Size in bytes of a backup file or of all files in a partitioned backup directory"""
+        if not os.path.isdir(path):
+            return os.path.getsize(path)
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(path) for name in names)
+    
+    def _remove(self, path: str) -> None:
+        """Remove a backup file or directory if it exists"""
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+    
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format"""
         for unit in ['B', 'KB', 'MB', 'GB']:
@@ -36,6 +36,12 @@ class FilterConfig:
     # System settings
     backup_enabled: bool = True
     detailed_logging: bool = True
+    fused_pipeline: bool = False  # Run steps 1-4 as one streaming pass (same output, lower peak memory)
+    parallel_workers: int = 0  # Processes for steps 5-6 across model groups (0 or 1 runs serially)
+    incremental_groups: bool = False  # Reuse steps 5-6 results of groups unchanged since the last run
+    selection_cache_size: int = 4096  # Memoized variant selections kept in memory (0 disables the cache)
+    selection_cache_file: str = ""  # Optional file persisting memoized selections between runs
+    trace_memory: bool = False  # Record each stage's peak traced memory with tracemalloc (slower)
     
     # Hardware calculation parameters
     ram_multiplier: float = 2.0  # Base RAM multiplier (2x file size)
@@ -58,6 +64,12 @@ class FilterConfig:
             
         if self.min_downloads < 0:
             errors.append("min_downloads must be non-negative")
+        
+        if self.parallel_workers < 0:
+            errors.append("parallel_workers must be non-negative")
+        
+        if self.selection_cache_size < 0:
+            errors.append("selection_cache_size must be non-negative")
             
         if not self.trusted_uploaders:
             errors.append("trusted_uploaders list cannot be empty")
@@ -3,18 +3,28 @@
 Main spam filter engine for processing model data
 """
 
+import hashlib
 import json
 import logging
+import os
 import re
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields, replace
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from collections import defaultdict
+from datetime import datetime, timezone
 
+from . import json_codec
 from .config import FilterConfig
 from .classifier import ModelClassifier
 from .quantization_selector import QuantizationSelector
 from .backup_manager import BackupManager
 from .hardware_calculator import HardwareRequirementsCalculator
+from .selection_cache import SelectionCache
+from .siblings import SiblingTable
 
 
 @dataclass
@@ -28,6 +38,8 @@ class ProcessingReport:
     
     # Removal reasons
     small_models_removed: int = 0
+    duplicates_removed: int = 0  # Mirrored copies of the same GGUF blob (LFS sha256)
+    duplicate_blobs: int = 0  # Distinct blobs that had more than one copy
     finetuned_removed: int = 0
     quantization_variants_removed: int = 0
     variants_removed_by_size: int = 0
@@ -39,6 +51,10 @@ class ProcessingReport:
     quantized_variants_kept: int = 0
     trusted_uploader_variants_kept: int = 0
     
+    # Memoized variant selection
+    selection_cache_hits: int = 0
+    selection_cache_misses: int = 0
+    
     # Size and performance
     size_reduction_mb: int = 0
     processing_time_seconds: float = 0.0
@@ -46,6 +62,9 @@ class ProcessingReport:
     # Model group statistics
     model_group_stats: Dict[str, Dict[str, int]] = field(default_factory=dict)
     
+    # Per-stage wall/CPU time, item counts, throughput and peak traced memory, in pipeline order
+    stage_metrics: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    
     # Error tracking
     errors: List[str] = field(default_factory=list)
     
@@ -57,10 +76,39 @@ class ProcessingReport:
             'removed': original_count - kept_count
         }
     
+    def add_stage_metrics(self, stage: str, wall_seconds: float, cpu_seconds: float, items_in: int,
+                          items_out: int, peak_memory_bytes: Optional[int] = None):
+        """Add a stage's measurements, accumulating repeated runs of the same stage"""
+        metrics = self.stage_metrics.setdefault(stage, {
+            'wall_seconds': 0.0,
+            'cpu_seconds': 0.0,
+            'items_in': 0,
+            'items_out': 0,
+            'items_per_second': 0.0,
+            'peak_memory_bytes': None
+        })
+        metrics['wall_seconds'] += wall_seconds
+        metrics['cpu_seconds'] += cpu_seconds
+        metrics['items_in'] += items_in
+        metrics['items_out'] += items_out
+        if metrics['wall_seconds'] > 0:
+            metrics['items_per_second'] = metrics['items_in'] / metrics['wall_seconds']
+        if peak_memory_bytes is not None:
+            metrics['peak_memory_bytes'] = max(metrics['peak_memory_bytes'] or 0, peak_memory_bytes)
+    
     def calculate_totals(self):
         """Calculate derived statistics"""
         self.total_removed = self.total_processed - self.total_kept
 
+    def merge(self, other: 'ProcessingReport'):
+        """Add a partial report's counters, group statistics and errors to this one"""
+        for report_field in fields(self):
+            value = getattr(other, report_field.name)
+            if isinstance(value, int) and not isinstance(value, bool):
+                setattr(self, report_field.name, getattr(self, report_field.name) + value)
+        self.model_group_stats.update(other.model_group_stats)
+        self.errors.extend(other.errors)
+
 
 @dataclass
 class FilterResult:
@@ -83,6 +131,13 @@ class FilterResult:
 class SpamFilterEngine:
     """Main engine for filtering model spam from GGUF model datasets"""
     
+    PARALLEL_BATCHES_PER_WORKER = 4  # Batches per process, balances uneven group sizes
+    GROUP_STATE_FILE = "data/group_state.json"  # Per-group results kept for incremental runs
+    
+    # FilterConfig switches that change how, not what, the engine computes
+    EXECUTION_SETTINGS = ('backup_enabled', 'detailed_logging', 'fused_pipeline', 'parallel_workers',
+                          'incremental_groups', 'selection_cache_size', 'selection_cache_file', 'trace_memory')
+    
     def __init__(self, config: FilterConfig):
         """Initialize the spam filter engine"""
         self.config = config
@@ -90,70 +145,79 @@ class SpamFilterEngine:
         self.selector = QuantizationSelector(config)
         self.backup_manager = BackupManager()
         self.hardware_calculator = HardwareRequirementsCalculator(config)
+        self._tracing_memory = False  # True while tracemalloc runs because trace_memory started it
+        self.selection_cache = None
+        if config.selection_cache_size > 0:
+            self.selection_cache = SelectionCache(self._state_fingerprint(), config.selection_cache_size,
+                                                  config.selection_cache_file or None)
+        self.selection_lookups = None  # (key, selected positions) per cache lookup, recorded in pool workers
         
         # Setup logging
         if config.detailed_logging:
             logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)  
   
-    def filter_models(self, raw_models: List[Dict]) -> FilterResult:
-        """Main filtering pipeline that processes raw model data"""
-        import time
+    def filter_models(self, raw_models: Iterable[Dict]) -> FilterResult:
+        """
+        Main filtering pipeline that processes raw model data
+        
+        Args:
+            raw_models: List or iterator of raw model dictionaries, consumed once
+        """
         start_time = time.time()
         
         report = ProcessingReport()
         errors = []
+        raw_count = 0
+        
+        def counted(models):
+            nonlocal raw_count
+            for raw_model in models:
+                raw_count += 1
+                yield raw_model
         
         try:
+            if self.config.fused_pipeline:
+                # Steps 1-4 in one pass that feeds the group buckets directly
+                self.logger.info("Steps 1-4: Extracting, filtering and grouping in one streaming pass")
+                with self._timed_stage(report, 'extract_filter_group') as stage:
+                    model_groups = self._fused_group_models(counted(raw_models), report, errors)
+                    stage['items_in'] = raw_count
+                    stage['items_out'] = sum(len(models) for models in model_groups.values())
+                self.logger.info(f"Extracted {report.total_processed} GGUF models from {raw_count} raw models, "
+                                 f"removed {report.duplicates_removed} duplicates, {report.small_models_removed} small "
+                                 f"and {report.finetuned_removed} finetuned models")
+                return self._finalize_groups(model_groups, report, errors, start_time)
+            
             # Step 1: Extract GGUF files from raw model data
             self.logger.info("Step 1: Extracting GGUF files from raw model data")
-            gguf_models = self._extract_gguf_models(raw_models, report, errors)
+            with self._timed_stage(report, 'extract') as stage:
+                gguf_models = self._extract_gguf_models(counted(raw_models), errors)
+                stage['items_in'], stage['items_out'] = raw_count, len(gguf_models)
             report.total_processed = len(gguf_models)  # Set after extraction
-            self.logger.info(f"Extracted {len(gguf_models)} GGUF models from {len(raw_models)} raw models")
+            self.logger.info(f"Extracted {len(gguf_models)} GGUF models from {raw_count} raw models")
             
             # Step 2: Remove small models (< 100MB)
             self.logger.info("Step 2: Removing small models")
-            filtered_models = self._remove_small_models(gguf_models, report)
+            with self._timed_stage(report, 'size_filter', len(gguf_models)) as stage:
+                filtered_models = self._remove_small_models(gguf_models, report)
+                stage['items_out'] = len(filtered_models)
             self.logger.info(f"Removed {report.small_models_removed} small models, {len(filtered_models)} remaining")
             
             # Step 3: Remove finetuned models
             self.logger.info("Step 3: Removing finetuned models")
-            base_models = self._remove_finetuned_models(filtered_models, report)
+            with self._timed_stage(report, 'finetune_filter', len(filtered_models)) as stage:
+                base_models = self._remove_finetuned_models(filtered_models, report)
+                stage['items_out'] = len(base_models)
             self.logger.info(f"Removed {report.finetuned_removed} finetuned models, {len(base_models)} remaining")
             
-            # Step 4: Group models by base architecture
-            self.logger.info("Step 4: Grouping models by base architecture")
-            model_groups = self._group_models_by_base(base_models)
-            self.logger.info(f"Created {len(model_groups)} model groups")
-            
-            # Step 5: Filter variants within each group
-            self.logger.info("Step 5: Filtering variants within groups")
-            final_models = self._filter_variants_in_groups(model_groups, report)
-            self.logger.info(f"Final result: {len(final_models)} models after variant filtering")
-            
-            # Step 6: Add hardware requirements to models
-            self.logger.info("Step 6: Calculating hardware requirements")
-            enhanced_models = self._add_hardware_requirements(final_models)
-            self.logger.info(f"Added hardware requirements to {len(enhanced_models)} models")
-            
-            # Calculate final statistics
-            report.total_kept = len(enhanced_models)
-            report.processing_time_seconds = time.time() - start_time
-            report.calculate_totals()
-            
-            return FilterResult(
-                filtered_models=enhanced_models,
-                original_count=len(gguf_models),  # Use GGUF models count, not raw models
-                filtered_count=len(enhanced_models),
-                removed_count=len(gguf_models) - len(enhanced_models),
-                backup_path=None,
-                processing_report=report,
-                errors=errors
-            )
+            # Steps 4-6: Collapse mirrors, group, select variants and add hardware requirements
+            return self.finalize_models(base_models, report, errors, start_time)
             
         except Exception as e:
             self.logger.error(f"Error during filtering: {str(e)}")
             errors.append(f"Filtering failed: {str(e)}")
+            self._stop_memory_tracing()
             
             return FilterResult(
                 filtered_models=[],
@@ -165,24 +229,178 @@ class SpamFilterEngine:
                 errors=errors
             )
     
-    def _extract_gguf_models(self, raw_models: List[Dict], report: ProcessingReport, errors: List[str]) -> List[Dict]:
+    def prefilter_raw_model(self, raw_model: Dict, report: ProcessingReport, errors: List[str]) -> List[Dict]:
+        """
+        Run the per-repo steps (1-3) on a single raw model
+        
+        Extraction, size filtering and finetune classification only depend on
+        one repo, so pipelined callers can run them as each repo arrives and
+        pass the accumulated survivors to finalize_models.
+        
+        Args:
+            raw_model: Raw Hugging Face model dictionary
+            report: Report whose counters are updated in place
+            errors: List collecting error messages
+            
+        Returns:
+            Base model entries extracted from this repo
+        """
+        gguf_models = self._extract_gguf_models([raw_model], errors)
+        report.total_processed += len(gguf_models)
+        filtered_models = self._remove_small_models(gguf_models, report)
+        return self._remove_finetuned_models(filtered_models, report)
+    
+    def finalize_models(self, base_models: List[Dict], report: ProcessingReport, errors: List[str],
+                        start_time: float) -> FilterResult:
+        """
+        Run the group-level steps (4-6) on the prefiltered base models
+        
+        Mirrored duplicates are collapsed first, once every path has applied
+        the per-entry filters: copies of one blob live in different repos and
+        can classify differently, so a blob survives if any copy passes.
+        
+        Args:
+            base_models: Models that survived extraction, size and finetune filtering
+            report: Report with per-repo counters already filled in
+            errors: List collecting error messages
+            start_time: time.time() at the start of filtering
+            
+        Returns:
+            FilterResult with the final models
+        """
+        with self._timed_stage(report, 'deduplicate', len(base_models)) as stage:
+            base_models = self._collapse_duplicates(base_models, report)
+            stage['items_out'] = len(base_models)
+        self._drop_content_hashes(base_models)
+        
+        # Step 4: Group models by base architecture
+        self.logger.info("Step 4: Grouping models by base architecture")
+        with self._timed_stage(report, 'group', len(base_models)) as stage:
+            model_groups = self._group_models_by_base(base_models)
+            stage['items_out'] = len(base_models)
+        return self._finalize_groups(model_groups, report, errors, start_time)
+    
+    def _finalize_groups(self, model_groups: Dict[str, List[Dict]], report: ProcessingReport, errors: List[str],
+                         start_time: float) -> FilterResult:
+        """Run steps 5-6 on grouped base models and build the FilterResult"""
+        self.logger.info(f"Created {len(model_groups)} model groups")
+        
+        workers = self.config.parallel_workers
+        grouped_count = sum(len(models) for models in model_groups.values())
+        if self.config.incremental_groups:
+            # Only groups whose members changed since the last run are re-evaluated
+            self.logger.info(f"Steps 5-6: Re-evaluating changed groups, reusing the rest from {self.GROUP_STATE_FILE}")
+            with self._timed_stage(report, 'select_variants_and_hardware', grouped_count) as stage:
+                enhanced_models = self._process_groups_incremental(model_groups, report, workers)
+                stage['items_out'] = len(enhanced_models)
+            self.logger.info(f"Final result: {len(enhanced_models)} models after variant filtering")
+        elif workers > 1 and len(model_groups) >= 2 * workers:
+            # Steps 5-6 are independent per group, so batches of groups run on worker processes
+            self.logger.info(f"Steps 5-6: Filtering variants and calculating hardware requirements on {workers} processes")
+            with self._timed_stage(report, 'select_variants_and_hardware', grouped_count) as stage:
+                enhanced_models = []
+                for _, group_models, partial_report in self._process_groups_parallel(model_groups, workers):
+                    enhanced_models.extend(group_models)
+                    report.merge(partial_report)
+                stage['items_out'] = len(enhanced_models)
+            self.logger.info(f"Final result: {len(enhanced_models)} models after variant filtering")
+        else:
+            # Step 5: Filter variants within each group
+            self.logger.info("Step 5: Filtering variants within groups")
+            with self._timed_stage(report, 'select_variants', grouped_count) as stage:
+                final_models = self._filter_variants_in_groups(model_groups, report)
+                stage['items_out'] = len(final_models)
+            self.logger.info(f"Final result: {len(final_models)} models after variant filtering")
+        
+            # Step 6: Add hardware requirements to models
+            self.logger.info("Step 6: Calculating hardware requirements")
+            with self._timed_stage(report, 'hardware', len(final_models)) as stage:
+                enhanced_models = self._add_hardware_requirements(final_models)
+                stage['items_out'] = len(enhanced_models)
+            self.logger.info(f"Added hardware requirements to {len(enhanced_models)} models")
+        
+        if self.selection_cache is not None:
+            self.selection_cache.save()
+        self._stop_memory_tracing()
+        
+        # Calculate final statistics
+        report.total_kept = len(enhanced_models)
+        report.processing_time_seconds = time.time() - start_time
+        report.calculate_totals()
+        
+        return FilterResult(
+            filtered_models=enhanced_models,
+            original_count=report.total_processed,  # Use GGUF models count, not raw models
+            filtered_count=len(enhanced_models),
+            removed_count=report.total_processed - len(enhanced_models),
+            backup_path=None,
+            processing_report=report,
+            errors=errors
+        )
+    
+    @contextmanager
+    def _timed_stage(self, report: ProcessingReport, stage: str, items_in: int = 0) -> Iterator[Dict[str, int]]:
+        """
+        Measure a pipeline stage and add it to the report's stage metrics
+        
+        The caller sets 'items_out' on the yielded counts, and 'items_in' when
+        it is only known once the stage has consumed its input. CPU time is
+        that of this process, so work done by pool workers shows up as wall
+        time only. With trace_memory, tracemalloc is started on first use and
+        the peak traced memory during the stage is recorded.
+        
+        Args:
+            report: Report receiving the measurements
+            stage: Stage name, e.g. 'extract' or 'select_variants'
+            items_in: Number of input items, if known up front
+        
+        Yields:
+            Mutable {'items_in', 'items_out'} counts
+        """
+        counts = {'items_in': items_in, 'items_out': 0}
+        if self.config.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing_memory = True
+            tracemalloc.reset_peak()
+        
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        yield counts
+        wall_seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.process_time() - cpu_start
+        
+        peak_memory = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() and self.config.trace_memory else None
+        report.add_stage_metrics(stage, wall_seconds, cpu_seconds, counts['items_in'], counts['items_out'], peak_memory)
+    
+    def _stop_memory_tracing(self) -> None:
+        """Stop tracemalloc if trace_memory started it"""
+        if self._tracing_memory:
+            tracemalloc.stop()
+            self._tracing_memory = False
+    
+    def _extract_gguf_models(self, raw_models: Iterable[Dict], errors: List[str]) -> List[Dict]:
         """Extract GGUF files from raw Hugging Face model data and convert to expected format"""
-        gguf_models = []
+        return list(self._iter_gguf_models(raw_models, errors))
         
+    def _iter_gguf_models(self, raw_models: Iterable[Dict], errors: List[str]) -> Iterator[Dict]:
+        """Yield one expected-format entry per GGUF file of each raw model"""
         for raw_model in raw_models:
             try:
+                # Each filename is checked once when the table is built
+                siblings = SiblingTable.of(raw_model.get('siblings', []))
+                
                 # Skip if no GGUF files
-                if not self._has_gguf_files(raw_model):
+                if not siblings.has_gguf:
                     continue
                 
                 # Extract GGUF files from siblings
-                gguf_files = self._get_gguf_files(raw_model)
-                
-                for gguf_file in gguf_files:
+                for filename, size, sha256 in siblings.gguf_files():
+                    gguf_file = {'rfilename': filename, 'size': size, 'sha256': sha256}
                     try:
                         model = self._convert_to_expected_format(raw_model, gguf_file)
                         if model:
-                            gguf_models.append(model)
+                            yield model
                     except Exception as e:
                         errors.append(f"Error converting model {raw_model.get('id', 'unknown')}: {str(e)}")
                         continue
@@ -191,23 +409,77 @@ class SpamFilterEngine:
                 errors.append(f"Error processing raw model {raw_model.get('id', 'unknown')}: {str(e)}")
                 continue
         
-        return gguf_models
+    def _fused_group_models(self, raw_models: Iterable[Dict], report: ProcessingReport,
+                            errors: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Run steps 1-4 (extract, size and finetune filtering, collapse
+        duplicates, grouping) as one pass over the raw models
+        
+        Each extracted entry is filtered and dropped into its group bucket as
+        it is produced, so only surviving entries are held. Surviving entries
+        with a content hash wait until every copy of their blob has been
+        seen: only the best-ranked surviving copy so far is kept per hash.
+        Buckets and groups are finally put back in extraction order, which
+        makes the result and the report counters identical to the
+        step-by-step pipeline.
+        
+        Args:
+            raw_models: Iterable of raw model dictionaries, consumed once
+            report: Report whose counters are updated in place
+            errors: List collecting error messages
+        
+        Returns:
+            Group name -> base models, as _group_models_by_base would return
+        """
+        groups = defaultdict(list)  # group -> [(sequence, model)]
+        best_copies = {}  # sha256 -> (rank, sequence, model)
+        copy_counts = defaultdict(int)
+        
+        def accept(sequence: int, model: Dict) -> None:
+            model.pop('sha256', None)
+            groups[self.classifier.get_base_model_group(model)].append((sequence, model))
+        
+        for sequence, model in enumerate(self._iter_gguf_models(raw_models, errors)):
+            report.total_processed += 1
+            if model.get('fileSize', 0) < self.config.min_size_bytes:
+                report.small_models_removed += 1
+                continue
+            if not self.classifier.is_base_model(model):
+                report.finetuned_removed += 1
+                continue
+            
+            sha256 = model.get('sha256')
+            if not sha256:
+                accept(sequence, model)
+                continue
+            
+            copy_counts[sha256] += 1
+            rank = self._duplicate_rank(model)
+            if sha256 not in best_copies or rank < best_copies[sha256][0]:
+                best_copies[sha256] = (rank, sequence, model)
+        
+        for count in copy_counts.values():
+            if count > 1:
+                report.duplicate_blobs += 1
+                report.duplicates_removed += count - 1
+        for _, sequence, model in best_copies.values():
+            accept(sequence, model)
+        
+        if best_copies:
+            for bucket in groups.values():
+                bucket.sort(key=lambda item: item[0])
+        ordered = sorted(groups.items(), key=lambda item: item[1][0][0])
+        return {name: [model for _, model in bucket] for name, bucket in ordered}
     
     def _has_gguf_files(self, raw_model: Dict) -> bool:
         """Check if raw model has GGUF files"""
-        siblings = raw_model.get('siblings', [])
-        return any(
-            sibling.get('rfilename', '').lower().endswith('.gguf')
-            for sibling in siblings
-        )
+        return SiblingTable.of(raw_model.get('siblings', [])).has_gguf
     
     def _get_gguf_files(self, raw_model: Dict) -> List[Dict]:
         """Extract GGUF files from siblings"""
-        siblings = raw_model.get('siblings', [])
-        return [
-            sibling for sibling in siblings
-            if sibling.get('rfilename', '').lower().endswith('.gguf')
-        ]
+        siblings = SiblingTable.of(raw_model.get('siblings', []))
+        return [{'rfilename': filename, 'size': size, 'sha256': sha256}
+                for filename, size, sha256 in siblings.gguf_files()]
     
     def _convert_to_expected_format(self, raw_model: Dict, gguf_file: Dict) -> Optional[Dict]:
         """Convert raw model + GGUF file to expected format"""
@@ -245,7 +517,8 @@ class SpamFilterEngine:
                 'likeCount': raw_model.get('likes', 0),
                 'huggingFaceLink': hf_link,
                 'directDownloadLink': download_link,
-                'uploadDate': raw_model.get('created_at', None)  # Add upload date from created_at
+                'uploadDate': raw_model.get('created_at', None),  # Add upload date from created_at
+                'sha256': gguf_file.get('sha256')  # LFS content hash, None if not captured
             }
             
         except Exception as e:
@@ -308,6 +581,49 @@ class SpamFilterEngine:
         else:
             return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
     
+    def _collapse_duplicates(self, models: List[Dict], report: ProcessingReport) -> List[Dict]:
+        """
+        Keep one entry per GGUF blob, identified by its LFS sha256
+        
+        The same file mirrored by several uploaders has the same content hash.
+        The copy kept is the best-ranked one: trusted uploaders first, then
+        the most downloads and likes, then the lowest link for a stable
+        choice. Entries without a hash are always kept.
+        """
+        copies = defaultdict(list)
+        for model in models:
+            if model.get('sha256'):
+                copies[model['sha256']].append(model)
+        
+        removed = set()
+        for entries in copies.values():
+            if len(entries) < 2:
+                continue
+            best = min(entries, key=self._duplicate_rank)
+            removed.update(id(m) for m in entries if m is not best)
+            report.duplicate_blobs += 1
+        
+        if not removed:
+            return models
+        
+        report.duplicates_removed += len(removed)
+        self.logger.info(f"Collapsed {len(removed)} mirrored duplicates of {len(copies)} hashed GGUF files")
+        return [model for model in models if id(model) not in removed]
+    
+    def _drop_content_hashes(self, models: List[Dict]) -> None:
+        """Remove the sha256 used to collapse mirrors, it is not part of the output entries"""
+        for model in models:
+            model.pop('sha256', None)
+    
+    def _duplicate_rank(self, model: Dict) -> Tuple:
+        """Sort key among copies of one blob or equally sized group members, lowest is preferred"""
+        return (
+            not self.selector.is_trusted_uploader(model),
+            -model.get('downloadCount', 0),
+            -model.get('likeCount', 0),
+            model.get('directDownloadLink', '')
+        )
+    
     def _remove_small_models(self, models: List[Dict], report: ProcessingReport) -> List[Dict]:
         """Remove models smaller than minimum size threshold"""
         filtered = []
@@ -350,6 +666,10 @@ class SpamFilterEngine:
         for group_name, models in model_groups.items():
             original_count = len(models)
             
+            # Rank the group first, so equally sized variants and base models resolve the
+            # same way whatever order the raw records arrived in
+            models = sorted(models, key=self._duplicate_rank)
+            
             # Separate base models from quantized variants
             base_models = []
             variants = []
@@ -370,7 +690,7 @@ class SpamFilterEngine:
             # Filter variants using quantization selector
             selected_variants = []
             if variants:
-                selected_variants = self.selector.select_variants_for_group(None, variants)
+                selected_variants = self._select_variants(variants, report)
                 final_models.extend(selected_variants)
                 report.quantized_variants_kept += len(selected_variants)
                 report.quantization_variants_removed += len(variants) - len(selected_variants)
@@ -390,6 +710,225 @@ class SpamFilterEngine:
         
         return final_models
     
+    def _select_variants(self, variants: List[Dict], report: ProcessingReport) -> List[Dict]:
+        """
+        Select a group's variants, reusing a memoized result for identical groups
+        
+        Args:
+            variants: Quantized variants of one group, in group order
+            report: Report the cache hit or miss is counted in
+        
+        Returns:
+            Selected variants, the same as select_variants_for_group(None, variants)
+        """
+        if self.selection_cache is None:
+            return self.selector.select_variants_for_group(None, variants)
+        
+        key = self.selection_cache.key([
+            (variant.get('fileSize', 0), variant.get('downloadCount', 0), variant.get('quantFormat', ''),
+             self.selector.extract_uploader_from_model_id(variant))
+            for variant in variants
+        ])
+        indices = self.selection_cache.get(key)
+        if indices is not None:
+            report.selection_cache_hits += 1
+        else:
+            report.selection_cache_misses += 1
+            selected = self.selector.select_variants_for_group(None, variants)
+            positions = {id(variant): i for i, variant in enumerate(variants)}
+            indices = [positions[id(variant)] for variant in selected]
+            self.selection_cache.put(key, indices)
+        
+        if self.selection_lookups is not None:
+            self.selection_lookups.append((key, indices))
+        return [variants[i] for i in indices]
+    
+    def _replay_selection_lookups(self, lookups: List[Tuple[str, List[int]]], report: ProcessingReport) -> None:
+        """
+        Apply a worker's selection cache lookups to this engine's cache, in order
+        
+        Hits and misses are recounted against this cache, so a group's
+        counters and the cache contents end up as if the group had been
+        selected here, whatever the worker's own cache held.
+        
+        Args:
+            lookups: (key, selected positions) per lookup of one group
+            report: The group's partial report, whose cache counters are replaced
+        """
+        report.selection_cache_hits = report.selection_cache_misses = 0
+        for key, indices in lookups:
+            if self.selection_cache.get(key) is not None:
+                report.selection_cache_hits += 1
+            else:
+                report.selection_cache_misses += 1
+                self.selection_cache.put(key, indices)
+    
+    def _process_groups(self, batch: List[Tuple[str, List[Dict]]]) -> List[Tuple[str, List[Dict], ProcessingReport]]:
+        """Run steps 5-6 on a batch of groups, returning each group's models and partial report"""
+        results = []
+        for group_name, models in batch:
+            report = ProcessingReport()
+            final_models = self._filter_variants_in_groups({group_name: models}, report)
+            results.append((group_name, self._add_hardware_requirements(final_models), report))
+        return results
+    
+    def _process_groups_parallel(self, model_groups: Dict[str, List[Dict]],
+                                 workers: int) -> List[Tuple[str, List[Dict], ProcessingReport]]:
+        """
+        Run steps 5-6 on a process pool, with the same result as serial mode
+        
+        Groups are cut, in order, into contiguous batches of about equal model
+        count; each task pickles only its batch, the configuration and the
+        selection cache entries are sent once per worker, so the cache file
+        is only read here. Each group's cache lookups are replayed on this
+        engine's cache in group order, which recounts hits and misses as the
+        serial loop would. Results are returned in submission order, so
+        concatenating the models and merging the partial reports reproduces
+        the serial loop exactly.
+        
+        Args:
+            model_groups: Group name -> base models, in group order
+            workers: Number of worker processes
+        
+        Returns:
+            (group name, final models, partial report) per group, in group order
+        """
+        batches = self._group_batches(model_groups, workers * self.PARALLEL_BATCHES_PER_WORKER)
+        results = []
+        
+        cache_entries = dict(self.selection_cache.entries) if self.selection_cache is not None else {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_group_worker,
+                                 initargs=(self.config, cache_entries)) as executor:
+            for batch_results in executor.map(_process_group_batch, batches):
+                for group_name, final_models, partial_report, lookups in batch_results:
+                    if self.selection_cache is not None:
+                        self._replay_selection_lookups(lookups, partial_report)
+                    results.append((group_name, final_models, partial_report))
+        
+        return results
+    
+    def _process_groups_incremental(self, model_groups: Dict[str, List[Dict]], report: ProcessingReport,
+                                    workers: int) -> List[Dict]:
+        """
+        Run steps 5-6 only for groups that changed since the previous run
+        
+        Each group is identified by a hash of its member entries, which covers
+        both membership and member stats such as downloads. Groups whose hash
+        matches the persisted state reuse their selected models and partial
+        report; the others are re-evaluated (on the process pool when there
+        are enough of them) and the results are spliced together in group
+        order, so the outcome equals a full evaluation. State is discarded
+        when the configuration or the engine code changed.
+        
+        Args:
+            model_groups: Group name -> base models, in group order
+            report: Report the partial reports are merged into
+            workers: Worker processes for the changed groups (0 or 1 for serial)
+        
+        Returns:
+            Final models with hardware requirements, in serial order
+        """
+        fingerprint = self._state_fingerprint()
+        previous_state = self._load_group_state(fingerprint)
+        
+        results = {}
+        hashes = {}
+        changed_groups = {}
+        membership_changes = 0
+        for group_name, models in model_groups.items():
+            hashes[group_name] = hashlib.sha256(json_codec.dumps(models).encode('utf-8')).hexdigest()
+            previous = previous_state.get(group_name)
+            if previous is not None and previous['hash'] == hashes[group_name]:
+                # Selection was skipped, so the previous run's cache counters do not apply
+                partial_report = ProcessingReport(**previous['report'])
+                partial_report.selection_cache_hits = partial_report.selection_cache_misses = 0
+                results[group_name] = (previous['models'], partial_report)
+                continue
+            changed_groups[group_name] = models
+            members = [model.get('directDownloadLink') for model in models]
+            if previous is None or previous['members'] != members:
+                membership_changes += 1
+        
+        if changed_groups:
+            if workers > 1 and len(changed_groups) >= 2 * workers:
+                evaluated = self._process_groups_parallel(changed_groups, workers)
+            else:
+                evaluated = self._process_groups(list(changed_groups.items()))
+            for group_name, group_models, partial_report in evaluated:
+                results[group_name] = (group_models, partial_report)
+        
+        enhanced_models = []
+        state = {}
+        for group_name, models in model_groups.items():
+            group_models, partial_report = results[group_name]
+            enhanced_models.extend(group_models)
+            report.merge(partial_report)
+            state[group_name] = {
+                'hash': hashes[group_name],
+                'members': [model.get('directDownloadLink') for model in models],
+                'models': group_models,
+                'report': asdict(partial_report)
+            }
+        
+        self._save_group_state(fingerprint, state)
+        self.logger.info(f"Group state: {len(changed_groups)} of {len(model_groups)} groups re-evaluated "
+                         f"({membership_changes} with changed membership), {len(model_groups) - len(changed_groups)} reused")
+        return enhanced_models
+        
+    def _state_fingerprint(self) -> str:
+        """Hash of the output-affecting configuration and the engine sources"""
+        config = {key: value for key, value in asdict(self.config).items() if key not in self.EXECUTION_SETTINGS}
+        digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8'))
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        for filename in sorted(os.listdir(package_dir)):
+            if filename.endswith('.py'):
+                with open(os.path.join(package_dir, filename), 'rb') as f:
+                    digest.update(f.read())
+        return digest.hexdigest()
+    
+    def _load_group_state(self, fingerprint: str) -> Dict[str, Dict]:
+        """Load persisted per-group results, empty if missing, unreadable or stale"""
+        try:
+            with open(self.GROUP_STATE_FILE, 'r', encoding='utf-8') as f:
+                state = json_codec.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable group state {self.GROUP_STATE_FILE}: {e}")
+            return {}
+        
+        if state.get('fingerprint') != fingerprint:
+            self.logger.info("Group state was built with a different configuration or engine version, re-evaluating all groups")
+            return {}
+        return state.get('groups', {})
+    
+    def _save_group_state(self, fingerprint: str, groups: Dict[str, Dict]) -> None:
+        """Persist per-group results atomically"""
+        temp_path = f"{self.GROUP_STATE_FILE}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.GROUP_STATE_FILE) or '.', exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json_codec.dump({'fingerprint': fingerprint, 'groups': groups}, f)
+            os.replace(temp_path, self.GROUP_STATE_FILE)
+        except OSError as e:
+            self.logger.warning(f"Could not save group state: {e}")
+    
+    @staticmethod
+    def _group_batches(model_groups: Dict[str, List[Dict]], batch_count: int) -> List[List[Tuple[str, List[Dict]]]]:
+        """Split groups, in order, into at most batch_count batches of similar model count"""
+        total = sum(len(models) for models in model_groups.values())
+        target = max(1, -(-total // batch_count))
+        
+        batches = [[]]
+        size = 0
+        for item in model_groups.items():
+            if size >= target:
+                batches.append([])
+                size = 0
+            batches[-1].append(item)
+            size += len(item[1])
+        return batches
+    
     def _add_hardware_requirements(self, models: List[Dict]) -> List[Dict]:
         """Add hardware requirements to each model"""
         enhanced_models = []
@@ -405,6 +944,17 @@ class SpamFilterEngine:
         
         return enhanced_models
     
+    def create_file_backup(self, file_path: str) -> Optional[str]:
+        """Create backup by copying a model data file"""
+        if not self.config.backup_enabled:
+            return None
+        
+        try:
+            return self.backup_manager.create_file_backup(file_path)
+        except Exception as e:
+            self.logger.error(f"Failed to create backup: {str(e)}")
+            return None
+    
     def create_backup(self, models: List[Dict]) -> Optional[str]:
         """Create backup of original model data"""
         if not self.config.backup_enabled:
@@ -432,6 +982,7 @@ class SpamFilterEngine:
             "",
             "=== Removal Breakdown ===",
             f"Small Models Removed: {report.small_models_removed:,}",
+            f"Mirrored Duplicates Removed: {report.duplicates_removed:,} ({report.duplicate_blobs:,} files with copies)",
             f"Finetuned Models Removed: {report.finetuned_removed:,}",
             f"Quantization Variants Removed: {report.quantization_variants_removed:,}",
             "",
@@ -442,6 +993,29 @@ class SpamFilterEngine:
             "",
         ]
         
+        selections = report.selection_cache_hits + report.selection_cache_misses
+        if selections:
+            lines.extend([
+                "=== Variant Selection Cache ===",
+                f"Cache Hits: {report.selection_cache_hits:,} ({report.selection_cache_hits / selections * 100:.1f}%)",
+                f"Cache Misses: {report.selection_cache_misses:,}",
+                "",
+            ])
+        
+        if report.stage_metrics:
+            lines.extend([
+                "=== Stage Performance ===",
+                f"{'Stage':28} | {'Wall s':>7} | {'CPU s':>7} | {'In':>7} | {'Out':>7} | {'Items/s':>9} | {'Peak MB':>7}"
+            ])
+            for stage, metrics in report.stage_metrics.items():
+                peak = metrics['peak_memory_bytes']
+                peak_mb = f"{peak / (1024 * 1024):7.1f}" if peak is not None else f"{'-':>7}"
+                lines.append(
+                    f"{stage[:28]:28} | {metrics['wall_seconds']:7.2f} | {metrics['cpu_seconds']:7.2f} | "
+                    f"{metrics['items_in']:7} | {metrics['items_out']:7} | {metrics['items_per_second']:9,.0f} | {peak_mb}"
+                )
+            lines.append("")
+        
         if report.model_group_stats:
             lines.extend([
                 "=== Top Model Groups ===",
@@ -471,4 +1045,64 @@ class SpamFilterEngine:
             if len(result.errors) > 5:
                 lines.append(f"... and {len(result.errors) - 5} more errors")
         
-        return "\n".join(lines)
\ No newline at end of file
+        return "\n".join(lines)
+
+    def write_metrics(self, result: FilterResult, file_path: str) -> bool:
+        """
+        Export the run's stage metrics as JSON, for tracking performance across runs
+        
+        Args:
+            result: Filter result whose report holds the stage metrics
+            file_path: Destination JSON file, replaced atomically
+        
+        Returns:
+            True if the file was written
+        """
+        report = result.processing_report
+        metrics = {
+            'generated_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'processing_time_seconds': report.processing_time_seconds,
+            'total_processed': report.total_processed,
+            'total_kept': report.total_kept,
+            'fused_pipeline': self.config.fused_pipeline,
+            'parallel_workers': self.config.parallel_workers,
+            'incremental_groups': self.config.incremental_groups,
+            'trace_memory': self.config.trace_memory,
+            'selection_cache_hits': report.selection_cache_hits,
+            'selection_cache_misses': report.selection_cache_misses,
+            'stages': report.stage_metrics
+        }
+        
+        temp_path = f"{file_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json_codec.dump(metrics, f, pretty=True)
+            os.replace(temp_path, file_path)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Could not write filter metrics to {file_path}: {e}")
+            return False
+
+
+# Engine of a process-pool worker, built once per process by _init_group_worker
+_worker_engine = None
+
+
+def _init_group_worker(config: FilterConfig, cache_entries: Dict[str, List[int]]) -> None:
+    """Process-pool initializer: build the worker's engine from the parent's config and selection cache"""
+    global _worker_engine
+    _worker_engine = SpamFilterEngine(replace(config, selection_cache_file=''))
+    if _worker_engine.selection_cache is not None:
+        _worker_engine.selection_cache.entries.update(cache_entries)
+
+
+def _process_group_batch(batch: List[Tuple[str, List[Dict]]]) -> List[Tuple[str, List[Dict], ProcessingReport,
+                                                                            List[Tuple[str, List[int]]]]]:
+    """Process-pool task: run steps 5-6 on one batch of groups, returning each group's selection cache lookups too"""
+    results = []
+    for group in batch:
+        _worker_engine.selection_lookups = []
+        for group_name, final_models, report in _worker_engine._process_groups([group]):
+            results.append((group_name, final_models, report, _worker_engine.selection_lookups))
+    return results
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+JSON codec with an optional accelerated backend
+
+Uses orjson when it is installed and the standard library json module
+otherwise. Both backends lay text out the same way: pretty output is indented
+as by json.dump(indent=2, ensure_ascii=False) and compact output uses
+json.dumps(separators=(',', ':'), ensure_ascii=False). Float formatting is
+not the same: orjson writes the shortest form without an exponent sign or
+padding (1e16 and 1e-7 where the stdlib writes 1e+16 and 1e-07) and writes
+non-finite floats as null. Finite values read back identically with either
+backend, but a file holding such floats is not byte-identical across
+backends, so anything keyed on file bytes should include BACKEND.
+"""
+
+import json
+from typing import Any, TextIO
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib codec
+    orjson = None
+
+# Name of the active backend, for logs and benchmarks
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def dumps(obj: Any, pretty: bool = False) -> str:
+    """
+    Serialize an object to JSON text
+    
+    Args:
+        obj: JSON-serializable object
+        pretty: If True, indent by two spaces; otherwise use compact separators
+    
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode('utf-8')
+        except TypeError:
+            pass  # Values orjson rejects (e.g. integers beyond 64 bits) use the stdlib
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def dump(obj: Any, fp: TextIO, pretty: bool = False) -> None:
+    """
+    Serialize an object as JSON to a text file
+    
+    Args:
+        obj: JSON-serializable object
+        fp: Text file object opened for writing
+        pretty: If True, indent by two spaces; otherwise use compact separators
+    """
+    fp.write(dumps(obj, pretty=pretty))
+
+
+def loads(text) -> Any:
+    """
+    Deserialize JSON text or bytes
+    
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def load(fp: TextIO) -> Any:
+    """Deserialize a whole JSON document from a file object"""
+    return loads(fp.read())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for files holding one top-level JSON array
+"""
+
+import json
+from typing import Any, Iterator, TextIO
+
+# Characters read from the file per refill
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+def iter_json_array(fp: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time
+    
+    Works on any formatting, including the indented output of
+    json.dump(indent=2), and keeps only the current element plus one chunk
+    in memory, so memory use does not grow with the file size.
+    
+    Args:
+        fp: Text file object positioned at the start of the document
+        chunk_size: Number of characters read per refill
+    
+    Yields:
+        Decoded array elements in file order
+    
+    Raises:
+        json.JSONDecodeError: If the document is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    
+    def fill() -> bool:
+        """Append the next chunk to the buffer, False at end of file"""
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        # Read at least as much as is pending, so an element larger than a
+        # chunk is re-decoded a logarithmic number of times, not a linear one
+        chunk = fp.read(max(chunk_size, len(buffer) - pos))
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+    
+    def next_token() -> str:
+        """Skip whitespace and return the next character, '' at end of file"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ''
+    
+    if next_token() != '[':
+        raise json.JSONDecodeError("Expecting '[' at start of array", buffer, pos)
+    pos += 1
+    
+    if next_token() == ']':
+        pos += 1
+    else:
+        while True:
+            if not next_token():
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            
+            # Decode the next element, reading more until it is complete
+            while True:
+                try:
+                    element, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if fill():
+                        continue
+                    raise
+                # A number cut by the chunk boundary (e.g. "1.5e") decodes as a
+                # shorter number, so only accept one followed by a delimiter
+                if isinstance(element, (int, float)) and not isinstance(element, bool):
+                    if (end == len(buffer) or buffer[end] not in _DELIMITERS) and fill():
+                        continue
+                break
+            pos = end
+            yield element
+            
+            separator = next_token()
+            pos += 1
+            if separator == ']':
+                break
+            if separator != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos - 1)
+    
+    if next_token():
+        raise json.JSONDecodeError("Extra data after array", buffer, pos)
+
+
+def count_json_array(fp: TextIO) -> int:
+    """
+    Count the elements of a top-level JSON array without loading it
+    
+    Args:
+        fp: Text file object positioned at the start of the document
+    
+    Returns:
+        Number of array elements
+    
+    Raises:
+        json.JSONDecodeError: If the document is not a well-formed JSON array
+    """
+    return sum(1 for _ in iter_json_array(fp))
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Raw model snapshot formats: JSON, JSON Lines (optionally gzip or zstd
+compressed), a SQLite store and month-partitioned JSON Lines directories
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Optional: zstd-compressed raw snapshots fall back to gzip
+    zstandard = None
+
+from . import json_codec
+from .json_stream import iter_json_array
+
+
+def open_raw_file(path: str, mode: str = 'r'):
+    """
+    Open a raw snapshot file as text, decompressing by file extension.
+    
+    Args:
+        path: File path ending in .gz, .zst or an uncompressed extension
+        mode: 'r' or 'w'
+    
+    Returns:
+        Text file object
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is not installed, cannot open {path}")
+        return zstandard.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def iter_raw_file(path: str) -> Iterator[Dict]:
+    """
+    Stream raw model records from a snapshot file in any raw format.
+    
+    JSON Lines files are decoded one line at a time, SQLite stores are read
+    through a cursor and JSON array files are parsed incrementally, so memory
+    use does not grow with the snapshot size.
+    
+    Args:
+        path: Raw snapshot file path
+    
+    Yields:
+        Raw model dictionaries
+    """
+    if path.endswith('.sqlite'):
+        store = RawModelStore(path)
+        try:
+            yield from store.iter_records()
+        finally:
+            store.close()
+        return
+    if path.endswith('.partitions'):
+        yield from PartitionedRawStore(path).iter_records()
+        return
+    
+    with open_raw_file(path) as f:
+        if '.jsonl' not in os.path.basename(path):
+            yield from iter_json_array(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json_codec.loads(line)
+
+
+def write_raw_file(path: str, records: Iterable[Dict]) -> None:
+    """
+    Write raw model records in the format implied by the file path.
+    
+    Args:
+        path: Raw snapshot file path
+        records: Raw model dictionaries
+    """
+    if path.endswith('.sqlite'):
+        RawModelStore.write_snapshot(path, records)
+        return
+    if path.endswith('.partitions'):
+        PartitionedRawStore(path).write_snapshot(records)
+        return
+    
+    with open_raw_file(path, 'w') as f:
+        if '.jsonl' not in os.path.basename(path):
+            json_codec.dump(list(records), f, pretty=True)
+            return
+        for record in records:
+            f.write(json_codec.dumps(record) + '\n')
+
+
+class RawModelStore:
+    """
+    SQLite store for raw model records.
+    
+    Repos and their sibling files live in two tables, with repos indexed on
+    id, created_at, likes and downloads, so questions such as "top N by likes"
+    or "repos changed since a date" are indexed queries instead of full scans
+    of a JSON list. Records read back are identical to the dictionaries written.
+    
+    The store also behaves like a read-only mapping from model id to record
+    (get, in, len), which incremental and bulk downloads use for lookups.
+    """
+    
+    # Record keys stored in dedicated columns; anything else goes to `extra`
+    REPO_COLUMNS = {
+        'id': 'id',
+        'downloads': 'downloads',
+        'likes': 'likes',
+        'tags': 'tags',
+        'cardData': 'card_data',
+        'lastModified': 'last_modified',
+        'created_at': 'created_at',
+        'sources': 'sources'
+    }
+    JSON_COLUMNS = ('tags', 'card_data', 'sources')
+    SIBLING_COLUMNS = ('rfilename', 'size')
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS repos (
+            rowid INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            downloads INTEGER,
+            likes INTEGER,
+            tags TEXT,
+            card_data TEXT,
+            last_modified TEXT,
+            created_at TEXT,
+            sources TEXT,
+            extra TEXT
+        );
+        CREATE TABLE IF NOT EXISTS siblings (
+            repo_rowid INTEGER NOT NULL REFERENCES repos(rowid),
+            position INTEGER NOT NULL,
+            rfilename TEXT NOT NULL,
+            size INTEGER,
+            is_gguf INTEGER NOT NULL,
+            extra TEXT,
+            PRIMARY KEY (repo_rowid, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_repos_created_at ON repos(created_at);
+        CREATE INDEX IF NOT EXISTS idx_repos_likes ON repos(likes);
+        CREATE INDEX IF NOT EXISTS idx_repos_downloads ON repos(downloads);
+        CREATE INDEX IF NOT EXISTS idx_siblings_gguf ON siblings(is_gguf, repo_rowid);
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) a store.
+        
+        Args:
+            path: SQLite database file path
+        """
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        # Lookups may come from listing threads, so share one connection under a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(self.SCHEMA)
+    
+    @classmethod
+    def write_snapshot(cls, path: str, records: Iterable[Dict]) -> int:
+        """
+        Replace the store at path with the given records.
+        
+        The snapshot is built in a temporary file and moved into place, so
+        readers never see a partially written store.
+        
+        Args:
+            path: SQLite database file path
+            records: Raw model dictionaries
+        
+        Returns:
+            Number of repos written
+        """
+        tmp_path = f"{path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        store = cls(tmp_path)
+        try:
+            count = store.insert(records)
+        finally:
+            store.close()
+        os.replace(tmp_path, path)
+        return count
+    
+    def insert(self, records: Iterable[Dict]) -> int:
+        """
+        Insert or replace raw model records.
+        
+        Args:
+            records: Raw model dictionaries
+        
+        Returns:
+            Number of repos written
+        """
+        count = 0
+        with self._lock, self._conn:
+            for record in records:
+                rowid = self._insert_repo(record)
+                self._conn.execute("DELETE FROM siblings WHERE repo_rowid = ?", (rowid,))
+                self._conn.executemany(
+                    "INSERT INTO siblings (repo_rowid, position, rfilename, size, is_gguf, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._sibling_row(rowid, position, sibling)
+                     for position, sibling in enumerate(record.get('siblings') or []))
+                )
+                count += 1
+        return count
+    
+    def _insert_repo(self, record: Dict) -> int:
+        """Insert or replace one repo row and return its rowid"""
+        values = {}
+        for key, column in self.REPO_COLUMNS.items():
+            value = record.get(key)
+            if column in self.JSON_COLUMNS:
+                # SQL NULL marks a missing key, JSON 'null' a stored None
+                value = json_codec.dumps(value) if key in record else None
+            values[column] = value
+        extra = {key: value for key, value in record.items()
+                 if key not in self.REPO_COLUMNS and key != 'siblings'}
+        values['extra'] = json_codec.dumps(extra) if extra else None
+        
+        columns = ', '.join(values)
+        placeholders = ', '.join('?' for _ in values)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in values if column != 'id')
+        cursor = self._conn.execute(
+            f"INSERT INTO repos ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates} RETURNING rowid",
+            tuple(values.values())
+        )
+        return cursor.fetchone()[0]
+    
+    def _sibling_row(self, rowid: int, position: int, sibling: Dict) -> Tuple:
+        """Build the siblings table row for one sibling dictionary"""
+        rfilename = sibling.get('rfilename', '')
+        extra = {key: value for key, value in sibling.items() if key not in self.SIBLING_COLUMNS}
+        return (
+            rowid, position, rfilename, sibling.get('size'),
+            int(rfilename.lower().endswith('.gguf')),
+            json_codec.dumps(extra) if extra else None
+        )
+    
+    def _build_record(self, row: sqlite3.Row, siblings: List[Dict]) -> Dict:
+        """Rebuild a raw model dictionary from a repo row and its siblings"""
+        record = {}
+        for key, column in self.REPO_COLUMNS.items():
+            value = row[column]
+            if column in self.JSON_COLUMNS:
+                if value is None:
+                    continue
+                value = json_codec.loads(value)
+            record[key] = value
+        record['siblings'] = siblings
+        if row['extra']:
+            record.update(json_codec.loads(row['extra']))
+        return record
+    
+    @staticmethod
+    def _build_sibling(row: sqlite3.Row) -> Dict:
+        """Rebuild a sibling dictionary from a siblings row"""
+        sibling = {'rfilename': row['rfilename'], 'size': row['size']}
+        if row['extra']:
+            sibling.update(json_codec.loads(row['extra']))
+        return sibling
+    
+    def iter_records(self, where: str = '', params: Tuple = ()) -> Iterator[Dict]:
+        """
+        Stream raw model records in insertion order through cursors.
+        
+        Repos and siblings are read by two cursors ordered on the repo rowid
+        and merged, so only one repo is held in memory at a time.
+        
+        Args:
+            where: Optional SQL condition on the repos table, e.g. "likes >= ?"
+            params: Parameters for the condition
+        
+        Yields:
+            Raw model dictionaries
+        """
+        condition = f"WHERE {where}" if where else ""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            repos = conn.execute(f"SELECT * FROM repos {condition} ORDER BY rowid", params)
+            siblings = conn.execute(
+                f"SELECT * FROM siblings WHERE repo_rowid IN (SELECT rowid FROM repos {condition}) "
+                f"ORDER BY repo_rowid, position",
+                params
+            )
+            sibling = siblings.fetchone()
+            for row in repos:
+                repo_siblings = []
+                while sibling is not None and sibling['repo_rowid'] == row['rowid']:
+                    repo_siblings.append(self._build_sibling(sibling))
+                    sibling = siblings.fetchone()
+                yield self._build_record(row, repo_siblings)
+        finally:
+            conn.close()
+    
+    def get(self, repo_id: str, default=None) -> Optional[Dict]:
+        """
+        Look up one raw record by model id.
+        
+        Args:
+            repo_id: Model repository id
+            default: Value returned when the id is not stored
+        
+        Returns:
+            Raw model dictionary, default if not found
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM repos WHERE id = ?", (repo_id,)).fetchone()
+            if row is None:
+                return default
+            siblings = self._conn.execute(
+                "SELECT * FROM siblings WHERE repo_rowid = ? ORDER BY position", (row['rowid'],)
+            ).fetchall()
+            return self._build_record(row, [self._build_sibling(sibling) for sibling in siblings])
+    
+    def __contains__(self, repo_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM repos WHERE id = ?", (repo_id,)).fetchone() is not None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM repos").fetchone()[0]
+    
+    def close(self) -> None:
+        """Close the store's connection"""
+        self._conn.close()
+
+
+class PartitionedRawStore:
+    """
+    Raw snapshot split into one JSON Lines partition per created_at month.
+    
+    Records are sorted by id inside a partition, so a month whose repos did
+    not change serializes to the same bytes on every download. Partition
+    files are named after their content hash and a manifest maps each month
+    to its file, record count and sha256; unchanged partitions are not
+    rewritten, and the manifest is replaced atomically before unreferenced
+    files are removed, so an interrupted write leaves the previous snapshot
+    intact. The process phase uses the hashes to tell dirty partitions from
+    ones whose extraction results it can reuse.
+    """
+    
+    MANIFEST_FILE = 'manifest.json'
+    UNKNOWN_PARTITION = 'unknown'  # Records without a usable created_at
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Directory holding the partitions and manifest
+        """
+        self.path = path
+        self.manifest_path = os.path.join(path, self.MANIFEST_FILE)
+        self.logger = logging.getLogger(__name__)
+    
+    @classmethod
+    def partition_name(cls, record: Dict) -> str:
+        """Partition of a record: its created_at month as YYYY-MM"""
+        created_at = record.get('created_at')
+        if isinstance(created_at, str) and len(created_at) >= 7 and created_at[4] == '-':
+            return created_at[:7]
+        return cls.UNKNOWN_PARTITION
+    
+    def load_manifest(self) -> Dict[str, Dict]:
+        """
+        Read the partition manifest.
+        
+        Returns:
+            Mapping from partition name to {'file', 'count', 'sha256'}, empty if absent
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json_codec.load(f).get('partitions', {})
+        except FileNotFoundError:
+            return {}
+    
+    def write_snapshot(self, records: Iterable[Dict]) -> Tuple[int, int]:
+        """
+        Replace the snapshot, rewriting only partitions whose content changed.
+        
+        Args:
+            records: Raw model dictionaries
+        
+        Returns:
+            (partitions written, total partitions)
+        """
+        groups = {}
+        for record in records:
+            groups.setdefault(self.partition_name(record), []).append(record)
+        
+        os.makedirs(self.path, exist_ok=True)
+        partitions = {}
+        written = 0
+        
+        for name in sorted(groups):
+            entries = sorted(groups[name], key=lambda record: record.get('id') or '')
+            data = ''.join(json_codec.dumps(record) + '\n' for record in entries).encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()
+            filename = f"{name}.{digest[:16]}.jsonl"
+            partitions[name] = {'file': filename, 'count': len(entries), 'sha256': digest}
+            
+            path = os.path.join(self.path, filename)
+            if os.path.exists(path):
+                continue  # Content-named, so an existing file already holds these bytes
+            with open(f"{path}.tmp", 'wb') as f:
+                f.write(data)
+            os.replace(f"{path}.tmp", path)
+            written += 1
+        
+        with open(f"{self.manifest_path}.tmp", 'w', encoding='utf-8') as f:
+            json_codec.dump({'partitions': partitions}, f, pretty=True)
+        os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+        
+        referenced = {partition['file'] for partition in partitions.values()}
+        for filename in os.listdir(self.path):
+            if filename.endswith('.jsonl') and filename not in referenced:
+                os.remove(os.path.join(self.path, filename))
+        
+        self.logger.info(f"Raw partitions: {written} of {len(partitions)} rewritten, "
+                         f"{len(partitions) - written} unchanged")
+        return written, len(partitions)
+    
+    def iter_partition(self, name: str, manifest: Optional[Dict[str, Dict]] = None) -> Iterator[Dict]:
+        """
+        Stream the records of one partition.
+        
+        Args:
+            name: Partition name (YYYY-MM or 'unknown')
+            manifest: Already loaded manifest, read from disk if None
+        """
+        manifest = manifest if manifest is not None else self.load_manifest()
+        with open(os.path.join(self.path, manifest[name]['file']), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json_codec.loads(line)
+    
+    def iter_records(self) -> Iterator[Dict]:
+        """Stream all records, partition by partition in month order"""
+        manifest = self.load_manifest()
+        for name in sorted(manifest):
+            yield from self.iter_partition(name, manifest)
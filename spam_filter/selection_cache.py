@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Memoization of quantization variant selection across groups and runs
+"""
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import json_codec
+
+
+class SelectionCache:
+    """
+    LRU cache of variant selection results keyed by group content
+    
+    Variant selection depends only on each variant's (fileSize, downloadCount,
+    quantFormat, uploader) in group order and on the configuration, so a key
+    hashed from those tuples plus a configuration fingerprint identifies the
+    result. Results are stored as the positions of the selected variants in
+    the group, which keeps entries small and independent of the dictionaries
+    themselves. When a cache file is given, entries built with the same
+    fingerprint are loaded from it and written back by save().
+    """
+    
+    def __init__(self, fingerprint: str, max_entries: int = 4096, cache_file: Optional[str] = None):
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.cache_file = cache_file
+        self.entries: 'OrderedDict[str, List[int]]' = OrderedDict()
+        self.added: Dict[str, List[int]] = {}  # Entries computed since the last save()
+        self.logger = logging.getLogger(__name__)
+        
+        if cache_file:
+            self.load()
+    
+    def key(self, signature: Sequence[Tuple]) -> str:
+        """
+        Compute the cache key of a group
+        
+        Args:
+            signature: (fileSize, downloadCount, quantFormat, uploader) per variant, in group order
+        
+        Returns:
+            Hex key covering the signature and the configuration fingerprint
+        """
+        digest = hashlib.sha256(self.fingerprint.encode('utf-8'))
+        digest.update(json_codec.dumps(signature).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[List[int]]:
+        """Return the selected positions for a key, None on a miss"""
+        indices = self.entries.get(key)
+        if indices is not None:
+            self.entries.move_to_end(key)
+        return indices
+    
+    def put(self, key: str, indices: List[int]) -> None:
+        """Store the selected positions for a key, evicting the least recently used entries"""
+        self.entries[key] = indices
+        self.entries.move_to_end(key)
+        self.added[key] = indices
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def load(self) -> None:
+        """Load entries from the cache file, ignoring it if missing, unreadable or stale"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json_codec.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable selection cache {self.cache_file}: {e}")
+            return
+        
+        if data.get('fingerprint') != self.fingerprint:
+            self.logger.info("Selection cache was built with a different configuration or engine version, starting empty")
+            return
+        
+        for key, indices in list(data.get('entries', {}).items())[-self.max_entries:]:
+            self.entries[key] = indices
+        self.logger.info(f"Loaded {len(self.entries)} cached variant selections from {self.cache_file}")
+    
+    def save(self) -> None:
+        """Write the entries to the cache file atomically, if any were added"""
+        if not self.cache_file or not self.added:
+            return
+        
+        temp_path = f"{self.cache_file}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json_codec.dump({'fingerprint': self.fingerprint, 'entries': dict(self.entries)}, f)
+            os.replace(temp_path, self.cache_file)
+            self.added = {}
+        except OSError as e:
+            self.logger.warning(f"Could not save selection cache: {e}")
+    
+    def __len__(self) -> int:
+        return len(self.entries)
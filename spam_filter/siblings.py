@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compact storage for the sibling file lists of raw model data
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class SiblingTable:
+    """
+    Memory-compact replacement for a repo's list of sibling dictionaries
+    
+    Filenames are interned (so names repeated across repos such as README.md
+    are stored once), sizes live in a packed array('q'), and the positions of
+    .gguf files are computed once when the table is built, together with
+    their LFS sha256 when the raw data has one. Iterating the table still
+    yields {'rfilename', 'size'} dictionaries (plus 'sha256' where known) for
+    callers that expect the raw list.
+    """
+    
+    __slots__ = ('filenames', 'sizes', 'gguf_index', 'gguf_sha256')
+    
+    UNKNOWN_SIZE = -1  # Stored for siblings whose size is None
+    
+    def __init__(self, filenames: Tuple[str, ...], sizes: array, gguf_index: array,
+                 gguf_sha256: Tuple[Optional[str], ...] = ()):
+        self.filenames = filenames
+        self.sizes = sizes
+        self.gguf_index = gguf_index
+        self.gguf_sha256 = gguf_sha256  # Aligned with gguf_index, empty if no hash is known
+    
+    @classmethod
+    def from_siblings(cls, siblings: Iterable[Dict]) -> 'SiblingTable':
+        """
+        Build a table from raw sibling dictionaries, touching each filename once
+        
+        Args:
+            siblings: Raw sibling dictionaries with 'rfilename' and 'size'
+        
+        Returns:
+            SiblingTable with the GGUF positions precomputed
+        """
+        filenames = []
+        sizes = array('q')
+        gguf_index = array('l')
+        gguf_sha256 = []
+        
+        for position, sibling in enumerate(siblings or ()):
+            filename = sys.intern(sibling.get('rfilename', ''))
+            size = sibling.get('size', 0)
+            filenames.append(filename)
+            sizes.append(cls.UNKNOWN_SIZE if size is None else size)
+            if filename.lower().endswith('.gguf'):
+                gguf_index.append(position)
+                gguf_sha256.append(sibling.get('sha256'))
+        
+        return cls(tuple(filenames), sizes, gguf_index, tuple(gguf_sha256) if any(gguf_sha256) else ())
+    
+    @classmethod
+    def of(cls, siblings) -> 'SiblingTable':
+        """Return siblings as a table, building one if given raw dictionaries"""
+        if isinstance(siblings, cls):
+            return siblings
+        return cls.from_siblings(siblings)
+    
+    @property
+    def has_gguf(self) -> bool:
+        """Check if any sibling is a .gguf file"""
+        return len(self.gguf_index) > 0
+    
+    def size_at(self, position: int) -> Optional[int]:
+        """Get the size of the sibling at a position, None if unknown"""
+        size = self.sizes[position]
+        return None if size == self.UNKNOWN_SIZE else size
+    
+    def gguf_files(self) -> Iterator[Tuple[str, Optional[int], Optional[str]]]:
+        """Yield (filename, size, sha256) for each .gguf sibling, sha256 None if unknown"""
+        for i, position in enumerate(self.gguf_index):
+            sha256 = self.gguf_sha256[i] if self.gguf_sha256 else None
+            yield self.filenames[position], self.size_at(position), sha256
+    
+    def __len__(self) -> int:
+        return len(self.filenames)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        hashes = dict(zip(self.gguf_index, self.gguf_sha256))
+        for position, filename in enumerate(self.filenames):
+            sibling = {'rfilename': filename, 'size': self.size_at(position)}
+            if hashes.get(position):
+                sibling['sha256'] = hashes[position]
+            yield sibling
+    
+    def to_list(self) -> List[Dict]:
+        """Convert back to raw sibling dictionaries"""
+        return list(self)
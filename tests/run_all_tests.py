@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Comprehensive test runner for the spam filter system
+Comprehensive test runner for the GGUF fetcher and spam filter system
 """
 
 import os
@@ -14,19 +14,15 @@ def run_test_suite():
     """Run the complete test suite and generate a comprehensive report"""
     
     print("=" * 80)
-    print("SPAM FILTER COMPREHENSIVE TEST SUITE")
+    print("GGUF FETCHER AND SPAM FILTER TEST SUITE")
     print("=" * 80)
     
-    # Test modules to run
+    # Test modules to run: every tests/test_*.py file
+    tests_dir = os.path.dirname(os.path.abspath(__file__))
     test_modules = [
-        'tests.test_config',
-        'tests.test_classifier', 
-        'tests.test_quantization_selector',
-        'tests.test_backup_manager',
-        'tests.test_engine',
-        'tests.test_integration',
-        'tests.test_validation',
-        'tests.test_performance'
+        f"tests.{filename[:-3]}"
+        for filename in sorted(os.listdir(tests_dir))
+        if filename.startswith('test_') and filename.endswith('.py')
     ]
     
     # Results tracking
@@ -145,11 +141,14 @@ def run_test_suite():
     print(f"{'-' * 60}")
     
     categories = {
-        'Unit Tests': ['test_config', 'test_classifier', 'test_quantization_selector', 'test_backup_manager'],
-        'Integration Tests': ['test_engine', 'test_integration'],
-        'Validation Tests': ['test_validation'],
-        'Performance Tests': ['test_performance']
+        'Unit Tests': ['test_backup_manager', 'test_json_codec'],
+        'Spam Filter Tests': ['test_engine', 'test_selection_cache', 'test_siblings'],
+        'Fetcher Tests': ['test_fetcher', 'test_output_delta']
     }
+    categorized = {m for modules in categories.values() for m in modules}
+    uncategorized = [m.split('.')[-1] for m in test_modules if m.split('.')[-1] not in categorized]
+    if uncategorized:
+        categories['Other Tests'] = uncategorized
     
     for category, modules in categories.items():
         category_tests = sum(results.get(f'tests.{m}', {}).get('tests_run', 0) for m in modules)
@@ -160,47 +159,11 @@ def run_test_suite():
         
         print(f"{category}: {category_passed}/{category_tests} passed ({category_success:.1f}%)")
     
-    # Requirements coverage analysis
-    print(f"\n{'-' * 60}")
-    print("REQUIREMENTS COVERAGE")
-    print(f"{'-' * 60}")
-    
-    validation_result = results.get('tests.test_validation', {})
-    if validation_result.get('success', False):
-        print("✓ All requirements validation tests passed")
-        print("✓ Requirement 1.1: Finetuned model removal")
-        print("✓ Requirement 1.2: Full precision preservation")
-        print("✓ Requirement 1.3: Significant size drop filtering")
-        print("✓ Requirement 1.4: Trusted uploader preference")
-        print("✓ Requirement 1.5: Low download filtering")
-        print("✓ Requirement 2.1: Backup capability")
-        print("✓ Requirement 2.3: Detailed logging")
-        print("✓ Requirement 2.4: Summary reporting")
-        print("✓ Requirement 4.1: Small model removal")
-        print("✓ Requirement 4.2: Small group removal")
-    else:
-        print("⚠ Some requirements validation tests failed")
-    
-    # Performance analysis
-    print(f"\n{'-' * 60}")
-    print("PERFORMANCE ANALYSIS")
-    print(f"{'-' * 60}")
-    
-    performance_result = results.get('tests.test_performance', {})
-    if performance_result.get('success', False):
-        print("✓ All performance tests passed")
-        print("✓ Processing time scales appropriately")
-        print("✓ Memory usage is reasonable")
-        print("✓ Component performance is balanced")
-        print("✓ Concurrent processing is safe")
-    else:
-        print("⚠ Some performance tests failed or were skipped")
-    
     # Final verdict
     print(f"\n{'=' * 80}")
     overall_success = total_failures == 0 and total_errors == 0
     if overall_success:
-        print("🎉 ALL TESTS PASSED! The spam filter system is ready for deployment.")
+        print("🎉 ALL TESTS PASSED! The fetcher and spam filter system is ready for deployment.")
     else:
         print("❌ SOME TESTS FAILED. Please review the failures above.")
     print(f"{'=' * 80}")
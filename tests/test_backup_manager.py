@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for backup creation, listing, cleanup and restoration
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spam_filter.backup_manager import BackupManager
+from spam_filter.raw_store import iter_raw_file, write_raw_file
+
+RECORDS = [
+    {'id': 'org/Model-A-GGUF', 'downloads': 10, 'likes': 1, 'created_at': '2024-01-05T00:00:00Z',
+     'siblings': [{'rfilename': 'model-a.Q4_K_M.gguf', 'size': 4096}]},
+    {'id': 'org/Model-B-GGUF', 'downloads': 20, 'likes': 2, 'created_at': '2024-02-05T00:00:00Z',
+     'siblings': [{'rfilename': 'model-b.Q8_0.gguf', 'size': 8192}]},
+    {'id': 'org/Model-C-GGUF', 'downloads': 30, 'likes': 3, 'created_at': '2024-02-09T00:00:00Z',
+     'siblings': []},
+]
+
+FORMATS = ('json', 'jsonl', 'jsonl.gz', 'sqlite', 'partitions')
+
+
+class TestBackupFormats(unittest.TestCase):
+    """Backups of every raw snapshot format are listed, validated, cleaned up and restored"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = BackupManager(os.path.join(self.temp_dir, 'backups'))
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def snapshot(self, raw_format, records=RECORDS, name='raw_models_data'):
+        path = os.path.join(self.temp_dir, f"{name}.{raw_format}")
+        write_raw_file(path, records)
+        return path
+    
+    def backup(self, raw_format, records=RECORDS):
+        return self.manager.create_file_backup(self.snapshot(raw_format, records))
+    
+    def test_list_backups_covers_every_format(self):
+        for raw_format in FORMATS:
+            self.backup(raw_format)
+        
+        backups = self.manager.list_backups()
+        extensions = sorted(backup['filename'].partition('.')[2] for backup in backups)
+        self.assertEqual(extensions, sorted(FORMATS))
+        for backup in backups:
+            with self.subTest(backup=backup['filename']):
+                self.assertEqual(backup['entry_count'], len(RECORDS))
+                self.assertGreater(backup['size_bytes'], 0)
+    
+    def test_cleanup_removes_files_and_directories(self):
+        for raw_format in FORMATS:
+            self.backup(raw_format)
+        
+        deleted = self.manager.cleanup_old_backups(keep_count=1)
+        self.assertEqual(deleted, len(FORMATS) - 1)
+        self.assertEqual(len(os.listdir(self.manager.backup_dir)), 1)
+    
+    def test_restore_round_trips_every_format(self):
+        for raw_format in FORMATS:
+            with self.subTest(raw_format=raw_format):
+                backup_path = self.backup(raw_format)
+                target = self.snapshot(raw_format, RECORDS[:1], name='restored')
+                
+                self.assertTrue(self.manager.restore_backup(backup_path, target))
+                self.assertEqual(list(iter_raw_file(target)), list(iter_raw_file(backup_path)))
+                self.assertEqual(len(list(iter_raw_file(target))), len(RECORDS))
+    
+    def test_restore_rejects_corrupt_backup(self):
+        backup_path = self.backup('jsonl.gz')
+        with open(backup_path, 'r+b') as f:
+            f.truncate(os.path.getsize(backup_path) // 2)
+        target = self.snapshot('jsonl.gz', RECORDS[:1], name='restored')
+        
+        self.assertFalse(self.manager.restore_backup(backup_path, target))
+        self.assertEqual(list(iter_raw_file(target)), RECORDS[:1])
+        self.assertFalse(self.manager.get_backup_info(backup_path)['valid'])
+    
+    def test_restore_rejects_format_mismatch(self):
+        backup_path = self.backup('sqlite')
+        target = self.snapshot('json', RECORDS[:1], name='restored')
+        
+        self.assertFalse(self.manager.restore_backup(backup_path, target))
+        self.assertEqual(list(iter_raw_file(target)), RECORDS[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Tests for the spam filter engine pipeline
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spam_filter.config import FilterConfig
+from spam_filter.engine import ProcessingReport, SpamFilterEngine
+
+GB = 1024 * 1024 * 1024
+
+
+def raw_model(model_id, files, downloads=1000, likes=10):
+    """Build a raw Hugging Face record with one sibling per (filename, size, sha256)"""
+    return {
+        'id': model_id,
+        'downloads': downloads,
+        'likes': likes,
+        'created_at': '2024-01-01T00:00:00Z',
+        'siblings': [{'rfilename': name, 'size': size, 'sha256': sha256} for name, size, sha256 in files]
+    }
+
+
+def run_modes(raw_models):
+    """Filter the same records step by step, fused and per repo, returning each result"""
+    results = {}
+    for mode in ('steps', 'fused'):
+        engine = SpamFilterEngine(FilterConfig(detailed_logging=False, fused_pipeline=(mode == 'fused'),
+                                               selection_cache_size=0))
+        results[mode] = engine.filter_models(iter(raw_models))
+    
+    engine = SpamFilterEngine(FilterConfig(detailed_logging=False, selection_cache_size=0))
+    report, errors = ProcessingReport(), []
+    prefiltered = [model for raw in raw_models for model in engine.prefilter_raw_model(raw, report, errors)]
+    results['pipeline'] = engine.finalize_models(prefiltered, report, errors, time.time())
+    return results
+
+
+class TestDuplicateCollapse(unittest.TestCase):
+    """Mirrored copies of one GGUF blob are collapsed after the per-entry filters"""
+    
+    def test_blob_survives_when_best_copy_is_filtered(self):
+        # The trusted copy ranks first but its repo name classifies as a finetune
+        raw_models = [
+            raw_model('TheBloke/Llama-2-7B-Chat-GGUF', [('llama-2-7b.Q4_K_M.gguf', 4 * GB, 'a' * 64)],
+                      downloads=50000),
+            raw_model('mirror/Llama-2-7B-GGUF', [('llama-2-7b.Q4_K_M.gguf', 4 * GB, 'a' * 64)], downloads=10),
+        ]
+        
+        for mode, result in run_modes(raw_models).items():
+            with self.subTest(mode=mode):
+                links = [model['directDownloadLink'] for model in result.filtered_models]
+                self.assertEqual(links, ['https://huggingface.co/mirror/Llama-2-7B-GGUF/resolve/main/llama-2-7b.Q4_K_M.gguf'])
+                self.assertEqual(result.processing_report.finetuned_removed, 1)
+                self.assertEqual(result.processing_report.duplicates_removed, 0)
+    
+    def test_best_ranked_copy_is_kept(self):
+        raw_models = [
+            raw_model('mirror/Llama-2-7B-GGUF', [('llama-2-7b.Q4_K_M.gguf', 4 * GB, 'b' * 64)], downloads=10),
+            raw_model('TheBloke/Llama-2-7B-GGUF', [('llama-2-7b.Q4_K_M.gguf', 4 * GB, 'b' * 64)], downloads=5),
+            raw_model('other/Llama-2-7B-GGUF', [('llama-2-7b.Q4_K_M.gguf', 4 * GB, 'b' * 64)], downloads=900),
+        ]
+        
+        results = run_modes(raw_models)
+        for mode, result in results.items():
+            with self.subTest(mode=mode):
+                links = [model['directDownloadLink'] for model in result.filtered_models]
+                self.assertEqual(links, ['https://huggingface.co/TheBloke/Llama-2-7B-GGUF/resolve/main/llama-2-7b.Q4_K_M.gguf'])
+                self.assertEqual(result.processing_report.duplicates_removed, 2)
+                self.assertEqual(result.processing_report.duplicate_blobs, 1)
+    
+    def test_modes_agree(self):
+        raw_models = [
+            raw_model('TheBloke/Llama-2-7B-Chat-GGUF', [
+                ('llama-2-7b-chat.Q4_K_M.gguf', 4 * GB, 'c' * 64),
+                ('llama-2-7b-chat.Q8_0.gguf', 7 * GB, 'd' * 64),
+            ], downloads=50000),
+            raw_model('mirror/Llama-2-7B-GGUF', [
+                ('llama-2-7b-chat.Q4_K_M.gguf', 4 * GB, 'c' * 64),
+                ('tiny.Q2_K.gguf', 1024, 'e' * 64),
+            ]),
+            raw_model('mistral/Mistral-7B-GGUF', [('mistral-7b.Q5_K_M.gguf', 5 * GB, None)]),
+        ]
+        
+        results = run_modes(raw_models)
+        expected = results['steps']
+        for mode, result in results.items():
+            with self.subTest(mode=mode):
+                self.assertEqual(result.filtered_models, expected.filtered_models)
+                # The content hash only identifies mirrors and is not part of the output entries
+                self.assertFalse(any('sha256' in model for model in result.filtered_models))
+                for counter in ('total_processed', 'small_models_removed', 'finetuned_removed',
+                                'duplicates_removed', 'duplicate_blobs'):
+                    self.assertEqual(getattr(result.processing_report, counter),
+                                     getattr(expected.processing_report, counter), counter)
+
+
+class TestRecordOrder(unittest.TestCase):
+    """Results do not depend on the order raw records arrive in"""
+    
+    def test_equal_size_variants_resolve_the_same_way(self):
+        raw_models = [
+            raw_model('alpha/Llama-2-7B-GGUF', [('llama-2-7b.Q4_K_M.gguf', 4 * GB, None)]),
+            raw_model('beta/Llama-2-7B-GGUF', [('llama-2-7b.Q4_K_M.gguf', 4 * GB, None)]),
+            raw_model('gamma/Llama-2-7B-GGUF', [('llama-2-7b.f16.gguf', 13 * GB, None),
+                                                ('llama-2-7b.Q8_0.gguf', 7 * GB, None)]),
+            raw_model('delta/Llama-2-7B-GGUF', [('llama-2-7b.f16.gguf', 13 * GB, None)]),
+        ]
+        
+        forward = run_modes(raw_models)
+        backward = run_modes(raw_models[::-1])
+        for mode in forward:
+            with self.subTest(mode=mode):
+                links = sorted(model['directDownloadLink'] for model in forward[mode].filtered_models)
+                reversed_links = sorted(model['directDownloadLink'] for model in backward[mode].filtered_models)
+                self.assertEqual(links, reversed_links)
+                self.assertIn('https://huggingface.co/alpha/Llama-2-7B-GGUF/resolve/main/llama-2-7b.Q4_K_M.gguf', links)
+                self.assertIn('https://huggingface.co/delta/Llama-2-7B-GGUF/resolve/main/llama-2-7b.f16.gguf', links)
+
+
+
+class TestIncrementalGroups(unittest.TestCase):
+    """Incremental runs only re-evaluate changed groups and splice in the rest"""
+    
+    NAMES = ('Llama', 'Mistral', 'Qwen', 'Gemma')
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+    
+    def raw_models(self, downloads):
+        return [
+            raw_model(f'org/{name}-7B-GGUF', [(f'{name.lower()}-7b.Q8_0.gguf', 7 * GB, None),
+                                              (f'{name.lower()}-7b.Q4_K_M.gguf', 4 * GB, None)],
+                      downloads=downloads.get(name, 1000))
+            for name in self.NAMES
+        ]
+    
+    def run_incremental(self, raw_models, **config):
+        """Filter with group state in the temporary directory, returning the result and re-evaluated groups"""
+        engine = SpamFilterEngine(FilterConfig(detailed_logging=False, incremental_groups=True,
+                                               selection_cache_size=0, **config))
+        engine.GROUP_STATE_FILE = os.path.join(self.temp_dir.name, 'group_state.json')
+        evaluated = []
+        process_groups = engine._process_groups
+        
+        def recording_process_groups(batch):
+            evaluated.extend(group_name for group_name, _ in batch)
+            return process_groups(batch)
+        
+        engine._process_groups = recording_process_groups
+        return engine.filter_models(iter(raw_models)), evaluated
+    
+    def test_only_changed_groups_are_evaluated(self):
+        _, evaluated = self.run_incremental(self.raw_models({}))
+        self.assertEqual(len(evaluated), len(self.NAMES))
+        
+        changed = self.raw_models({'Mistral': 5000})
+        result, evaluated = self.run_incremental(changed)
+        self.assertEqual(evaluated, ['mistral 7b'])
+        
+        full = SpamFilterEngine(FilterConfig(detailed_logging=False, selection_cache_size=0)).filter_models(iter(changed))
+        self.assertEqual(result.filtered_models, full.filtered_models)
+        self.assertEqual(result.processing_report.quantization_variants_removed,
+                         full.processing_report.quantization_variants_removed)
+        
+        _, evaluated = self.run_incremental(changed)
+        self.assertEqual(evaluated, [])
+    
+    def test_config_change_discards_state(self):
+        raw_models = self.raw_models({})
+        self.run_incremental(raw_models)
+        
+        _, evaluated = self.run_incremental(raw_models, size_drop_threshold=0.5)
+        self.assertEqual(len(evaluated), len(self.NAMES))
+        
+        # Execution settings do not change what is computed, so they keep the state
+        _, evaluated = self.run_incremental(raw_models, size_drop_threshold=0.5, fused_pipeline=True)
+        self.assertEqual(evaluated, [])
+
+
+class TestStageMetrics(unittest.TestCase):
+    """Each pipeline stage is measured, reported and exported"""
+    
+    RAW_MODELS = [
+        raw_model('org/Llama-2-7B-GGUF', [('llama-2-7b.Q8_0.gguf', 7 * GB, None),
+                                          ('llama-2-7b.Q4_K_M.gguf', 4 * GB, None),
+                                          ('tiny.Q2_K.gguf', 1024, None)]),
+        raw_model('org/Llama-2-7B-Chat-GGUF', [('llama-2-7b-chat.Q4_K_M.gguf', 4 * GB, None)]),
+        raw_model('org/Mistral-7B-GGUF', [('mistral-7b.Q4_K_M.gguf', 4 * GB, None)]),
+    ]
+    
+    def run_filter(self, **config):
+        engine = SpamFilterEngine(FilterConfig(detailed_logging=False, selection_cache_size=0, **config))
+        return engine, engine.filter_models(iter(self.RAW_MODELS))
+    
+    def test_stage_names_and_counts(self):
+        _, result = self.run_filter()
+        counts = {stage: (metrics['items_in'], metrics['items_out'])
+                  for stage, metrics in result.processing_report.stage_metrics.items()}
+        self.assertEqual(counts, {
+            'extract': (3, 5),
+            'size_filter': (5, 4),
+            'finetune_filter': (4, 3),
+            'deduplicate': (3, 3),
+            'group': (3, 3),
+            'select_variants': (3, 3),
+            'hardware': (3, 3),
+        })
+        self.assertEqual(list(counts), ['extract', 'size_filter', 'finetune_filter', 'deduplicate', 'group',
+                                        'select_variants', 'hardware'])
+        
+        _, fused = self.run_filter(fused_pipeline=True)
+        self.assertEqual(list(fused.processing_report.stage_metrics),
+                         ['extract_filter_group', 'select_variants', 'hardware'])
+        self.assertEqual(fused.processing_report.stage_metrics['extract_filter_group']['items_in'], 3)
+        self.assertEqual(fused.processing_report.stage_metrics['extract_filter_group']['items_out'], 3)
+    
+    def test_repeated_stage_accumulates(self):
+        report = ProcessingReport()
+        report.add_stage_metrics('extract', 1.0, 0.5, 10, 8)
+        report.add_stage_metrics('extract', 1.0, 0.5, 30, 20, peak_memory_bytes=2048)
+        self.assertEqual(report.stage_metrics['extract'], {
+            'wall_seconds': 2.0,
+            'cpu_seconds': 1.0,
+            'items_in': 40,
+            'items_out': 28,
+            'items_per_second': 20.0,
+            'peak_memory_bytes': 2048
+        })
+    
+    def test_report_lists_stages(self):
+        engine, result = self.run_filter()
+        lines = engine.generate_report(result).splitlines()
+        
+        start = lines.index("=== Stage Performance ===")
+        self.assertTrue(lines[start + 1].startswith("Stage "))
+        rows = lines[start + 2:start + 2 + len(result.processing_report.stage_metrics)]
+        self.assertEqual([row.split('|')[0].strip() for row in rows], list(result.processing_report.stage_metrics))
+        self.assertEqual(rows[0].split('|')[3].strip(), '3')
+        self.assertEqual(rows[0].split('|')[-1].strip(), '-')  # No peak memory without trace_memory
+    
+    def test_metrics_export(self):
+        engine, result = self.run_filter()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'metrics', 'filter_metrics.json')
+            self.assertTrue(engine.write_metrics(result, file_path))
+            with open(file_path, 'r', encoding='utf-8') as f:
+                metrics = json.load(f)
+        
+        self.assertEqual(set(metrics), {'generated_at', 'processing_time_seconds', 'total_processed', 'total_kept',
+                                        'fused_pipeline', 'parallel_workers', 'incremental_groups', 'trace_memory',
+                                        'selection_cache_hits', 'selection_cache_misses', 'stages'})
+        self.assertEqual(metrics['total_processed'], 5)
+        self.assertEqual(metrics['total_kept'], 3)
+        self.assertEqual(list(metrics['stages']), list(result.processing_report.stage_metrics))
+        for stage in metrics['stages'].values():
+            self.assertEqual(set(stage), {'wall_seconds', 'cpu_seconds', 'items_in', 'items_out', 'items_per_second',
+                                          'peak_memory_bytes'})
+    
+    def test_trace_memory_stops_tracing(self):
+        self.assertFalse(tracemalloc.is_tracing())
+        _, result = self.run_filter(trace_memory=True)
+        
+        self.assertFalse(tracemalloc.is_tracing())
+        for stage, metrics in result.processing_report.stage_metrics.items():
+            self.assertIsNotNone(metrics['peak_memory_bytes'], stage)
+    
+    def test_trace_memory_keeps_existing_tracing(self):
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        self.run_filter(trace_memory=True)
+        self.assertTrue(tracemalloc.is_tracing())
+
+
+class TestParallelSelectionCache(unittest.TestCase):
+    """Process-pool selection counts cache hits and misses as the serial loop does"""
+    
+    def test_counters_match_serial(self):
+        names = ('Alpaca', 'Bison', 'Camel', 'Dingo', 'Eland', 'Ferret', 'Gecko', 'Heron')
+        raw_models = [
+            raw_model(f'org/{name}-7B-GGUF', [(f'{name.lower()}-7b.Q8_0.gguf', 7 * GB, None),
+                                              (f'{name.lower()}-7b.Q4_K_M.gguf', 4 * GB, None)])
+            for name in names
+        ]
+        
+        results = {}
+        for workers in (0, 2):
+            engine = SpamFilterEngine(FilterConfig(detailed_logging=False, parallel_workers=workers))
+            result = engine.filter_models(iter(raw_models))
+            results[workers] = (result.filtered_models, result.processing_report.selection_cache_hits,
+                                result.processing_report.selection_cache_misses, list(engine.selection_cache.entries))
+        
+        self.assertEqual(results[0][2], 1)
+        self.assertGreater(results[0][1], 2)
+        self.assertEqual(results[2], results[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
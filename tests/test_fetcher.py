@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Tests for the GGUF fetcher download phase
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+from urllib.parse import unquote, urlparse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts'))
+
+from huggingface_hub import ModelInfo
+
+from gguf_fetcher import BuildCache, DownloadJournal, HubBackend, RecordingBackend, ReplayBackend, ReplayError
+from gguf_fetcher.backends import _model_info_record_path
+from simplified_gguf_fetcher import FILTER_METRICS_FILE, SimplifiedGGUFetcher
+from spam_filter.config import FilterConfig
+from spam_filter.raw_store import iter_raw_file, write_raw_file
+
+try:
+    import aiohttp
+except ImportError:  # Optional: only the threaded transport is tested
+    aiohttp = None
+
+GB = 1024 * 1024 * 1024
+LISTED_AT = '2024-05-01T00:00:00.000Z'
+TRANSPORTS = ('threads', 'async') if aiohttp is not None else ('threads',)
+
+# Files and sizes of each repository served by MemoryBackend
+REPO_FILES = {
+    'org/Alpha-7B-GGUF': {'alpha-7b.Q4_K_M.gguf': 4 * GB, 'README.md': 2048},
+    'org/Beta-7B-GGUF': {'beta-7b.Q8_0.gguf': 7 * GB, 'beta-7b.Q4_K_M.gguf': 4 * GB},
+    'org/Gamma-7B': {'README.md': 1024, 'model.safetensors': 14 * GB},
+}
+
+
+def listed_model(model_id, last_modified=LISTED_AT, downloads=100, files=None):
+    """Build a model as list_models returns it, with sibling names when files are given"""
+    payload = {'id': model_id, 'downloads': downloads, 'likes': 5, 'tags': ['gguf'],
+               'createdAt': '2024-01-01T00:00:00.000Z', 'lastModified': last_modified}
+    if files is not None:
+        payload['siblings'] = [{'rfilename': name} for name in files]
+    return ModelInfo(**payload)
+
+
+def detailed_model(model_id, files):
+    """Build a model_info(files_metadata=True) result with sizes and GGUF content hashes"""
+    siblings = []
+    for name, size in files.items():
+        sibling = {'rfilename': name, 'size': size}
+        if name.endswith('.gguf'):
+            sha256 = hashlib.sha256(f"{model_id}/{name}".encode('utf-8')).hexdigest()
+            sibling['lfs'] = {'size': size, 'sha256': sha256, 'pointerSize': 134}
+        siblings.append(sibling)
+    return ModelInfo(id=model_id, likes=5, siblings=siblings)
+
+
+class MemoryBackend(HubBackend):
+    """Backend serving REPO_FILES-like repositories from memory, recording detail calls"""
+    
+    def __init__(self, repo_files):
+        self.repo_files = repo_files
+        self.detail_calls = []
+    
+    def list_models(self, fetch_page=None, **kwargs):
+        for model_id in self.repo_files:
+            yield listed_model(model_id)
+    
+    def model_info(self, repo_id, **kwargs):
+        self.detail_calls.append(repo_id)
+        return detailed_model(repo_id, self.repo_files[repo_id])
+
+
+class StubHubServer:
+    """
+    Local Hub API playing back model_info responses recorded by RecordingBackend.
+    
+    The first throttled_requests requests are answered with HTTP 429 and a zero
+    Retry-After. The client ports seen count the connections that were opened.
+    """
+    
+    def __init__(self, record_dir, throttled_requests=0):
+        self.record_dir = record_dir
+        self.throttled_requests = throttled_requests
+        self.requests = 0
+        self.client_ports = set()
+        self.lock = threading.Lock()
+        
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive
+            
+            def do_GET(self):
+                stub.respond(self)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+    
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def respond(self, request):
+        with self.lock:
+            self.requests += 1
+            self.client_ports.add(request.client_address[1])
+            throttled = self.requests <= self.throttled_requests
+        
+        repo_id = unquote(urlparse(request.path).path[len('/api/models/'):])
+        path = _model_info_record_path(self.record_dir, repo_id)
+        body, headers = b'', {}
+        if throttled:
+            status, headers = 429, {'Retry-After': '0'}
+        elif os.path.exists(path):
+            status, headers = 200, {'Content-Type': 'application/json'}
+            with open(path, 'rb') as f:
+                body = f.read()
+        else:
+            status = 404
+        
+        request.send_response(status)
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+class FetcherTestCase(unittest.TestCase):
+    """Runs each test in a scratch working directory, where the fetcher keeps data/"""
+    
+    def setUp(self):
+        self.previous_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+    
+    def tearDown(self):
+        os.chdir(self.previous_cwd)
+        shutil.rmtree(self.temp_dir)
+    
+    def make_fetcher(self, **kwargs):
+        kwargs.setdefault('use_cache', False)
+        kwargs.setdefault('use_build_cache', False)
+        return SimplifiedGGUFetcher(**kwargs)
+    
+    def download(self, fetcher, models):
+        """Fetch details for listed models and return the saved raw records by id"""
+        fetcher._save_raw_data(models)
+        return {record['id']: record for record in iter_raw_file(fetcher.raw_data_file)}
+
+
+class TestListingMerge(FetcherTestCase):
+    """Concurrent listings are merged into one stream of unique models"""
+    
+    def test_sources_follow_listing_order(self):
+        top_done = threading.Event()
+        
+        def recent():
+            top_done.wait(5)  # The top listing reaches every repo first
+            for model_id in ('org/a', 'org/b'):
+                yield SimpleNamespace(id=model_id)
+        
+        def top():
+            yield SimpleNamespace(id='org/b')
+            yield SimpleNamespace(id='org/a')
+            top_done.set()
+        
+        fetcher = self.make_fetcher()
+        counts = {'recent': 0, 'top': 0, 'total': 0, 'unique': 0}
+        unique = [model.id for model in fetcher._iter_unique_models([('recent', recent()), ('top', top())], counts)]
+        
+        self.assertEqual(unique, ['org/b', 'org/a'])
+        self.assertEqual(fetcher.listing_sources, {'org/a': ['recent', 'top'], 'org/b': ['recent', 'top']})
+        self.assertEqual(counts, {'recent': 2, 'top': 2, 'total': 4, 'unique': 2})
+
+
+class TestRecordReplay(FetcherTestCase):
+    """Recorded listings replay exactly as far as they were read"""
+    
+    def record(self, read_count, **kwargs):
+        recorder = RecordingBackend(MemoryBackend(REPO_FILES), 'recording')
+        listing = recorder.list_models(**kwargs)
+        seen = [model.id for _, model in zip(range(read_count), listing)]
+        listing.close()
+        return seen
+    
+    def test_complete_listing_replays_to_the_end(self):
+        self.assertEqual(self.record(5, sort='downloads'), list(REPO_FILES))
+        replay = ReplayBackend('recording')
+        self.assertEqual([model.id for model in replay.list_models(sort='downloads')], list(REPO_FILES))
+        self.assertEqual(replay.misses, 0)
+    
+    def test_truncated_listing_fails_past_the_recorded_prefix(self):
+        self.assertEqual(self.record(2, sort='lastModified'), list(REPO_FILES)[:2])
+        replay = ReplayBackend('recording')
+        listing = replay.list_models(sort='lastModified')
+        self.assertEqual([next(listing).id, next(listing).id], list(REPO_FILES)[:2])
+        with self.assertRaises(ReplayError) as context:
+            next(listing)
+        self.assertEqual(context.exception.response.status_code, 404)
+        self.assertEqual(replay.misses, 1)
+
+
+class TestTransports(FetcherTestCase):
+    """Both transports save the same records from a stub Hub API and from a replay"""
+    
+    REPOS = {f'org/Model-{i}-GGUF': {f'model-{i}.Q4_K_M.gguf': (i + 1) * GB, 'README.md': 100 + i}
+             for i in range(40)}
+    
+    def setUp(self):
+        super().setUp()
+        recorder = RecordingBackend(MemoryBackend(self.REPOS), 'recording')
+        for model_id in self.REPOS:
+            recorder.model_info(model_id, files_metadata=True)
+        self.expected = self.download(self.make_fetcher(backend=MemoryBackend(self.REPOS)), self.listing())
+    
+    def listing(self):
+        return [listed_model(model_id) for model_id in self.REPOS]
+    
+    def test_stub_server(self):
+        for transport in TRANSPORTS:
+            with self.subTest(transport=transport):
+                with StubHubServer('recording', throttled_requests=3) as stub:
+                    with mock.patch.dict(os.environ, {'HF_ENDPOINT': stub.url}):
+                        fetcher = self.make_fetcher(transport=transport)
+                    records = self.download(fetcher, self.listing())
+                
+                self.assertEqual(records, self.expected)
+                self.assertEqual(stub.requests, len(self.REPOS) + 3)
+                self.assertEqual(fetcher.rate_limiter.metrics()['throttled'], 3)
+                self.assertLess(len(stub.client_ports), len(self.REPOS))  # Connections were kept alive
+    
+    def test_replay(self):
+        for transport in TRANSPORTS:
+            with self.subTest(transport=transport):
+                replay = ReplayBackend('recording', throttle_rate=0.2, retry_after=0, seed=7)
+                records = self.download(self.make_fetcher(transport=transport, backend=replay), self.listing())
+                
+                self.assertEqual(records, self.expected)
+                self.assertGreater(replay.injected_throttles, 0)
+                self.assertEqual(replay.misses, 0)
+
+    def test_listing_failure_fails_the_download(self):
+        def failing_listing():
+            yield from self.listing()[:5]
+            raise RuntimeError("listing page failed")
+        
+        for transport in TRANSPORTS:
+            with self.subTest(transport=transport):
+                fetcher = self.make_fetcher(transport=transport, backend=MemoryBackend(self.REPOS))
+                if os.path.exists(fetcher.raw_data_file):
+                    os.remove(fetcher.raw_data_file)
+                
+                with self.assertRaises(RuntimeError):
+                    fetcher._save_raw_data(failing_listing())
+                # No partial snapshot is written and the journal is kept for --resume
+                self.assertFalse(os.path.exists(fetcher.raw_data_file))
+                self.assertTrue(os.path.exists(fetcher.journal_file))
+    
+    @unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+    def test_async_listing_read_ahead_is_bounded(self):
+        class SlowBackend(MemoryBackend):
+            def model_info(self, repo_id, **kwargs):
+                time.sleep(0.005)
+                return super().model_info(repo_id, **kwargs)
+        
+        backend = SlowBackend(self.REPOS)
+        read_ahead = []
+        
+        def listing():
+            for position, model in enumerate(self.listing()):
+                read_ahead.append(position - len(backend.detail_calls))
+                yield model
+        
+        fetcher = self.make_fetcher(transport='async', backend=backend)
+        fetcher.ASYNC_MAX_IN_FLIGHT = 4
+        self.assertEqual(self.download(fetcher, listing()), self.expected)
+        self.assertLessEqual(max(read_ahead), 4)
+
+
+class TestResume(FetcherTestCase):
+    """An interrupted download resumes from the records in its journal"""
+    
+    def test_journaled_models_are_not_fetched_again(self):
+        listing = [listed_model(model_id) for model_id in REPO_FILES]
+        expected = self.download(self.make_fetcher(backend=MemoryBackend(REPO_FILES)), listing)
+        
+        # An interrupted run journaled one record and crashed while writing the next
+        fetcher = self.make_fetcher(backend=MemoryBackend(REPO_FILES), resume=True)
+        journal = DownloadJournal(fetcher.journal_file)
+        journal.open(append=False)
+        journal.append(expected['org/Alpha-7B-GGUF'])
+        journal.close()
+        with open(fetcher.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"id": "org/Beta-7B-GGUF", "sibl')
+        
+        self.assertEqual(self.download(fetcher, listing), expected)
+        self.assertEqual(sorted(fetcher.backend.detail_calls), ['org/Beta-7B-GGUF', 'org/Gamma-7B'])
+        self.assertFalse(os.path.exists(fetcher.journal_file))
+    
+    def test_records_missing_details_are_not_journaled(self):
+        reachable = {model_id: files for model_id, files in REPO_FILES.items() if model_id != 'org/Alpha-7B-GGUF'}
+        listing = [listed_model(model_id, files=list(files)) for model_id, files in REPO_FILES.items()]
+        
+        # An interrupted run whose model_info call for one repo failed
+        fetcher = self.make_fetcher(backend=MemoryBackend(reachable))
+        fetcher.journal.open(append=False)
+        records = fetcher._batch_fetch_model_details(listing, {'models_with_likes': 0, 'models_missing_likes': 0,
+                                                               'total_likes': 0, 'max_likes': 0, 'min_likes': 0})
+        fetcher.journal.close()
+        self.assertEqual(len(records), 3)
+        self.assertEqual(sorted(fetcher.journal.load()), ['org/Beta-7B-GGUF', 'org/Gamma-7B'])
+        
+        fetcher = self.make_fetcher(backend=MemoryBackend(REPO_FILES), resume=True)
+        records = self.download(fetcher, listing)
+        self.assertEqual(fetcher.backend.detail_calls, ['org/Alpha-7B-GGUF'])
+        self.assertNotIn('detailsMissing', records['org/Alpha-7B-GGUF'])
+    
+    def test_journal_is_ignored_without_resume(self):
+        fetcher = self.make_fetcher(backend=MemoryBackend(REPO_FILES))
+        journal = DownloadJournal(fetcher.journal_file)
+        journal.open(append=False)
+        journal.append({'id': 'org/Alpha-7B-GGUF', 'siblings': []})
+        journal.close()
+        
+        records = self.download(fetcher, [listed_model(model_id) for model_id in REPO_FILES])
+        self.assertEqual(sorted(fetcher.backend.detail_calls), sorted(REPO_FILES))
+        self.assertEqual(len(records['org/Alpha-7B-GGUF']['siblings']), 2)
+
+
+class TestIncrementalDownload(FetcherTestCase):
+    """Incremental runs fetch details only for new and changed repos"""
+    
+    def test_unchanged_repos_are_carried_forward(self):
+        for raw_format in ('json', 'sqlite'):
+            with self.subTest(raw_format=raw_format):
+                first = self.download(self.make_fetcher(backend=MemoryBackend(REPO_FILES), incremental=True,
+                                                        raw_format=raw_format),
+                                      [listed_model('org/Alpha-7B-GGUF'), listed_model('org/Beta-7B-GGUF')])
+                
+                fetcher = self.make_fetcher(backend=MemoryBackend(REPO_FILES), incremental=True, raw_format=raw_format)
+                records = self.download(fetcher, [
+                    listed_model('org/Alpha-7B-GGUF', downloads=900),
+                    listed_model('org/Beta-7B-GGUF', last_modified='2024-06-01T00:00:00.000Z'),
+                    listed_model('org/Gamma-7B'),
+                ])
+                
+                self.assertEqual(sorted(fetcher.backend.detail_calls), ['org/Beta-7B-GGUF', 'org/Gamma-7B'])
+                self.assertEqual(records['org/Alpha-7B-GGUF'], dict(first['org/Alpha-7B-GGUF'], downloads=900))
+                self.assertEqual(records['org/Beta-7B-GGUF']['lastModified'], '2024-06-01T00:00:00+00:00')
+                self.assertEqual(len(records), 3)
+
+    def test_records_missing_details_are_fetched_again(self):
+        reachable = {model_id: files for model_id, files in REPO_FILES.items() if model_id != 'org/Alpha-7B-GGUF'}
+        listing = [listed_model(model_id, files=list(files)) for model_id, files in REPO_FILES.items()]
+        for flagged in (True, False):
+            with self.subTest(flagged=flagged):
+                # model_info fails for one repo: its record is saved from the listed siblings alone
+                fetcher = self.make_fetcher(backend=MemoryBackend(reachable), incremental=True, bulk_metadata=True)
+                if os.path.exists(fetcher.raw_data_file):
+                    os.remove(fetcher.raw_data_file)
+                first = self.download(fetcher, listing)
+                self.assertTrue(first['org/Alpha-7B-GGUF']['detailsMissing'])
+                if not flagged:
+                    # Snapshots written before the flag existed only lack the GGUF sizes
+                    del first['org/Alpha-7B-GGUF']['detailsMissing']
+                    write_raw_file(fetcher.raw_data_file, first.values())
+                
+                fetcher = self.make_fetcher(backend=MemoryBackend(REPO_FILES), incremental=True, bulk_metadata=True)
+                records = self.download(fetcher, listing)
+                self.assertEqual(fetcher.backend.detail_calls, ['org/Alpha-7B-GGUF'])
+                self.assertNotIn('detailsMissing', records['org/Alpha-7B-GGUF'])
+                self.assertEqual([sibling['size'] for sibling in records['org/Alpha-7B-GGUF']['siblings']],
+                                 list(REPO_FILES['org/Alpha-7B-GGUF'].values()))
+
+class TestBulkMetadata(FetcherTestCase):
+    """Bulk mode resolves repos from listed siblings where model_info adds nothing"""
+    
+    def listing(self, beta_modified=LISTED_AT):
+        return [
+            listed_model(model_id, files=list(files), last_modified=beta_modified if 'Beta' in model_id else LISTED_AT)
+            for model_id, files in REPO_FILES.items()
+        ]
+    
+    def test_detail_calls_avoided(self):
+        fetcher = self.make_fetcher(backend=MemoryBackend(REPO_FILES), bulk_metadata=True)
+        first = self.download(fetcher, self.listing())
+        # Only repos with GGUF files of unknown size need model_info
+        self.assertEqual(sorted(fetcher.backend.detail_calls), ['org/Alpha-7B-GGUF', 'org/Beta-7B-GGUF'])
+        self.assertEqual([sibling['size'] for sibling in first['org/Gamma-7B']['siblings']], [None, None])
+        
+        fetcher = self.make_fetcher(backend=MemoryBackend(REPO_FILES), bulk_metadata=True)
+        records = self.download(fetcher, self.listing(beta_modified='2024-06-01T00:00:00.000Z'))
+        # Unchanged repos keep their known sizes and hashes, a changed repo is fetched again
+        self.assertEqual(fetcher.backend.detail_calls, ['org/Beta-7B-GGUF'])
+        self.assertEqual(records['org/Alpha-7B-GGUF'], first['org/Alpha-7B-GGUF'])
+        self.assertEqual(records['org/Beta-7B-GGUF']['siblings'], first['org/Beta-7B-GGUF']['siblings'])
+
+
+class TestProcessOutput(FetcherTestCase):
+    """The default JSON process phase orders output independently of raw record order"""
+    
+    RAW_MODELS = [
+        {'id': 'gamma/Qwen-7B-GGUF', 'downloads': 900, 'likes': 10, 'created_at': '2024-03-01T00:00:00+00:00',
+         'siblings': [{'rfilename': 'qwen-7b.Q8_0.gguf', 'size': 7 * GB},
+                      {'rfilename': 'qwen-7b.Q4_K_M.gguf', 'size': 4 * GB}]},
+        {'id': 'beta/Mistral-7B-GGUF', 'downloads': 500, 'likes': 10, 'created_at': '2024-02-01T00:00:00+00:00',
+         'siblings': [{'rfilename': 'mistral-7b.Q4_K_M.gguf', 'size': 4 * GB}]},
+        {'id': 'alpha/Mistral-7B-GGUF', 'downloads': 500, 'likes': 10, 'created_at': '2024-01-01T00:00:00+00:00',
+         'siblings': [{'rfilename': 'mistral-7b.Q4_K_M.gguf', 'size': 4 * GB}]},
+    ]
+    
+    def process(self, raw_models):
+        fetcher = self.make_fetcher()
+        write_raw_file(fetcher.raw_data_file, raw_models)
+        fetcher.process_data()
+        with open(fetcher.output_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def test_output_is_pinned_and_order_independent(self):
+        output = self.process(self.RAW_MODELS)
+        self.assertEqual(self.process(self.RAW_MODELS[::-1]), output)
+        
+        # Equally ranked Mistral variants resolve by link, and so do output ties on downloads and likes
+        links = [entry['directDownloadLink'] for entry in json.loads(output)]
+        self.assertEqual(links, [
+            'https://huggingface.co/gamma/Qwen-7B-GGUF/resolve/main/qwen-7b.Q4_K_M.gguf',
+            'https://huggingface.co/gamma/Qwen-7B-GGUF/resolve/main/qwen-7b.Q8_0.gguf',
+            'https://huggingface.co/alpha/Mistral-7B-GGUF/resolve/main/mistral-7b.Q4_K_M.gguf',
+        ])
+
+
+class TestBuildCache(FetcherTestCase):
+    """The process phase is restored from the build cache only when its inputs are unchanged"""
+    
+    def process(self, raw_models=TestProcessOutput.RAW_MODELS, **kwargs):
+        """Run the process phase with the build cache, returning whether the spam filter ran"""
+        fetcher = self.make_fetcher(use_build_cache=True, **kwargs)
+        write_raw_file(fetcher.raw_data_file, raw_models)
+        with mock.patch.object(fetcher.spam_engine, 'filter_models', wraps=fetcher.spam_engine.filter_models) as filter_models:
+            fetcher.process_data()
+        return filter_models.called
+    
+    def test_unchanged_inputs_hit(self):
+        self.assertTrue(self.process())
+        self.assertFalse(self.process())
+        
+        # Execution settings do not change the output
+        self.assertFalse(self.process(filter_config=FilterConfig(fused_pipeline=True, parallel_workers=2)))
+    
+    def test_raw_data_change_misses(self):
+        self.process()
+        raw_models = [dict(TestProcessOutput.RAW_MODELS[0], downloads=5000)] + TestProcessOutput.RAW_MODELS[1:]
+        self.assertTrue(self.process(raw_models))
+    
+    def test_config_change_misses(self):
+        self.process()
+        self.assertTrue(self.process(filter_config=FilterConfig(size_drop_threshold=0.5)))
+    
+    def test_code_change_misses(self):
+        self.process()
+        with mock.patch.object(BuildCache, 'source_digest', return_value='edited'):
+            self.assertTrue(self.process())
+        
+        # The digest covers the fetcher and every spam_filter module
+        with mock.patch.object(BuildCache, 'source_digest', return_value='digest') as source_digest:
+            self.make_fetcher()._processing_fingerprint()
+        sources = {os.path.basename(path) for path in source_digest.call_args.args[0]}
+        self.assertTrue({'simplified_gguf_fetcher.py', 'engine.py', 'selection_cache.py', 'siblings.py'} <= sources)
+    
+    def test_hit_restores_output_and_metrics(self):
+        self.process()
+        with open('gguf_models.json', 'r', encoding='utf-8') as f:
+            output = f.read()
+        with open(FILTER_METRICS_FILE, 'r', encoding='utf-8') as f:
+            metrics = f.read()
+        os.remove('gguf_models.json')
+        os.remove(FILTER_METRICS_FILE)
+        
+        self.assertFalse(self.process())
+        with open('gguf_models.json', 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), output)
+        with open(FILTER_METRICS_FILE, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), metrics)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON codec and its optional orjson backend
+"""
+
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spam_filter import json_codec
+
+SAMPLE = {
+    'modelName': 'Qwen3-4B-Instruct ✓',
+    'fileSize': 4683073184,
+    'downloadCount': 1234,
+    'minRamGB': 6.5,
+    'scores': [1e16, 1e-7, 0.1, 2.5e-05, 123456789.0, -0.0, 1.5e300],
+    'tags': [],
+    'cardData': {},
+    'nested': [{'a': None, 'b': True}]
+}
+
+
+def dumps_stdlib(obj, pretty=False):
+    with mock.patch.object(json_codec, 'orjson', None):
+        return json_codec.dumps(obj, pretty=pretty)
+
+
+def loads_stdlib(text):
+    with mock.patch.object(json_codec, 'orjson', None):
+        return json_codec.loads(text)
+
+
+class TestJsonCodec(unittest.TestCase):
+    """Both backends read back the same values and lay out text the same way"""
+    
+    def test_round_trip_across_backends(self):
+        for pretty in (False, True):
+            for writer in (json_codec.dumps, dumps_stdlib):
+                for reader in (json_codec.loads, loads_stdlib):
+                    with self.subTest(pretty=pretty, writer=writer.__name__, reader=reader.__name__):
+                        self.assertEqual(reader(writer(SAMPLE, pretty=pretty)), SAMPLE)
+    
+    def test_integers_beyond_64_bits(self):
+        # orjson rejects them, so dumps falls back to the stdlib
+        value = {'downloadCount': 10 ** 20}
+        self.assertEqual(json_codec.dumps(value), '{"downloadCount":100000000000000000000}')
+        self.assertEqual(json_codec.loads(json_codec.dumps(value)), value)
+    
+    def test_stdlib_text_matches_json_module(self):
+        self.assertEqual(dumps_stdlib(SAMPLE, pretty=True), json.dumps(SAMPLE, indent=2, ensure_ascii=False))
+        self.assertEqual(dumps_stdlib(SAMPLE), json.dumps(SAMPLE, ensure_ascii=False, separators=(',', ':')))
+    
+    @unittest.skipIf(json_codec.orjson is None, "orjson is not installed")
+    def test_layout_matches_without_exponent_floats(self):
+        record = dict(SAMPLE, scores=[0.1, 6.5, 123456789.0])
+        for pretty in (False, True):
+            with self.subTest(pretty=pretty):
+                self.assertEqual(json_codec.dumps(record, pretty=pretty), dumps_stdlib(record, pretty=pretty))
+    
+    @unittest.skipIf(json_codec.orjson is None, "orjson is not installed")
+    def test_exponent_floats_differ_in_text_only(self):
+        self.assertEqual(json_codec.dumps([1e16, 1e-7]), '[1e16,1e-7]')
+        self.assertEqual(dumps_stdlib([1e16, 1e-7]), '[1e+16,1e-07]')
+        self.assertEqual(json_codec.loads('[1e16,1e-7]'), loads_stdlib('[1e+16,1e-07]'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for the files written next to gguf_models.json: delta, manifest and shards
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts'))
+
+from simplified_gguf_fetcher import SimplifiedGGUFetcher
+
+
+def output_entry(name, downloads, **fields):
+    """Build an output entry keyed by its download link"""
+    entry = {
+        'modelName': name,
+        'quantFormat': 'Q4_K_M',
+        'fileSize': 4 * 1024 ** 3,
+        'downloadCount': downloads,
+        'likeCount': 1,
+        'directDownloadLink': f"https://huggingface.co/org/{name}/resolve/main/{name}.Q4_K_M.gguf"
+    }
+    entry.update(fields)
+    return entry
+
+
+def apply_delta(entries, delta):
+    """Patch an output the way a client holding the previous version would"""
+    by_link = {entry['directDownloadLink']: dict(entry) for entry in entries}
+    for link in delta['removed']:
+        del by_link[link]
+    for change in delta['changed']:
+        entry = by_link[change['directDownloadLink']]
+        entry.update(change['fields'])
+        for key in change.get('removedFields', []):
+            del entry[key]
+    for entry in delta['added']:
+        by_link[entry['directDownloadLink']] = entry
+    return by_link
+
+
+class TestOutputDelta(unittest.TestCase):
+    """Applying the delta to the previous output yields the new output"""
+    
+    def setUp(self):
+        self.previous_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.fetcher = SimplifiedGGUFetcher(disable_spam_filter=True, use_cache=False, use_build_cache=False)
+    
+    def tearDown(self):
+        os.chdir(self.previous_cwd)
+        shutil.rmtree(self.temp_dir)
+    
+    def write_output(self, entries):
+        """Replace the output file the way the process phase does, returning the delta"""
+        previous_version, previous_entries = self.fetcher._read_output_snapshot()
+        output_text = json.dumps(entries, indent=2)
+        with open(self.fetcher.output_file, 'w', encoding='utf-8') as f:
+            f.write(output_text)
+        self.fetcher._write_output_delta(previous_version, previous_entries, output_text, entries)
+        
+        with open(self.fetcher._output_sidecar(SimplifiedGGUFetcher.OUTPUT_MANIFEST_SUFFIX), 'r') as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest['version'], SimplifiedGGUFetcher._output_version(output_text))
+        delta_file = self.fetcher._output_sidecar(SimplifiedGGUFetcher.OUTPUT_DELTA_SUFFIX)
+        if manifest['delta'] is None:
+            return None
+        with open(delta_file, 'r') as f:
+            return json.load(f)
+    
+    def test_round_trip(self):
+        previous = [
+            output_entry('Kept-7B', 100, uploadDate='2024-01-01'),
+            output_entry('Dropped-7B', 50),
+            output_entry('Renamed-7B', 10, minRamGB=8, uploadDate='2024-02-01'),
+        ]
+        current = [
+            output_entry('Kept-7B', 150, uploadDate='2024-01-01'),
+            output_entry('Renamed-7B', 10, minRamGB=None),  # uploadDate dropped, minRamGB nulled
+            output_entry('Added-7B', 5),
+        ]
+        
+        self.assertIsNone(self.write_output(previous))
+        delta = self.write_output(current)
+        
+        self.assertEqual(len(delta['added']), 1)
+        self.assertEqual(len(delta['removed']), 1)
+        changes = {change['directDownloadLink']: change for change in delta['changed']}
+        renamed = changes[current[1]['directDownloadLink']]
+        self.assertEqual(renamed['fields'], {'minRamGB': None})
+        self.assertEqual(renamed['removedFields'], ['uploadDate'])
+        self.assertNotIn('removedFields', changes[current[0]['directDownloadLink']])
+        
+        self.assertEqual(apply_delta(previous, delta), {entry['directDownloadLink']: entry for entry in current})
+    
+    def test_null_added_field_is_a_change(self):
+        previous = [output_entry('Model-7B', 100)]
+        current = [output_entry('Model-7B', 100, minRamGB=None)]
+        
+        self.write_output(previous)
+        delta = self.write_output(current)
+        
+        self.assertEqual(delta['changed'], [{'directDownloadLink': current[0]['directDownloadLink'],
+                                             'fields': {'minRamGB': None}}])
+        self.assertEqual(apply_delta(previous, delta), {entry['directDownloadLink']: entry for entry in current})
+
+
+
+class TestOutputShards(unittest.TestCase):
+    """Every modelType gets its own shard file"""
+    
+    def setUp(self):
+        self.previous_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.fetcher = SimplifiedGGUFetcher(disable_spam_filter=True, use_cache=False, use_build_cache=False,
+                                            output_shards=True)
+    
+    def tearDown(self):
+        os.chdir(self.previous_cwd)
+        shutil.rmtree(self.temp_dir)
+    
+    def test_colliding_slugs_get_separate_files(self):
+        entries = [
+            output_entry('A-7B', 30, modelType='Foo/Bar', minRamGB=6),
+            output_entry('B-7B', 20, modelType='foo-bar', minRamGB=6),
+            output_entry('C-7B', 10, modelType='Llama', minRamGB=12),
+        ]
+        self.fetcher._write_output_shards(entries, 'v1')
+        
+        shard_dir = self.fetcher._output_sidecar(SimplifiedGGUFetcher.OUTPUT_SHARDS_SUFFIX)
+        with open(os.path.join(shard_dir, 'manifest.json'), 'r') as f:
+            shards = json.load(f)['shards']['modelType']
+        
+        self.assertEqual(len({shard['file'] for shard in shards.values()}), 3)
+        self.assertEqual(shards['Llama']['file'], 'type/llama.json')
+        for model_type, shard in shards.items():
+            with self.subTest(model_type=model_type):
+                with open(os.path.join(shard_dir, shard['file']), 'r') as f:
+                    self.assertEqual([entry['modelType'] for entry in json.load(f)], [model_type])
+
+
+if __name__ == '__main__':
+    unittest.main()
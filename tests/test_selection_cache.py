@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the variant selection cache and its on-disk store
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spam_filter.config import FilterConfig
+from spam_filter.engine import SpamFilterEngine
+from spam_filter.selection_cache import SelectionCache
+
+GB = 1024 * 1024 * 1024
+NAMES = ('Llama', 'Mistral', 'Qwen', 'Gemma')
+
+
+def raw_models():
+    """Build one two-variant group per name, each with its own selection signature"""
+    return [
+        {
+            'id': f'org/{name}-7B-GGUF',
+            'downloads': 1000 + index,
+            'likes': 10,
+            'created_at': '2024-01-01T00:00:00Z',
+            'siblings': [{'rfilename': f'{name.lower()}-7b.Q8_0.gguf', 'size': 7 * GB},
+                         {'rfilename': f'{name.lower()}-7b.Q4_K_M.gguf', 'size': 4 * GB}]
+        }
+        for index, name in enumerate(NAMES)
+    ]
+
+
+class TestSelectionCacheFile(unittest.TestCase):
+    """Selections persisted to selection_cache_file are reused by later engines"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_file = os.path.join(self.temp_dir.name, 'selection_cache.json')
+    
+    def make_engine(self, **config):
+        return SpamFilterEngine(FilterConfig(detailed_logging=False, selection_cache_file=self.cache_file, **config))
+    
+    def test_selections_are_reloaded(self):
+        first = self.make_engine().filter_models(iter(raw_models()))
+        self.assertEqual(first.processing_report.selection_cache_misses, len(NAMES))
+        self.assertTrue(os.path.exists(self.cache_file))
+        
+        engine = self.make_engine()
+        self.assertEqual(len(engine.selection_cache), len(NAMES))
+        second = engine.filter_models(iter(raw_models()))
+        self.assertEqual(second.processing_report.selection_cache_hits, len(NAMES))
+        self.assertEqual(second.processing_report.selection_cache_misses, 0)
+        self.assertEqual(second.filtered_models, first.filtered_models)
+    
+    def test_fingerprint_change_starts_empty(self):
+        self.make_engine().filter_models(iter(raw_models()))
+        
+        engine = self.make_engine(size_drop_threshold=0.5)
+        self.assertEqual(len(engine.selection_cache), 0)
+        result = engine.filter_models(iter(raw_models()))
+        self.assertEqual(result.processing_report.selection_cache_hits, 0)
+        
+        # Execution settings are not part of the fingerprint
+        self.assertEqual(len(self.make_engine(size_drop_threshold=0.5, fused_pipeline=True).selection_cache), len(NAMES))
+    
+    def test_entries_are_bounded_by_cache_size(self):
+        self.make_engine(selection_cache_size=2).filter_models(iter(raw_models()))
+        
+        engine = self.make_engine(selection_cache_size=2)
+        self.assertEqual(len(engine.selection_cache), 2)
+        # Only the two most recently selected groups are still cached, reversed they are looked up first
+        result = engine.filter_models(iter(raw_models()[::-1]))
+        self.assertEqual(result.processing_report.selection_cache_misses, 2)
+        self.assertEqual(result.processing_report.selection_cache_hits, 2)
+
+
+class TestSelectionCacheEviction(unittest.TestCase):
+    """The least recently used entry is evicted once max_entries is exceeded"""
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SelectionCache('fingerprint', max_entries=2)
+        cache.put('a', [0])
+        cache.put('b', [1])
+        self.assertEqual(cache.get('a'), [0])
+        cache.put('c', [0, 1])
+        
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(list(cache.entries), ['a', 'c'])
+    
+    def test_load_keeps_most_recent_entries(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_file = os.path.join(temp_dir, 'selection_cache.json')
+            cache = SelectionCache('fingerprint', max_entries=3, cache_file=cache_file)
+            for key in ('a', 'b', 'c'):
+                cache.put(key, [0])
+            cache.get('a')
+            cache.save()
+            
+            reloaded = SelectionCache('fingerprint', max_entries=2, cache_file=cache_file)
+            self.assertEqual(list(reloaded.entries), ['c', 'a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact sibling table
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spam_filter.config import FilterConfig
+from spam_filter.engine import SpamFilterEngine
+from spam_filter.siblings import SiblingTable
+
+GB = 1024 * 1024 * 1024
+
+SIBLING_LISTS = {
+    'mixed': [
+        {'rfilename': 'README.md', 'size': 1024},
+        {'rfilename': 'model.Q4_K_M.gguf', 'size': 4 * GB, 'sha256': 'a' * 64},
+        {'rfilename': 'model.Q8_0.gguf', 'size': 7 * GB},
+        {'rfilename': 'config.json', 'size': None},
+    ],
+    'unknown_sizes': [
+        {'rfilename': 'model.Q4_K_M.gguf', 'size': None, 'sha256': 'b' * 64},
+        {'rfilename': 'model.Q5_K_M.gguf'},
+        {'rfilename': 'model.Q8_0.gguf', 'size': 0},
+    ],
+    'upper_case_extension': [
+        {'rfilename': 'MODEL.Q4_0.GGUF', 'size': 4 * GB},
+        {'rfilename': 'model.gguf.md', 'size': 10},
+    ],
+    'no_gguf': [
+        {'rfilename': 'pytorch_model.bin', 'size': 13 * GB, 'sha256': 'c' * 64},
+    ],
+    'empty': [],
+}
+
+
+def dict_gguf_files(siblings):
+    """Extract (filename, size, sha256) per GGUF file the way the dictionary-based engine did"""
+    gguf_files = [
+        sibling for sibling in siblings or []
+        if sibling.get('rfilename', '').lower().endswith('.gguf')
+    ]
+    return [(sibling.get('rfilename', ''), sibling.get('size', 0), sibling.get('sha256')) for sibling in gguf_files]
+
+
+class TestSiblingTable(unittest.TestCase):
+    """A SiblingTable yields what the raw sibling dictionaries hold"""
+    
+    def test_gguf_files_match_dict_extraction(self):
+        for name, siblings in SIBLING_LISTS.items():
+            with self.subTest(siblings=name):
+                table = SiblingTable.from_siblings(siblings)
+                self.assertEqual(list(table.gguf_files()), dict_gguf_files(siblings))
+                self.assertEqual(table.has_gguf, bool(dict_gguf_files(siblings)))
+    
+    def test_none_siblings(self):
+        table = SiblingTable.from_siblings(None)
+        self.assertEqual(len(table), 0)
+        self.assertFalse(table.has_gguf)
+    
+    def test_round_trip(self):
+        for name, siblings in SIBLING_LISTS.items():
+            with self.subTest(siblings=name):
+                expected = []
+                for sibling in siblings:
+                    entry = {'rfilename': sibling['rfilename'], 'size': sibling.get('size', 0)}
+                    if sibling.get('sha256') and sibling['rfilename'].lower().endswith('.gguf'):
+                        entry['sha256'] = sibling['sha256']
+                    expected.append(entry)
+                self.assertEqual(SiblingTable.from_siblings(siblings).to_list(), expected)
+                self.assertEqual(list(SiblingTable.from_siblings(SiblingTable.from_siblings(siblings).to_list()).gguf_files()),
+                                 dict_gguf_files(siblings))
+    
+    def test_engine_extraction_matches_dict_extraction(self):
+        engine = SpamFilterEngine(FilterConfig(detailed_logging=False, selection_cache_size=0))
+        for name, siblings in SIBLING_LISTS.items():
+            with self.subTest(siblings=name):
+                raw_model = {'id': f'org/{name}-GGUF', 'downloads': 100, 'likes': 1, 'siblings': siblings}
+                expected = []
+                for filename, size, sha256 in dict_gguf_files(siblings):
+                    model = engine._convert_to_expected_format(raw_model, {'rfilename': filename, 'size': size,
+                                                                           'sha256': sha256})
+                    if model:
+                        expected.append(model)
+                
+                self.assertEqual(engine._extract_gguf_models([raw_model], []), expected)
+                compact_model = dict(raw_model, siblings=SiblingTable.from_siblings(siblings))
+                self.assertEqual(engine._extract_gguf_models([compact_model], []), expected)
+        
+        # Files of unknown size cannot be converted, either way
+        links = [model['directDownloadLink'] for model in
+                 engine._extract_gguf_models([{'id': 'org/Sizes-GGUF', 'siblings': SIBLING_LISTS['unknown_sizes']}], [])]
+        self.assertEqual(links, ['https://huggingface.co/org/Sizes-GGUF/resolve/main/model.Q5_K_M.gguf',
+                                 'https://huggingface.co/org/Sizes-GGUF/resolve/main/model.Q8_0.gguf'])
+
+if __name__ == '__main__':
+    unittest.main()